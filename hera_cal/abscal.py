@@ -576,7 +576,7 @@ def phs_logcal(model, data, wgts=None, refant=None, verbose=True):
 
 
 def delay_lincal(model, data, wgts=None, refant=None, df=9.765625e4, f0=0., solve_offsets=True, medfilt=True,
-                 kernel=(1, 5), verbose=True, antpos=None, four_pol=False, edge_cut=0):
+                 kernel=(1, 5), verbose=True, antpos=None, four_pol=False, edge_cut=0, fft_workers=1):
     """
     Solve for per-antenna delays according to the equation
 
@@ -620,6 +620,8 @@ def delay_lincal(model, data, wgts=None, refant=None, df=9.765625e4, f0=0., solv
 
     edge_cut : int, number of channels to exclude at each band edge in FFT window
 
+    fft_workers : int, number of threads used for the delay FFTs (see utils.fft_dly_batch), default 1
+
     Output:
     -------
     fit : dictionary containing delay (tau_i_x) for each antenna and optionally
@@ -637,9 +639,7 @@ def delay_lincal(model, data, wgts=None, refant=None, df=9.765625e4, f0=0., solv
             wgts[k] = np.ones_like(data[k], dtype=np.float)
 
     # median filter and FFT to get delays
-    ratio_delays = []
-    ratio_offsets = []
-    ratio_wgts = []
+    ratios = []
     for i, k in enumerate(keys):
         ratio = data[k] / model[k]
 
@@ -652,24 +652,19 @@ def delay_lincal(model, data, wgts=None, refant=None, df=9.765625e4, f0=0., solv
         inf_select = np.isinf(ratio)
         ratio[inf_select] = 0.0
         wgts[k][inf_select] = 0.0
+        ratios.append(ratio)
 
-        # get delays
-        dly, offset = utils.fft_dly(ratio, df, f0=f0, wgts=wgts[k], medfilt=medfilt, kernel=kernel, edge_cut=edge_cut)
-
-        # set nans to zero
-        rwgts = np.nanmean(wgts[k], axis=1, keepdims=True)
-        isnan = np.isnan(dly)
-        dly[isnan] = 0.0
-        rwgts[isnan] = 0.0
-        offset[isnan] = 0.0
+    # get delays of all ratios at once
+    ratio_wgts = np.array([wgts[k] for k in keys])
+    ratio_delays, ratio_offsets = utils.fft_dly_batch(np.array(ratios), df, f0=f0, wgts=ratio_wgts, medfilt=medfilt,
+                                                      kernel=kernel, edge_cut=edge_cut, workers=fft_workers)
 
-        ratio_delays.append(dly)
-        ratio_offsets.append(offset)
-        ratio_wgts.append(rwgts)
-
-    ratio_delays = np.array(ratio_delays)
-    ratio_offsets = np.array(ratio_offsets)
-    ratio_wgts = np.array(ratio_wgts)
+    # set nans to zero
+    ratio_wgts = np.nanmean(ratio_wgts, axis=2, keepdims=True)
+    isnan = np.isnan(ratio_delays)
+    ratio_delays[isnan] = 0.0
+    ratio_wgts[isnan] = 0.0
+    ratio_offsets[isnan] = 0.0
 
     # form ydata
     ydata = odict(zip(keys, ratio_delays))
@@ -727,7 +722,7 @@ def delay_lincal(model, data, wgts=None, refant=None, df=9.765625e4, f0=0., solv
 
 def delay_slope_lincal(model, data, antpos, wgts=None, refant=None, df=9.765625e4, f0=0.0, medfilt=True,
                        kernel=(1, 5), assume_2D=True, four_pol=False, edge_cut=0, time_avg=False,
-                       return_gains=False, gain_ants=[], verbose=True):
+                       return_gains=False, gain_ants=[], verbose=True, fft_workers=1):
     """
     Solve for an array-wide delay slope according to the equation
 
@@ -783,6 +778,8 @@ def delay_slope_lincal(model, data, antpos, wgts=None, refant=None, df=9.765625e
 
     gain_ants : list of ant-pol tuples for return_gains dictionary
 
+    fft_workers : int, number of threads used for the delay FFTs (see utils.fft_dly_batch), default 1
+
     Output:
     -------
     if not return_gains:
@@ -812,8 +809,7 @@ def delay_slope_lincal(model, data, antpos, wgts=None, refant=None, df=9.765625e
     nDims = _count_nDims(antpos, assume_2D=assume_2D)
     
     # median filter and FFT to get delays
-    ydata = {}
-    ywgts = {}
+    ratios = []
     for i, k in enumerate(keys):
         ratio = data[k] / model[k]
         ratio /= np.abs(ratio)
@@ -821,15 +817,20 @@ def delay_slope_lincal(model, data, antpos, wgts=None, refant=None, df=9.765625e
         # replace nans and infs
         wgts[k][~np.isfinite(ratio)] = 0.0
         ratio[~np.isfinite(ratio)] = 0.0
+        ratios.append(ratio)
 
-        # get delays
-        ydata[k], _ = utils.fft_dly(ratio, df, wgts=wgts[k], f0=f0, medfilt=medfilt, kernel=kernel, edge_cut=edge_cut)
+    # get delays of all ratios at once
+    ratio_wgts = np.array([wgts[k] for k in keys])
+    ratio_delays, _ = utils.fft_dly_batch(np.array(ratios), df, wgts=ratio_wgts, f0=f0, medfilt=medfilt,
+                                          kernel=kernel, edge_cut=edge_cut, workers=fft_workers)
 
-        # set nans to zero
-        ywgts[k] = np.nanmean(wgts[k], axis=1, keepdims=True)
-        isnan = np.isnan(ydata[k])
-        ydata[k][isnan] = 0.0
-        ywgts[k][isnan] = 0.0
+    # set nans to zero
+    ratio_wgts = np.nanmean(ratio_wgts, axis=2, keepdims=True)
+    isnan = np.isnan(ratio_delays)
+    ratio_delays[isnan] = 0.0
+    ratio_wgts[isnan] = 0.0
+    ydata = dict(zip(keys, ratio_delays))
+    ywgts = dict(zip(keys, ratio_wgts))
 
     # setup antenna position terms
     r_ew = {a: f"r_ew_{a}" for a in antnums}
@@ -2015,27 +2016,13 @@ def match_times(datafile, modelfiles, filetype='uvh5', atol=1e-5):
         matched_modelfiles : type=list, list of modelfiles that overlap w/ datafile in LST
     """
     # get lst arrays
-    data_dlst, data_dtime, data_lsts, data_times = io.get_file_times(datafile, filetype=filetype)
-    model_dlsts, model_dtimes, model_lsts, model_times = io.get_file_times(modelfiles, filetype=filetype)
-
-    # shift model files relative to first file & first index if needed
-    for ml in model_lsts:
-        if ml[0] < model_lsts[0][0]:
-            ml += 2 * np.pi
-
-    # get model start and stop, buffering by dlst / 2
-    model_starts = np.asarray([ml[0] - md / 2.0 for ml, md in zip(model_lsts, model_dlsts)])
-    model_ends = np.asarray([ml[-1] + md / 2.0 for ml, md in zip(model_lsts, model_dlsts)])
-
-    # shift data relative to model if needed
-    if data_lsts[-1] < model_starts[0]:
-        data_lsts += 2 * np.pi
+    data_lsts = io.FileTimeIndex(datafile, filetype=filetype).lst_arrays[0]
 
-    # select model files
-    match = np.asarray(modelfiles)[(model_starts < data_lsts[-1] + atol)
-                                   & (model_ends > data_lsts[0] - atol)]
+    # select model files whose LSTs, buffered by dlst / 2, overlap with the data (see io.FileTimeIndex)
+    model_index = io.FileTimeIndex(modelfiles, filetype=filetype)
+    match = model_index.files_in_lst_range(data_lsts[0], data_lsts[-1], atol=atol)
 
-    return match
+    return np.asarray(match, dtype=np.asarray(modelfiles).dtype)
 
 
 def cut_bls(datacontainer, bls=None, min_bl_cut=None, max_bl_cut=None, inplace=False):
@@ -183,7 +183,7 @@ def apply_cal(data_infilename, data_outfilename, new_calibration, old_calibratio
               flag_filetype='h5', a_priori_flags_yaml=None, flag_nchan_low=0, flag_nchan_high=0, filetype_in='uvh5', filetype_out='uvh5',
               nbl_per_load=None, gain_convention='divide', redundant_solution=False, bl_error_tol=1.0,
               add_to_history='', clobber=False, redundant_average=False, redundant_weights=None,
-              freq_atol=1., **kwargs):
+              freq_atol=1., prefetch=0, **kwargs):
     '''Update the calibration solution and flags on the data, writing to a new file. Takes out old calibration
     and puts in new calibration solution, including its flags. Also enables appending to history.
 
@@ -226,6 +226,8 @@ def apply_cal(data_infilename, data_outfilename, new_calibration, old_calibratio
         tol_factor: float, optional
             Float specifying the tolerance (as a fraction of channel width) within which cal frequencies must be matched in calibration solution to apply
             solutions to a particular frequency channel in the data (rather then excluding the cal solution at that channel).
+        prefetch: number of upcoming baseline chunks to read in a background thread while the current one is calibrated
+            and written (see io.HERAData.iterate_over_bls). Only used if nbl_per_load is not None. Default 0.
         kwargs: dictionary mapping updated UVData attributes to their new values.
             See pyuvdata.UVData documentation for more info.
     '''
@@ -302,7 +304,7 @@ def apply_cal(data_infilename, data_outfilename, new_calibration, old_calibratio
         # consider calucate reds here instead and pass in (to avoid computing it multiple times)
         # I'll look into generators and whether the reds calc is being repeated.
         for data, data_flags, data_nsamples in hd.iterate_over_bls(Nbls=nbl_per_load, chunk_by_redundant_group=redundant_average,
-                                                                   reds=all_reds, frequencies=freqs_to_load):
+                                                                   reds=all_reds, frequencies=freqs_to_load, prefetch=prefetch):
             for bl in data_flags.keys():
                 # apply band edge flags
                 data_flags[bl][:, 0:flag_nchan_low] = True
@@ -393,6 +395,8 @@ def apply_cal_argparser():
     a.add_argument("--filetype_out", type=str, default='uvh5', help='filetype of output data files')
     a.add_argument("--nbl_per_load", type=str, default=None, help="Maximum number of baselines to load at once. uvh5 to uvh5 only."
                                                                   "Default loads the whole file. If 'none' is provided, also loads whole file.")
+    a.add_argument("--prefetch", type=int, default=0, help="Number of baseline chunks to read ahead in a background thread "
+                                                           "when loading nbl_per_load baselines at once. Default 0.")
     a.add_argument("--gain_convention", type=str, default='divide',
                    help="'divide' means V_obs = gi gj* V_true, 'multiply' means V_true = gi gj* V_obs.")
     a.add_argument("--redundant_solution", default=False, action="store_true",
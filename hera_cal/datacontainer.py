@@ -5,6 +5,7 @@
 import numpy as np
 from collections import OrderedDict as odict
 import copy
+import os
 
 from .utils import conj_pol, comply_pol, make_bl, comply_bl, reverse_bl
 
@@ -489,3 +490,128 @@ class DataContainer:
 
         if not in_place:
             return dc
+
+
+class ArrayContainer:
+    """Dictionary-like object whose values are (Ntimes, Nfreqs) views into a single contiguous array. Keys are
+    tuples whose last element is a polarization, e.g. (0, 'Jee') for antenna gains or (0, 1, 'ee') for
+    visibilities. Everything before the polarization is the "name" of the key. The underlying array has shape
+    (Nnames, Nfreqs, Ntimes, Npols), which for antenna gains is the layout of the UVCal gain_array (without
+    the spectral window axis), so that whole gain, flag, or quality arrays can be handed to UVCal without
+    copying antenna by antenna. Values are therefore transposed views into the array.
+
+    Supports much of the same functionality as dictionaries, including:
+        * __getitem__
+        * __setitem__ (which copies into the existing view, so only existing keys are supported)
+        * __len__
+        * __contains__
+        * __iter__
+        * .keys()
+        * .items()
+        * .values()
+        * .get()
+    """
+
+    def __init__(self, keys, Ntimes, Nfreqs, dtype=np.complex64, fill_value=0, filename=None):
+        """Create an ArrayContainer, allocating an array filled with fill_value for every name and polarization.
+
+        Arguments:
+            keys: list of tuple keys, e.g. (0, 'Jee'), whose last element is a polarization.
+            Ntimes: number of times in each value
+            Nfreqs: number of frequencies in each value
+            dtype: numpy dtype of the array
+            fill_value: initial value of every entry in the array
+            filename: optional path to a .npy file to create and memory-map the array to, so that it's filled
+                incrementally on disk rather than held in memory. Replaces any existing file, rather than writing
+                into it, so that existing memory maps of it are unaffected. Default None keeps the array in memory.
+        """
+        self._keys = list(keys)
+        self.names = sorted(set([tuple(k[:-1]) for k in self._keys]))
+        self.pols = sorted(set([k[-1] for k in self._keys]))
+        self._name_inds = {name: i for i, name in enumerate(self.names)}
+        self._pol_inds = {pol: i for i, pol in enumerate(self.pols)}
+        self._inds = {k: (self._name_inds[tuple(k[:-1])], self._pol_inds[k[-1]]) for k in self._keys}
+        shape = (len(self.names), Nfreqs, Ntimes, len(self.pols))
+        if filename is None:
+            self.array = np.full(shape, fill_value, dtype=dtype)
+        else:
+            if os.path.exists(filename):
+                os.remove(filename)
+            self.array = np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=shape)
+            self.array[:] = fill_value
+
+    def keys(self):
+        '''Returns the keys of the container as a list.'''
+        return list(self._keys)
+
+    def values(self):
+        '''Returns (Ntimes, Nfreqs) views into the array as a list.'''
+        return [self[k] for k in self._keys]
+
+    def items(self):
+        '''Returns the keys and (Ntimes, Nfreqs) views into the array as a list of tuples.'''
+        return [(k, self[k]) for k in self._keys]
+
+    def __len__(self):
+        '''Returns the number of keys in the container.'''
+        return len(self._keys)
+
+    def __contains__(self, key):
+        '''Returns True if the key is in the container.'''
+        return key in self._inds
+
+    def __iter__(self):
+        '''Iterates over the keys of the container.'''
+        return iter(self._keys)
+
+    def __getitem__(self, key):
+        '''Returns an (Ntimes, Nfreqs) view into the array for this key. Modifying it modifies the array.'''
+        i, p = self._inds[key]
+        return self.array[i, :, :, p].T
+
+    def __setitem__(self, key, value):
+        '''Copies value (broadcastable to (Ntimes, Nfreqs)) into the array. Only supports existing keys.'''
+        if key not in self._inds:
+            raise KeyError('Cannot add new key {} to an ArrayContainer.'.format(key))
+        self[key][:] = value
+
+    def get(self, key, default=None):
+        '''Returns the view for key if it's in the container, otherwise default.'''
+        return self[key] if key in self else default
+
+    def set_chunk(self, data, tinds, fslice=slice(None)):
+        '''Write a chunk of times and frequencies for many keys directly into the array.
+
+        Arguments:
+            data: dictionary mapping a subset of keys to (len(tinds), Nfreqs_in_slice) arrays
+            tinds: integer indices of the times in the chunk
+            fslice: slice of the frequencies in the chunk. Default slice(None) is all frequencies.
+        '''
+        tinds = np.asarray(tinds)
+        if len(tinds) == 0 or np.any(np.diff(tinds) != 1):
+            # times aren't contiguous, so fall back to writing key by key
+            for k in data.keys():
+                i, p = self._inds[k]
+                self.array[i, fslice][:, tinds, p] = np.asarray(data[k]).T
+            return
+
+        # otherwise, write all names of each polarization with a single sliced assignment
+        tslice = slice(tinds[0], tinds[-1] + 1)
+        keys_by_pol = {}
+        for k in data.keys():
+            keys_by_pol.setdefault(self._inds[k][1], []).append(k)
+        for p, keys in keys_by_pol.items():
+            name_inds = [self._inds[k][0] for k in keys]
+            if name_inds == list(range(len(self.names))):
+                name_inds = slice(None)
+            self.array[name_inds, fslice, tslice, p] = np.transpose([data[k] for k in keys], (0, 2, 1))
+
+    def select_array(self, names, pols):
+        '''Returns an array of shape (len(names), Nfreqs, Ntimes, len(pols)) for the given names and
+        polarizations, which must all be in the container. If they are in the same order as self.names
+        and self.pols, returns the array itself, otherwise a copy. Names that aren't tuples are treated
+        as length-1 tuples, e.g. antenna numbers.'''
+        names = [n if isinstance(n, tuple) else (n,) for n in names]
+        if (names == self.names) and (list(pols) == self.pols):
+            return self.array
+        return self.array[np.array([self._name_inds[n] for n in names], dtype=int)][:, :, :, [self._pol_inds[p] for p in pols]]
@@ -88,7 +88,7 @@ class DelayFilter(VisClean):
                 filter_cache = io.write_filter_cache_scratch(filter_cache, cache_dir, skip_keys=keys_before)
 
 
-def load_delay_filter_and_write(infilename, calfile=None, Nbls_per_load=None, spw_range=None, cache_dir=None,
+def load_delay_filter_and_write(infilename, calfile=None, Nbls_per_load=None, prefetch=0, spw_range=None, cache_dir=None,
                                 read_cache=False, write_cache=False, round_up_bllens=False,
                                 factorize_flags=False, time_thresh=0.05,
                                 res_outfilename=None, CLEAN_outfilename=None, filled_outfilename=None,
@@ -101,6 +101,9 @@ def load_delay_filter_and_write(infilename, calfile=None, Nbls_per_load=None, sp
         cal: optional string path to calibration file to apply to data before delay filtering
         Nbls_per_load: int, the number of baselines to load at once.
                        If None, load all baselines at once. default : None.
+        prefetch: int, number of upcoming baseline chunks to read in a background thread while the
+                  current chunk is filtered (see io.HERAData.iterate_over_bls). Only used if Nbls_per_load
+                  is not None. default : 0.
         spw_range: spw_range of data to delay-filter.
         cache_dir: string, optional, path to cache file that contains pre-computed dayenu matrices.
                     see uvtools.dspec.dayenu_filter for key formats.
@@ -139,16 +142,18 @@ def load_delay_filter_and_write(infilename, calfile=None, Nbls_per_load=None, sp
                                filled_outfilename=filled_outfilename, partial_write=False,
                                clobber=clobber, add_to_history=add_to_history)
     else:
-        for i in range(0, len(hd.bls), Nbls_per_load):
-            df = DelayFilter(hd, input_cal=calfile, round_up_bllens=round_up_bllens)
-            df.read(bls=hd.bls[i:i + Nbls_per_load], frequencies=freqs)
+        for data, flags, nsamples in hd.iterate_over_bls(Nbls=Nbls_per_load, bls=hd.bls, frequencies=freqs, prefetch=prefetch):
+            df = DelayFilter(hd, input_cal=calfile, round_up_bllens=round_up_bllens, link_data=False)
+            df.data, df.flags, df.nsamples = data, flags, nsamples
+            if calfile is not None:
+                df.apply_calibration(df.hc)
             if factorize_flags:
                 df.factorize_flags(time_thresh=time_thresh, inplace=True)
             df.run_delay_filter(cache_dir=cache_dir, read_cache=read_cache, write_cache=write_cache, **filter_kwargs)
             df.write_filtered_data(res_outfilename=res_outfilename, CLEAN_outfilename=CLEAN_outfilename,
                                    filled_outfilename=filled_outfilename, partial_write=True,
                                    clobber=clobber, add_to_history=add_to_history, Nfreqs=df.Nfreqs, freq_array=np.asarray([df.freqs]))
-            df.hd.data_array = None  # this forces a reload in the next loop
+            df.hd.data_array = None  # free this chunk before the next one is read
 
 
 def load_delay_filter_and_write_baseline_list(datafile_list, baseline_list, calfile_list=None, spw_range=None, cache_dir=None,
@@ -10,6 +10,7 @@ import copy
 import warnings
 from functools import reduce
 import collections
+import itertools
 from pyuvdata import UVCal, UVData
 from pyuvdata import utils as uvutils
 from astropy import units
@@ -17,7 +18,10 @@ import h5py
 import pickle
 import random
 import glob
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pyuvdata.utils import POL_STR2NUM_DICT
+from pyuvdata.parameter import UVParameter
 from . import redcal
 
 try:
@@ -26,10 +30,20 @@ try:
 except ImportError:
     AIPY = False
 
-from .datacontainer import DataContainer
+try:
+    import fcntl
+except ImportError:  # e.g. on Windows, where concurrent updates of the header index aren't serialized
+    fcntl = None
+
+from .datacontainer import DataContainer, ArrayContainer
 from .utils import polnum2str, polstr2num, jnum2str, jstr2num, filter_bls, chunk_baselines_by_redundant_groups
 from .utils import split_pol, conj_pol, LST2JD, HERA_TELESCOPE_LOCATION
 
+HEADER_INDEX_FILENAME = '.hera_cal_header_index.hdf5'
+_HEADER_INDEX_SETTINGS = {'enabled': False, 'nprocs': 8}
+_FILE_TIMES_CACHE = odict()  # in-process LRU cache of get_file_times results per file, see FileTimeIndex
+_FILE_TIMES_CACHE_MAXSIZE = 10000
+
 
 class HERACal(UVCal):
     '''HERACal is a subclass of pyuvdata.UVCal meant to serve as an interface between
@@ -292,9 +306,7 @@ class HERAData(UVData):
             if len(self.filepaths) > 1:  # save HERAData_metas in dicts
                 for meta in self.HERAData_metas:
                     setattr(self, meta, {})
-                for f in self.filepaths:
-                    hd = HERAData(f, filetype='uvh5', **read_kwargs)
-                    meta_dict = hd.get_metadata_dict()
+                for f, meta_dict in zip(self.filepaths, get_uvh5_metadata(self.filepaths, **read_kwargs)):
                     for meta in self.HERAData_metas:
                         getattr(self, meta)[f] = meta_dict[meta]
             else:  # save HERAData_metas as attributes
@@ -311,14 +323,21 @@ class HERAData(UVData):
     def reset(self):
         '''Resets all standard UVData attributes, potentially freeing memory.'''
         super(HERAData, self).__init__()
+        self._metadata_cache = None
+        self._axes_hashes = {}
 
     def get_metadata_dict(self):
         ''' Produces a dictionary of the most useful metadata. Used as object
-        attributes and as metadata to store in DataContainers.
+        attributes and as metadata to store in DataContainers. The result is cached
+        until a read() or select() changes the axes of the data, so the values are
+        shared between calls and should not be modified in place.
 
         Returns:
             metadata_dict: dictionary of all items in self.HERAData_metas
         '''
+        if getattr(self, '_metadata_cache', None) is not None:
+            return dict(self._metadata_cache)
+
         antpos, ants = self.get_ENU_antpos()
         antpos = odict(zip(ants, antpos))
 
@@ -338,11 +357,13 @@ class HERAData(UVData):
         lsts_by_bl.update({(ant1, ant0): lsts_here for (ant0, ant1), lsts_here in lsts_by_bl.items()})
 
         locs = locals()
-        return {meta: locs[meta] for meta in self.HERAData_metas}
+        self._metadata_cache = {meta: locs[meta] for meta in self.HERAData_metas}
+        return dict(self._metadata_cache)
 
     def _determine_blt_slicing(self):
         '''Determine the mapping between antenna pairs and slices of the blt axis of the data_array.'''
         self._blt_slices = get_blt_slices(self)
+        self._metadata_cache = None
 
     def _determine_pol_indexing(self):
         '''Determine the mapping between polnums and indices
@@ -350,8 +371,43 @@ class HERAData(UVData):
         self._polnum_indices = {}
         for i, polnum in enumerate(self.polarization_array):
             self._polnum_indices[polnum] = i
+        self._polstr_indices = {}  # filled in lazily by _pol_index()
+        self._metadata_cache = None
+
+    def _pol_index(self, pol):
+        '''Index in the polarization axis of the data_array of a polarization string (in any capitalization),
+        memoizing the conversion to a polnum. Raises a KeyError if the polarization is not in the data.'''
+        try:
+            return self._polstr_indices[pol]
+        except KeyError:
+            index = self._polnum_indices[polstr2num(pol, x_orientation=self.x_orientation)]
+            self._polstr_indices[pol] = index
+            return index
+
+    def _get_axes_hashes(self):
+        '''In-process hashes of the arrays that define the blt, frequency, polarization, and antenna axes.'''
+        def _hash(*arrays):
+            return tuple([None if arr is None else (np.shape(arr), hash(np.ascontiguousarray(arr).tobytes())) for arr in arrays])
+        return {'blt': _hash(self.ant_1_array, self.ant_2_array, self.time_array, self.lst_array),
+                'freq': _hash(self.freq_array),
+                'pol': _hash(self.polarization_array),
+                'ant': _hash(self.antenna_numbers, self.antenna_positions, self.telescope_location)}
+
+    def _update_axis_caches(self):
+        '''Recompute the blt slices, polarization indices, and cached metadata after a read() or select(),
+        but only for the axes that have actually changed, which makes repeated partial reads of the
+        same baselines, times, and polarizations cheap.'''
+        axes_hashes = self._get_axes_hashes()
+        previous = getattr(self, '_axes_hashes', {})
+        if axes_hashes['blt'] != previous.get('blt') or not hasattr(self, '_blt_slices'):
+            self._determine_blt_slicing()  # this may reorder the blts
+        if axes_hashes['pol'] != previous.get('pol') or not hasattr(self, '_polnum_indices'):
+            self._determine_pol_indexing()
+        if axes_hashes != previous:
+            self._metadata_cache = None
+        self._axes_hashes = self._get_axes_hashes()
 
-    def _get_slice(self, data_array, key):
+    def _get_slice(self, data_array, key, copy=True):
         '''Return a copy of the Nint by Nfreq waterfall or waterfalls for a given key. Abstracts
         away both baseline ordering (by applying complex conjugation) and polarization capitalization.
 
@@ -361,19 +417,19 @@ class HERAData(UVData):
             key: if of the form (0,1,'nn'), return anumpy array.
                  if of the form (0,1), return a dict mapping pol strings to waterfalls.
                  if of of the form 'nn', return a dict mapping ant-pair tuples to waterfalls.
+            copy: if False, return views into data_array (rather than copies) wherever possible, i.e.
+                for keys in the same baseline orientation as the data, whose blts form regular slices.
         '''
         if isinstance(key, str):  # asking for a pol
-            return {antpair: self._get_slice(data_array, antpair + (key,)) for antpair in self.get_antpairs()}
+            return {antpair: self._get_slice(data_array, antpair + (key,), copy=copy) for antpair in self.get_antpairs()}
         elif len(key) == 2:  # asking for antpair
             pols = np.array([polnum2str(polnum, x_orientation=self.x_orientation) for polnum in self.polarization_array])
-            return {pol: self._get_slice(data_array, key + (pol,)) for pol in pols}
+            return {pol: self._get_slice(data_array, key + (pol,), copy=copy) for pol in pols}
         elif len(key) == 3:  # asking for bl-pol
             try:
-                return np.array(data_array[self._blt_slices[tuple(key[0:2])], 0, :,
-                                           self._polnum_indices[polstr2num(key[2], x_orientation=self.x_orientation)]])
+                return np.array(data_array[self._blt_slices[tuple(key[0:2])], 0, :, self._pol_index(key[2])], copy=copy)
             except KeyError:
-                return np.conj(data_array[self._blt_slices[tuple(key[1::-1])], 0, :,
-                                          self._polnum_indices[polstr2num(conj_pol(key[2]), x_orientation=self.x_orientation)]])
+                return np.conj(data_array[self._blt_slices[tuple(key[1::-1])], 0, :, self._pol_index(conj_pol(key[2]))])
         else:
             raise KeyError('Unrecognized key type for slicing data.')
 
@@ -397,20 +453,26 @@ class HERAData(UVData):
                 self._set_slice(data_array, (key + (pol,)), value[pol])
         elif len(key) == 3:  # providing bl-pol
             try:
-                data_array[self._blt_slices[tuple(key[0:2])], 0, :,
-                           self._polnum_indices[polstr2num(key[2], x_orientation=self.x_orientation)]] = value
+                data_array[self._blt_slices[tuple(key[0:2])], 0, :, self._pol_index(key[2])] = value
             except(KeyError):
-                data_array[self._blt_slices[tuple(key[1::-1])], 0, :,
-                           self._polnum_indices[polstr2num(conj_pol(key[2]), x_orientation=self.x_orientation)]] = np.conj(value)
+                data_array[self._blt_slices[tuple(key[1::-1])], 0, :, self._pol_index(conj_pol(key[2]))] = np.conj(value)
         else:
             raise KeyError('Unrecognized key type for slicing data.')
 
-    def build_datacontainers(self):
+    def build_datacontainers(self, views=False):
         '''Turns the data currently loaded into the HERAData object into DataContainers.
         Returned DataContainers include useful metadata specific to the data actually
         in the DataContainers (which may be a subset of the total data). This includes
         antenna positions, frequencies, all times, all lsts, and times and lsts by baseline.
 
+        Arguments:
+            views: if True, the waterfalls in the DataContainers are numpy views into self.data_array,
+                self.flag_array, and self.nsample_array (wherever a baseline's blts form a regular slice),
+                rather than copies, which avoids holding two copies of the data in memory. Modifying them in
+                place then modifies this object (and vice versa), so update() is only needed for new keys or
+                reassigned waterfalls. The metadata arrays (e.g. freqs and times) are likewise shared with this
+                object's cached metadata. Default False returns independent copies of both.
+
         Returns:
             data: DataContainer mapping baseline keys to complex visibility waterfalls
             flags: DataContainer mapping baseline keys to boolean flag waterfalls
@@ -420,22 +482,23 @@ class HERAData(UVData):
         data, flags, nsamples = odict(), odict(), odict()
         meta = self.get_metadata_dict()
         for bl in meta['bls']:
-            data[bl] = self._get_slice(self.data_array, bl)
-            flags[bl] = self._get_slice(self.flag_array, bl)
-            nsamples[bl] = self._get_slice(self.nsample_array, bl)
+            data[bl] = self._get_slice(self.data_array, bl, copy=not views)
+            flags[bl] = self._get_slice(self.flag_array, bl, copy=not views)
+            nsamples[bl] = self._get_slice(self.nsample_array, bl, copy=not views)
         data = DataContainer(data)
         flags = DataContainer(flags)
         nsamples = DataContainer(nsamples)
 
-        # store useful metadata inside the DataContainers
+        # store useful metadata inside the DataContainers. With views, share the cached arrays by reference but give
+        # each container its own dictionaries, since e.g. DataContainer.select_or_expand_times() replaces their values
         for dc in [data, flags, nsamples]:
             for attr in ['antpos', 'freqs', 'times', 'lsts', 'times_by_bl', 'lsts_by_bl']:
-                setattr(dc, attr, copy.deepcopy(meta[attr]))
+                setattr(dc, attr, copy.copy(meta[attr]) if views else copy.deepcopy(meta[attr]))
 
         return data, flags, nsamples
 
     def read(self, bls=None, polarizations=None, times=None, frequencies=None,
-             freq_chans=None, axis=None, read_data=True, return_data=True,
+             freq_chans=None, axis=None, read_data=True, return_data=True, views=False,
              run_check=True, check_extra=True, run_check_acceptability=True, **kwargs):
         '''Reads data from file. Supports partial data loading. Default: read all data in file.
 
@@ -460,6 +523,8 @@ class HERAData(UVData):
                 basic metadata will be read in and nothing will be returned. Results in an
                 incompletely defined object (check will not pass). Default True.
             return_data: bool, if True, return the output of build_datacontainers().
+            views: bool, if True, the returned DataContainers hold views into this object's data_array,
+                flag_array, and nsample_array rather than copies. See build_datacontainers() for details.
             run_check: Option to check for the existence and proper shapes of
                 parameters after reading in the file. Default is True.
             check_extra: Option to check optional parameters as well as required
@@ -511,10 +576,9 @@ class HERAData(UVData):
 
         # process data into DataContainers
         if read_data or self.filetype == 'uvh5':
-            self._determine_blt_slicing()
-            self._determine_pol_indexing()
+            self._update_axis_caches()
         if read_data and return_data:
-            return self.build_datacontainers()
+            return self.build_datacontainers(views=views)
 
     def select(self, inplace=True, **kwargs):
         """
@@ -529,15 +593,8 @@ class HERAData(UVData):
         if inplace:
             output = self
 
-        # recompute slices if necessary
-        names = ['antenna_nums', 'antenna_names', 'ant_str',
-                 'bls', 'times', 'blt_inds']
-        for n in names:
-            if n in kwargs and kwargs[n] is not None:
-                output._determine_blt_slicing()
-                break
-        if 'polarizations' in kwargs and kwargs['polarizations'] is not None:
-            output._determine_pol_indexing()
+        # recompute slices and metadata if necessary
+        output._update_axis_caches()
 
         if not inplace:
             return output
@@ -641,7 +698,7 @@ class HERAData(UVData):
                                   this.nsample_array, **self.last_read_kwargs)
 
     def iterate_over_bls(self, Nbls=1, bls=None, chunk_by_redundant_group=False, reds=None,
-                         bl_error_tol=1.0, include_autos=True, frequencies=None):
+                         bl_error_tol=1.0, include_autos=True, frequencies=None, prefetch=0):
         '''Produces a generator that iteratively yields successive calls to
         HERAData.read() by baseline or group of baselines.
 
@@ -670,6 +727,9 @@ class HERAData(UVData):
             frequencies: array-like, optional
                 optional list of float frequencies to load.
                 Default (None) loads all frequencies in data.
+            prefetch: number of upcoming reads to perform in a background thread while the current chunk is
+                being processed (see HERAData._iterate_reads). Holds up to prefetch + 1 chunks in memory at once.
+                Default 0 performs each read only when the next chunk is requested.
 
         Yields:
             data, flags, nsamples: DataContainers (see HERAData.read() for more info).
@@ -715,10 +775,10 @@ class HERAData(UVData):
             reds = redcal.filter_reds(reds, bls=bls)
             # make sure that every baseline is in reds
             baseline_chunks = chunk_baselines_by_redundant_groups(reds=reds, max_chunk_size=Nbls)
-        for chunk in baseline_chunks:
-            yield self.read(bls=chunk, frequencies=frequencies)
+        yield from self._iterate_reads([{'bls': chunk, 'frequencies': frequencies} for chunk in baseline_chunks],
+                                       prefetch=prefetch)
 
-    def iterate_over_freqs(self, Nchans=1, freqs=None):
+    def iterate_over_freqs(self, Nchans=1, freqs=None, prefetch=0):
         '''Produces a generator that iteratively yields successive calls to
         HERAData.read() by frequency channel or group of contiguous channels.
 
@@ -726,6 +786,9 @@ class HERAData(UVData):
             Nchans: number of frequencies to load at once.
             freqs: optional user-provided list of frequencies to iterate over.
                 Default: use self.freqs (which only works for uvh5).
+            prefetch: number of upcoming reads to perform in a background thread while the current chunk is
+                being processed (see HERAData._iterate_reads). Holds up to prefetch + 1 chunks in memory at once.
+                Default 0 performs each read only when the next chunk is requested.
 
         Yields:
             data, flags, nsamples: DataContainers (see HERAData.read() for more info).
@@ -737,10 +800,10 @@ class HERAData(UVData):
             freqs = self.freqs
             if isinstance(self.freqs, dict):  # multiple files
                 freqs = np.unique(list(self.freqs.values()))
-        for i in range(0, len(freqs), Nchans):
-            yield self.read(frequencies=freqs[i:i + Nchans])
+        yield from self._iterate_reads([{'frequencies': freqs[i:i + Nchans]} for i in range(0, len(freqs), Nchans)],
+                                       prefetch=prefetch)
 
-    def iterate_over_times(self, Nints=1, times=None):
+    def iterate_over_times(self, Nints=1, times=None, prefetch=0):
         '''Produces a generator that iteratively yields successive calls to
         HERAData.read() by time or group of contiguous times.
 
@@ -748,6 +811,9 @@ class HERAData(UVData):
             Nints: number of integrations to load at once.
             times: optional user-provided list of times to iterate over.
                 Default: use self.times (which only works for uvh5).
+            prefetch: number of upcoming reads to perform in a background thread while the current chunk is
+                being processed (see HERAData._iterate_reads). Holds up to prefetch + 1 chunks in memory at once.
+                Default 0 performs each read only when the next chunk is requested.
 
         Yields:
             data, flags, nsamples: DataContainers (see HERAData.read() for more info).
@@ -759,8 +825,66 @@ class HERAData(UVData):
             times = self.times
             if isinstance(times, dict):  # multiple files
                 times = np.unique(list(times.values()))
-        for i in range(0, len(times), Nints):
-            yield self.read(times=times[i:i + Nints])
+        yield from self._iterate_reads([{'times': times[i:i + Nints]} for i in range(0, len(times), Nints)],
+                                       prefetch=prefetch)
+
+    def _shallow_copy(self):
+        '''Returns a new HERAData object sharing the arrays and metadata of self, but with its own copies of
+        self's UVParameters, so that reading new data into self afterwards leaves the copy unchanged.'''
+        new = HERAData.__new__(HERAData)
+        new.__dict__.update({key: (copy.copy(value) if isinstance(value, UVParameter) else value)
+                             for key, value in self.__dict__.items()})
+        return new
+
+    def _take_over(self, other):
+        '''Replace the data and metadata of self with those of another HERAData object (e.g. one that was
+        read in a background thread), keeping track of the partial writes that self has started.'''
+        writers = getattr(self, '_writers', None)
+        self.__dict__.update(other.__dict__)
+        if writers is not None:
+            self._writers = writers
+
+    def _iterate_reads(self, read_kwargs_list, prefetch=0):
+        '''Generator yielding self.read(**read_kwargs) for each dictionary of read_kwargs in read_kwargs_list.
+
+        If prefetch > 0, the next prefetch reads are performed, in order, in a background thread while the
+        caller processes the current chunk. They are read by a single HERAData object initialized from
+        self.filepaths when the iteration starts (so the file headers are only read once), and a shallow copy
+        of it replaces the data and metadata of self when its chunk is yielded. So self holds the data of the
+        current chunk, just as after self.read() (e.g. for update() and partial_write()).
+        '''
+        if not prefetch:
+            for read_kwargs in read_kwargs_list:
+                yield self.read(**read_kwargs)
+            return
+        if self.filepaths is None:
+            raise NotImplementedError('Prefetching for HERAData objects that were not initialized from files has not been implemented.')
+
+        reader = []  # one HERAData object per iteration, only ever used by the single worker thread
+
+        def _read_chunk(read_kwargs):
+            if len(reader) == 0:
+                reader.append(HERAData(self.filepaths, filetype=self.filetype))
+            output = reader[0].read(**read_kwargs)
+            return reader[0]._shallow_copy(), output
+
+        to_read = iter(read_kwargs_list)
+        pending = collections.deque()
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            for read_kwargs in itertools.islice(to_read, prefetch):
+                pending.append(executor.submit(_read_chunk, read_kwargs))
+            while len(pending) > 0:
+                hd, output = pending.popleft().result()
+                # keep prefetch reads queued while the caller processes this chunk
+                for read_kwargs in itertools.islice(to_read, 1):
+                    pending.append(executor.submit(_read_chunk, read_kwargs))
+                self._take_over(hd)
+                yield output
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
 
 
 def read_filter_cache_scratch(cache_dir):
@@ -925,6 +1049,175 @@ def load_flags(flagfile, filetype='h5', return_meta=False):
         return flags
 
 
+def set_header_index(enabled=False, nprocs=8):
+    '''Configure how the metadata of many uvh5 files are read, e.g. by HERAData initialized with a list of files,
+    get_file_times, lst_bin_files, and baselines_from_filelist_position (see get_uvh5_metadata).
+
+    Arguments:
+        enabled: if True, the metadata of each file are stored in a sidecar index file, named HEADER_INDEX_FILENAME,
+            in the same directory as the file. Entries are keyed by file name, size, and modification time, so they
+            are reused until the file changes. Directories that can't be written to are not indexed. Default False.
+        nprocs: number of processes with which to read the headers of files that are not indexed. Parsing a header
+            is mostly Python code holding the GIL, so processes rather than threads are used. Default 8.
+    '''
+    _HEADER_INDEX_SETTINGS['enabled'] = enabled
+    _HEADER_INDEX_SETTINGS['nprocs'] = nprocs
+
+
+def _write_meta_to_h5_group(group, meta):
+    '''Store a HERAData metadata dictionary (see HERAData.get_metadata_dict()) in an h5py group.'''
+    group['ants'] = np.array(meta['ants'], dtype=int)
+    group['antpos'] = np.array([meta['antpos'][ant] for ant in meta['ants']], dtype=float).reshape(-1, 3)
+    for key in ['freqs', 'times', 'lsts']:
+        group[key] = np.asarray(meta[key])
+    group['pols'] = np.array(meta['pols'], dtype='S')
+    group['antpairs'] = np.array(meta['antpairs'], dtype=int).reshape(-1, 2)
+    # times and lsts by baseline are stored as flat arrays, since they may have different lengths per baseline
+    group['ntimes_by_bl'] = np.array([len(meta['times_by_bl'][ap]) for ap in meta['antpairs']], dtype=int)
+    group['times_by_bl'] = np.concatenate([meta['times_by_bl'][ap] for ap in meta['antpairs']] + [np.zeros(0)])
+    group['lsts_by_bl'] = np.concatenate([meta['lsts_by_bl'][ap] for ap in meta['antpairs']] + [np.zeros(0)])
+
+
+def _read_meta_from_h5_group(group):
+    '''Load a HERAData metadata dictionary stored by _write_meta_to_h5_group().'''
+    ants = group['ants'][()]
+    meta = {'ants': ants, 'antpos': odict(zip(ants, group['antpos'][()])),
+            'freqs': group['freqs'][()], 'times': group['times'][()], 'lsts': group['lsts'][()],
+            'pols': [pol.decode() for pol in group['pols'][()]],
+            'antpairs': [tuple(ap) for ap in group['antpairs'][()].tolist()]}
+    meta['bls'] = [antpair + (pol,) for antpair in meta['antpairs'] for pol in meta['pols']]
+    splits = np.cumsum(group['ntimes_by_bl'][()])[:-1]
+    for key in ['times_by_bl', 'lsts_by_bl']:
+        meta[key] = dict(zip(meta['antpairs'], np.split(group[key][()], splits)))
+        meta[key].update({(ant1, ant0): val for (ant0, ant1), val in meta[key].items()})
+    return meta
+
+
+def _read_header_index(dirname, filenames):
+    '''Load the entries of the sidecar header index in dirname that are up to date for the given file names.
+    Returns a dictionary mapping file names to metadata dictionaries (missing or unreadable entries are left out).'''
+    index_file = os.path.join(dirname, HEADER_INDEX_FILENAME)
+    metas = {}
+    if not os.path.exists(index_file):
+        return metas
+    try:
+        with h5py.File(index_file, 'r') as f:
+            for filename in filenames:
+                if filename in f:
+                    stat = os.stat(os.path.join(dirname, filename))
+                    attrs = f[filename].attrs
+                    if attrs['size'] == stat.st_size and attrs['mtime_ns'] == stat.st_mtime_ns:
+                        metas[filename] = _read_meta_from_h5_group(f[filename])
+    except (OSError, KeyError):  # e.g. a corrupt index, which will be rewritten
+        return {}
+    return metas
+
+
+def _update_header_index(dirname, metas):
+    '''Add or replace entries in the sidecar header index in dirname for a dictionary mapping file names to metadata
+    dictionaries. The index is rewritten to a temporary file and moved into place, so that concurrent jobs never read
+    partial indices, while holding an exclusive lock on a lock file next to it, so that concurrent updates don't drop
+    each other's entries. Does nothing if the directory can't be written to.'''
+    index_file = os.path.join(dirname, HEADER_INDEX_FILENAME)
+    try:
+        lock = open(index_file + '.lock', 'a')
+    except OSError:  # e.g. a read-only directory
+        return
+    with lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # released when the lock file is closed
+        try:
+            fd, tmp_name = tempfile.mkstemp(dir=dirname, prefix=HEADER_INDEX_FILENAME, suffix='.tmp')
+            os.close(fd)
+        except OSError:
+            return
+        try:
+            with h5py.File(tmp_name, 'w') as f:
+                if os.path.exists(index_file):
+                    try:
+                        with h5py.File(index_file, 'r') as old:
+                            for filename in old:
+                                if filename not in metas and os.path.exists(os.path.join(dirname, filename)):
+                                    old.copy(filename, f)
+                    except OSError:
+                        pass
+                for filename, meta in metas.items():
+                    stat = os.stat(os.path.join(dirname, filename))
+                    group = f.create_group(filename)
+                    group.attrs['size'] = stat.st_size
+                    group.attrs['mtime_ns'] = stat.st_mtime_ns
+                    _write_meta_to_h5_group(group, meta)
+            os.replace(tmp_name, index_file)
+        except OSError:
+            pass
+        finally:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+
+
+def _read_uvh5_meta(filepath, read_kwargs={}):
+    '''Read the HERAData metadata dictionary of a single uvh5 file. Used by get_uvh5_metadata() in worker processes.'''
+    return HERAData(filepath, filetype='uvh5', **read_kwargs).get_metadata_dict()
+
+
+def get_uvh5_metadata(filepaths, **read_kwargs):
+    '''Get the HERAData metadata (see HERAData.get_metadata_dict()) of many uvh5 files, reading their headers in a
+    pool of processes and, if enabled, reusing and updating a sidecar index in each directory (see set_header_index).
+
+    Arguments:
+        filepaths: list of paths to uvh5 files
+        read_kwargs: keyword arguments passed to HERAData when reading the header of a file (e.g. run_check)
+
+    Returns:
+        metas: list of metadata dictionaries, one per path in filepaths
+    '''
+    metas = [None] * len(filepaths)
+    enabled, nprocs = _HEADER_INDEX_SETTINGS['enabled'], _HEADER_INDEX_SETTINGS['nprocs']
+    by_dir = odict()
+    for i, f in enumerate(filepaths):
+        by_dir.setdefault(os.path.dirname(os.path.abspath(f)), []).append(i)
+    if enabled:
+        for dirname, inds in by_dir.items():
+            indexed = _read_header_index(dirname, [os.path.basename(filepaths[i]) for i in inds])
+            for i in inds:
+                metas[i] = indexed.get(os.path.basename(filepaths[i]), None)
+
+    # read the headers of the remaining files in parallel
+    to_read = [i for i, meta in enumerate(metas) if meta is None]
+    if nprocs > 1 and len(to_read) > 1:
+        with ProcessPoolExecutor(max_workers=min(nprocs, len(to_read))) as executor:
+            new_metas = list(executor.map(_read_uvh5_meta, [filepaths[i] for i in to_read], [read_kwargs] * len(to_read)))
+    else:
+        new_metas = [_read_uvh5_meta(filepaths[i], read_kwargs) for i in to_read]
+    for i, meta in zip(to_read, new_metas):
+        metas[i] = meta
+
+    if enabled:
+        to_read = set(to_read)
+        for dirname, inds in by_dir.items():
+            new_entries = {os.path.basename(filepaths[i]): metas[i] for i in inds if i in to_read}
+            if len(new_entries) > 0:
+                _update_header_index(dirname, new_entries)
+    return metas
+
+
+def _uvh5_file_times(filepath):
+    '''Get the unique lsts (in order of appearance) and unique times of a uvh5 file directly from its header,
+    which is faster than loading the entire file via HERAData. Used by get_file_times().'''
+    with h5py.File(filepath, mode='r') as _f:
+        time_array = np.unique(_f[u'Header'][u'time_array'])
+        if u'lst_array' in _f[u'Header']:
+            lst_array = np.ravel(_f[u'Header'][u'lst_array'])
+        else:
+            lst_array = np.ravel(uvutils.get_lst_for_time(_f[u'Header'][u'time_array'],
+                                                          _f[u'Header'][u'latitude'][()],
+                                                          _f[u'Header'][u'longitude'][()],
+                                                          _f[u'Header'][u'altitude'][()]))
+    lst_indices = np.unique(lst_array, return_index=True)[1]
+    # resort by their appearance in lst_array
+    return lst_array[np.sort(lst_indices)], time_array
+
+
 def get_file_times(filepaths, filetype='uvh5'):
     """
     Get a file's lst_array in radians and time_array in Julian Date.
@@ -934,6 +1227,8 @@ def get_file_times(filepaths, filetype='uvh5'):
 
     Note: this is not currently compatible with Baseline Dependent Averaged data.
 
+    uvh5 headers are read in parallel processes or from a sidecar index, see set_header_index().
+
     Args:
         filepaths : type=list or str, filepath or list of filepaths
         filetype : str, options=['miriad', 'uvh5']
@@ -963,6 +1258,16 @@ def get_file_times(filepaths, filetype='uvh5'):
     # get Nfiles
     Nfiles = len(filepaths)
 
+    # read uvh5 times and lsts from the header index if enabled, otherwise directly from files in parallel
+    if filetype == 'uvh5':
+        if _HEADER_INDEX_SETTINGS['enabled']:
+            uvh5_times = [(meta['lsts'], meta['times']) for meta in get_uvh5_metadata(filepaths)]
+        elif _HEADER_INDEX_SETTINGS['nprocs'] > 1 and Nfiles > 1:
+            with ProcessPoolExecutor(max_workers=min(_HEADER_INDEX_SETTINGS['nprocs'], Nfiles)) as executor:
+                uvh5_times = list(executor.map(_uvh5_file_times, filepaths))
+        else:
+            uvh5_times = [_uvh5_file_times(f) for f in filepaths]
+
     # iterate over filepaths and extract time info
     for i, f in enumerate(filepaths):
         if filetype == 'miriad':
@@ -979,19 +1284,8 @@ def get_file_times(filepaths, filetype='uvh5'):
             time_array = start_time + np.arange(uv['ntimes']) * int_time
 
         elif filetype == 'uvh5':
-            # get times directly from uvh5 file's header: faster than loading entire file via HERAData
-            with h5py.File(f, mode='r') as _f:
-                time_array = np.unique(_f[u'Header'][u'time_array'])
-                if u'lst_array' in _f[u'Header']:
-                    lst_array = np.ravel(_f[u'Header'][u'lst_array'])
-                else:
-                    lst_array = np.ravel(uvutils.get_lst_for_time(_f[u'Header'][u'time_array'],
-                                                                  _f[u'Header'][u'latitude'][()],
-                                                                  _f[u'Header'][u'longitude'][()],
-                                                                  _f[u'Header'][u'altitude'][()]))
-            lst_indices = np.unique(lst_array, return_index=True)[1]
-            # resort by their appearance in lst_array, then unwrap
-            lst_array = np.unwrap(lst_array[np.sort(lst_indices)])
+            lst_array, time_array = uvh5_times[i]
+            lst_array = np.unwrap(lst_array)
             int_time_rad = np.median(np.diff(lst_array))
             int_time = np.median(np.diff(time_array))
 
@@ -1011,6 +1305,133 @@ def get_file_times(filepaths, filetype='uvh5'):
         return dlsts, dtimes, file_lst_arrays, file_time_arrays
 
 
+def clear_file_times_cache():
+    '''Empty the in-process cache of file times and LSTs used by FileTimeIndex. Does not affect the sidecar
+    header index, if any (see set_header_index).'''
+    _FILE_TIMES_CACHE.clear()
+
+
+def _cached_file_times(filepaths, filetype='uvh5'):
+    '''Get the (dlst, dtime, lst_array, time_array) of each file in filepaths (see get_file_times), only reading
+    files that have not been read before in this process or that have changed since.'''
+    keys = []
+    for f in filepaths:
+        stat = os.stat(f)
+        keys.append((os.path.abspath(f), filetype, stat.st_size, stat.st_mtime_ns))
+    to_read = [i for i, key in enumerate(keys) if key not in _FILE_TIMES_CACHE]
+    if len(to_read) > 0:
+        dlsts, dtimes, larrs, tarrs = get_file_times([filepaths[i] for i in to_read], filetype=filetype)
+        for n, i in enumerate(to_read):
+            _FILE_TIMES_CACHE[keys[i]] = (dlsts[n], dtimes[n], np.array(larrs[n]), np.array(tarrs[n]))
+    entries = []
+    for key in keys:
+        _FILE_TIMES_CACHE.move_to_end(key)
+        entries.append(_FILE_TIMES_CACHE[key])
+    while len(_FILE_TIMES_CACHE) > max(_FILE_TIMES_CACHE_MAXSIZE, len(keys)):
+        _FILE_TIMES_CACHE.popitem(last=False)
+    return entries
+
+
+class FileTimeIndex(object):
+    '''Catalogue of the times and LSTs of every integration in a list of files, answering which files
+    and integrations cover a range of JDs or LSTs with binary searches instead of re-opening files.
+
+    Times are read once per file per process (see clear_file_times_cache) and, for uvh5 files, are also
+    stored in and reused from the sidecar header index next to the data if that is enabled (see set_header_index).
+    '''
+
+    def __init__(self, filepaths, filetype='uvh5'):
+        '''Build the index.
+
+        Arguments:
+            filepaths: filepath or list of filepaths, ordered by the time of their first integration
+            filetype: str, options=['miriad', 'uvh5']
+        '''
+        if isinstance(filepaths, str):
+            filepaths = [filepaths]
+        self.filepaths = list(filepaths)
+        self.filetype = filetype
+        entries = _cached_file_times(self.filepaths, filetype=filetype)
+        self.dlsts = np.array([entry[0] for entry in entries])
+        self.dtimes = np.array([entry[1] for entry in entries])
+        self.lst_arrays = [np.array(entry[2]) for entry in entries]
+        self.time_arrays = [np.array(entry[3]) for entry in entries]
+
+        # flattened and sorted times and LSTs of all integrations, with the file and integration index of each
+        file_inds = np.concatenate([np.full(len(ta), i, dtype=int) for i, ta in enumerate(self.time_arrays)] + [np.zeros(0, dtype=int)])
+        int_inds = np.concatenate([np.arange(len(ta)) for ta in self.time_arrays] + [np.zeros(0, dtype=int)])
+        all_times = np.concatenate(self.time_arrays + [np.zeros(0)])
+        order = np.argsort(all_times, kind='stable')
+        self._times, self._time_file_inds, self._time_int_inds = all_times[order], file_inds[order], int_inds[order]
+
+        # LSTs unwrapped relative to the first integration of the first file
+        lst_arrays = [la + 2 * np.pi if (len(la) > 0 and la[0] < self.lst_arrays[0][0]) else la for la in self.lst_arrays]
+        all_lsts = np.concatenate(lst_arrays + [np.zeros(0)])
+        order = np.argsort(all_lsts, kind='stable')
+        self._lsts, self._lst_file_inds, self._lst_int_inds = all_lsts[order], file_inds[order], int_inds[order]
+
+        # file start and end LSTs, buffered by dlst / 2
+        self._lst_starts = np.array([la[0] - dlst / 2.0 for la, dlst in zip(lst_arrays, self.dlsts)])
+        self._lst_ends = np.array([la[-1] + dlst / 2.0 for la, dlst in zip(lst_arrays, self.dlsts)])
+        self._lst_bounds_sorted = np.all(np.diff(self._lst_starts) >= 0) and np.all(np.diff(self._lst_ends) >= 0)
+
+    def get_file_times(self):
+        '''Return copies of (dlsts, dtimes, file_lst_arrays, file_time_arrays) in the same format as get_file_times.'''
+        return (self.dlsts.copy(), self.dtimes.copy(), np.asarray([np.array(la) for la in self.lst_arrays]),
+                np.asarray([np.array(ta) for ta in self.time_arrays]))
+
+    def _group_by_file(self, file_inds, int_inds):
+        '''Map each filepath to a sorted array of the integration indices in int_inds that belong to it.'''
+        integrations = odict()
+        for fi in np.unique(file_inds):
+            integrations[self.filepaths[fi]] = np.sort(int_inds[file_inds == fi])
+        return integrations
+
+    def integrations_in_time_range(self, start_jd, stop_jd):
+        '''Find all integrations with start_jd <= time <= stop_jd. Returns an ordered dictionary mapping
+        the filepaths that contain any of them to arrays of integration indices within each file.'''
+        lo, hi = np.searchsorted(self._times, start_jd, side='left'), np.searchsorted(self._times, stop_jd, side='right')
+        return self._group_by_file(self._time_file_inds[lo:hi], self._time_int_inds[lo:hi])
+
+    def files_in_time_range(self, start_jd, stop_jd):
+        '''Return the list of filepaths with any integration with start_jd <= time <= stop_jd.'''
+        return list(self.integrations_in_time_range(start_jd, stop_jd).keys())
+
+    def _shift_lst_range(self, lst_min, lst_max):
+        '''Wrap an LST range (with lst_max >= lst_min) to be on the same branch as the unwrapped LSTs of the index.'''
+        if len(self._lst_starts) > 0 and lst_max < self._lst_starts[0]:
+            lst_min, lst_max = lst_min + 2 * np.pi, lst_max + 2 * np.pi
+        return lst_min, lst_max
+
+    def integrations_in_lst_range(self, lst_min, lst_max):
+        '''Find all integrations with lst_min <= LST <= lst_max [radians], where lst_max >= lst_min may be unwrapped.
+        Returns an ordered dictionary mapping the filepaths that contain any of them to arrays of integration indices.'''
+        lst_min, lst_max = self._shift_lst_range(lst_min, lst_max)
+        lo, hi = np.searchsorted(self._lsts, lst_min, side='left'), np.searchsorted(self._lsts, lst_max, side='right')
+        return self._group_by_file(self._lst_file_inds[lo:hi], self._lst_int_inds[lo:hi])
+
+    def files_in_lst_range(self, lst_min, lst_max, atol=0):
+        '''Return the list of filepaths whose LST range, buffered by half an integration, overlaps
+        lst_min - atol to lst_max + atol [radians], where lst_max >= lst_min may be unwrapped.'''
+        lst_min, lst_max = self._shift_lst_range(lst_min, lst_max)
+        if self._lst_bounds_sorted:
+            lo = np.searchsorted(self._lst_ends, lst_min - atol, side='right')
+            hi = np.searchsorted(self._lst_starts, lst_max + atol, side='left')
+            return self.filepaths[lo:max(lo, hi)]
+        overlap = (self._lst_starts < lst_max + atol) & (self._lst_ends > lst_min - atol)
+        return [f for f, o in zip(self.filepaths, overlap) if o]
+
+    def find_times(self, times):
+        '''Find which files contain each of the given times [JD] exactly. Returns an ordered dictionary mapping
+        filepaths (in the order of self.filepaths) to the list of times (in the order given) found in them.'''
+        found = {}
+        for t in times:
+            lo, hi = np.searchsorted(self._times, t, side='left'), np.searchsorted(self._times, t, side='right')
+            for fi in np.unique(self._time_file_inds[lo:hi]):
+                found.setdefault(fi, []).append(t)
+        return odict([(self.filepaths[fi], found[fi]) for fi in sorted(found)])
+
+
 def partial_time_io(hd, times, **kwargs):
     '''Perform partial io with a time-select on a HERAData object, even if it is intialized
     using multiple files, some of which do not contain any of the specified times.
@@ -1027,21 +1448,20 @@ def partial_time_io(hd, times, **kwargs):
         '''
     assert hd.filetype == 'uvh5', 'This function only works for uvh5-based HERAData objects.'
     combined_hd = None
-    for f in hd.filepaths:
+    # only open files that contain any of the times
+    for f, times_here in FileTimeIndex(hd.filepaths).find_times(times).items():
         hd_here = HERAData(f)
-        times_here = [t for t in times if t in hd_here.times]
-        if len(times_here) > 0:
-            hd_here.read(times=times_here, return_data=False, **kwargs)
-            if combined_hd is None:
-                combined_hd = hd_here
-            else:
-                combined_hd += hd_here
+        hd_here.read(times=times_here, return_data=False, **kwargs)
+        if combined_hd is None:
+            combined_hd = hd_here
+        else:
+            combined_hd += hd_here
     combined_hd = to_HERAData(combined_hd)  # re-runs the slicing and indexing
     return combined_hd.build_datacontainers()
 
 
-def save_redcal_meta(meta_filename, fc_meta, omni_meta, freqs, times, lsts, antpos, history):
-    '''Saves redcal metadata to a hdf5 file. See also read_redcal_meta.
+def save_redcal_meta(meta_filename, fc_meta, omni_meta, freqs, times, lsts, antpos, history, timing_meta=None):
+    '''Saves redcal metadata to a hdf5 file. See also read_redcal_meta and read_redcal_timing_meta.
 
     Arguments:
         meta_filename: path to hdf5 file to save
@@ -1052,6 +1472,8 @@ def save_redcal_meta(meta_filename, fc_meta, omni_meta, freqs, times, lsts, antp
         lsts: 1D numpy array of LSTs in the data
         antpos: dictionary of antenna positions in the form {ant_index: np.array([x,y,z])}
         history: string describing the creation of this file
+        timing_meta: optional (nested) dictionary of timing and convergence telemetry, such as that produced by
+            redcal.redcal_run(), mapping string keys to numpy arrays, numbers, strings, or further dictionaries.
     '''
     with h5py.File(meta_filename, "w") as outfile:
         # save the metadata of the metadata
@@ -1082,6 +1504,54 @@ def save_redcal_meta(meta_filename, fc_meta, omni_meta, freqs, times, lsts, antp
         omni_grp['conv_crit'] = np.array([omni_meta['conv_crit'][pols] for pols in pols_keys])
         omni_grp['conv_crit'].attrs['conv_crit'] = np.string_(pols_keys)
 
+        # save the timing metadata, if any, as nested groups
+        if timing_meta is not None:
+            _write_dict_to_h5_group(outfile.create_group('timing_meta'), timing_meta)
+
+
+def _write_dict_to_h5_group(grp, dct):
+    '''Recursively writes a dictionary with string keys to an h5py group, turning sub-dictionaries into
+    subgroups and encoding strings (and arrays of them) as bytes.'''
+    for key, value in dct.items():
+        if isinstance(value, dict):
+            _write_dict_to_h5_group(grp.create_group(key), value)
+        elif isinstance(value, str) or np.asarray(value).dtype.kind == 'U':
+            grp[key] = np.string_(value)
+        else:
+            grp[key] = value
+
+
+def _read_dict_from_h5_group(grp):
+    '''Recursively reads an h5py group written by _write_dict_to_h5_group into a dictionary, decoding bytes.'''
+    dct = {}
+    for key, value in grp.items():
+        if isinstance(value, h5py.Group):
+            dct[key] = _read_dict_from_h5_group(value)
+        else:
+            value = value[()]
+            if isinstance(value, bytes):
+                value = value.decode('utf8')
+            elif isinstance(value, np.ndarray) and value.dtype.kind == 'S':
+                value = value.astype(str)
+            dct[key] = value
+    return dct
+
+
+def read_redcal_timing_meta(meta_filename):
+    '''Reads the timing and convergence telemetry saved to a redcal metadata hdf5 file by save_redcal_meta.
+
+    Arguments:
+        meta_filename: path to hdf5 file to load
+
+    Returns:
+        timing_meta: (nested) dictionary of timing metadata, such as that produced by redcal.redcal_run(),
+            or None if the file has no timing metadata.
+    '''
+    with h5py.File(meta_filename, "r") as infile:
+        if 'timing_meta' not in infile:
+            return None
+        return _read_dict_from_h5_group(infile['timing_meta'])
+
 
 def read_redcal_meta(meta_filename):
     '''Reads redcal metadata to a hdf5 file. See also save_redcal_meta.
@@ -1575,6 +2045,38 @@ def load_cal(input_cal, return_meta=False):
         return gains, flags
 
 
+def _covers_ants_and_pols(container, ant_array, pol_array):
+    '''Returns True if container is an ArrayContainer with a key for every antenna and polarization.'''
+    return isinstance(container, ArrayContainer) and np.all([(ant, pol) in container for ant in ant_array for pol in pol_array])
+
+
+def _cal_dicts_to_arrays(gains, flags, quality, ant_array, pol_array, Nfreqs, Ntimes):
+    '''Helper function for write_cal that copies dictionaries of gains, flags, and qualities into
+    UVCal-shaped arrays antenna by antenna, filling in antennas missing from gains as flagged.'''
+    Nants_data, Nspws, Njones = len(ant_array), 1, len(pol_array)
+    gain_array = np.empty((Nants_data, Nspws, Nfreqs, Ntimes, Njones), np.complex)
+    flag_array = np.empty((Nants_data, Nspws, Nfreqs, Ntimes, Njones), np.bool)
+    quality_array = np.empty((Nants_data, Nspws, Nfreqs, Ntimes, Njones), np.float)
+    for i, p in enumerate(pol_array):
+        for j, a in enumerate(ant_array):
+            # ensure (a, p) is in gains
+            if (a, p) in gains:
+                gain_array[j, :, :, :, i] = gains[(a, p)].T[None, :, :]
+                if flags is not None:
+                    flag_array[j, :, :, :, i] = flags[(a, p)].T[None, :, :]
+                else:
+                    flag_array[j, :, :, :, i] = np.zeros((Nspws, Nfreqs, Ntimes), np.bool)
+                if quality is not None:
+                    quality_array[j, :, :, :, i] = quality[(a, p)].T[None, :, :]
+                else:
+                    quality_array[j, :, :, :, i] = np.ones((Nspws, Nfreqs, Ntimes), np.float)
+            else:
+                gain_array[j, :, :, :, i] = np.ones((Nspws, Nfreqs, Ntimes), np.complex)
+                flag_array[j, :, :, :, i] = np.ones((Nspws, Nfreqs, Ntimes), np.bool)
+                quality_array[j, :, :, :, i] = np.ones((Nspws, Nfreqs, Ntimes), np.float)
+    return gain_array, flag_array, quality_array
+
+
 def write_cal(fname, gains, freqs, times, flags=None, quality=None, total_qual=None, antnums2antnames=None,
               write_file=True, return_uvc=True, outdir='./', overwrite=False, gain_convention='divide',
               history=' ', x_orientation="north", telescope_name='HERA', cal_style='redundant',
@@ -1648,30 +2150,24 @@ def write_cal(fname, gains, freqs, times, flags=None, quality=None, total_qual=N
     channel_width = np.median(np.diff(freq_array))
 
     # form gain, flags and qualities
-    gain_array = np.empty((Nants_data, Nspws, Nfreqs, Ntimes, Njones), np.complex)
-    flag_array = np.empty((Nants_data, Nspws, Nfreqs, Ntimes, Njones), np.bool)
-    quality_array = np.empty((Nants_data, Nspws, Nfreqs, Ntimes, Njones), np.float)
+    if _covers_ants_and_pols(gains, ant_array, pol_array) and \
+            np.all([(d is None) or _covers_ants_and_pols(d, ant_array, pol_array) for d in [flags, quality]]):
+        # already stored contiguously in the UVCal layout, so use whole arrays rather than copying antenna by antenna
+        gain_array = gains.select_array(ant_array, pol_array)[:, None].astype(np.complex, copy=False)
+        if flags is not None:
+            flag_array = flags.select_array(ant_array, pol_array)[:, None].astype(np.bool, copy=False)
+        else:
+            flag_array = np.zeros((Nants_data, Nspws, Nfreqs, Ntimes, Njones), np.bool)
+        if quality is not None:
+            quality_array = quality.select_array(ant_array, pol_array)[:, None].astype(np.float, copy=False)
+        else:
+            quality_array = np.ones((Nants_data, Nspws, Nfreqs, Ntimes, Njones), np.float)
+    else:
+        gain_array, flag_array, quality_array = _cal_dicts_to_arrays(gains, flags, quality, ant_array, pol_array, Nfreqs, Ntimes)
     total_quality_array = np.empty((Nspws, Nfreqs, Ntimes, Njones), np.float)
-    for i, p in enumerate(pol_array):
-        if total_qual is not None:
+    if total_qual is not None:
+        for i, p in enumerate(pol_array):
             total_quality_array[0, :, :, i] = total_qual[p].T[None, :, :]
-        for j, a in enumerate(ant_array):
-            # ensure (a, p) is in gains
-            if (a, p) in gains:
-                gain_array[j, :, :, :, i] = gains[(a, p)].T[None, :, :]
-                if flags is not None:
-                    flag_array[j, :, :, :, i] = flags[(a, p)].T[None, :, :]
-                else:
-                    flag_array[j, :, :, :, i] = np.zeros((Nspws, Nfreqs, Ntimes), np.bool)
-                if quality is not None:
-                    quality_array[j, :, :, :, i] = quality[(a, p)].T[None, :, :]
-                else:
-                    quality_array[j, :, :, :, i] = np.ones((Nspws, Nfreqs, Ntimes), np.float)
-            else:
-                gain_array[j, :, :, :, i] = np.ones((Nspws, Nfreqs, Ntimes), np.complex)
-                flag_array[j, :, :, :, i] = np.ones((Nspws, Nfreqs, Ntimes), np.bool)
-                quality_array[j, :, :, :, i] = np.ones((Nspws, Nfreqs, Ntimes), np.float)
-
     if total_qual is None:
         total_quality_array = None
 
@@ -1826,9 +2322,8 @@ def baselines_from_filelist_position(filename, filelist, polarizations=None):
     for pol in polarizations:
         if pol.lower() not in POL_STR2NUM_DICT and pol.lower() not in ['ee', 'en', 'ne', 'nn']:
             raise ValueError("invalid polarization %s provided!" % pol)
-    # The reason this function is not in utils is that it needs to use HERAData
-    hd = HERAData(filename)
-    bls = [bl for bl in hd.bls if bl[-1] in polarizations]
+    # The reason this function is not in utils is that it needs to read the file's metadata
+    bls = [bl for bl in get_uvh5_metadata([filename])[0]['bls'] if bl[-1] in polarizations]
     file_index = filelist.index(filename)
     nfiles = len(filelist)
     # Determine chunk size
@@ -442,14 +442,14 @@ def config_lst_bin_files(data_files, dlst=None, atol=1e-10, lst_start=None, lst_
     """
     # get dlst from first data file if None
     if dlst is None:
-        dlst, _, _, _ = io.get_file_times(data_files[0][0], filetype='uvh5')
+        dlst = io.FileTimeIndex(data_files[0][0], filetype='uvh5').dlsts[0]
 
     # get time arrays for each file
     lst_arrays = []
     time_arrays = []
     for di, dfs in enumerate(data_files):
         # get times
-        dlsts, dtimes, larrs, tarrs = io.get_file_times(dfs, filetype='uvh5')
+        dlsts, dtimes, larrs, tarrs = io.FileTimeIndex(dfs, filetype='uvh5').get_file_times()
 
         # get lmin: LST of first integration from first file
         if di == 0:
@@ -616,6 +616,18 @@ def lst_bin_files(data_files, input_cals=None, dlst=None, verbose=True, ntimes_p
         utils.echo("LST file {} / {}: {}".format(i + 1, len(file_lsts), datetime.datetime.now()), type=1, verbose=verbose)
         fmin = f_lst[0] - (dlst / 2 + atol)
         fmax = f_lst[-1] + (dlst / 2 + atol)
+        hds = {}  # HERAData objects for files overlapping this output file, so headers are only read once
+
+        # get the baselines in each file overlapping this output file all at once, reading headers in parallel
+        # or from the header index (see io.set_header_index), to skip files without a baseline group's baselines
+        overlapping = []
+        for j in range(len(data_files)):
+            for k in range(len(data_files[j])):
+                larr = lst_arrs[j][k]
+                larr[larr < larr[0]] += 2 * np.pi  # unwrap la relative to itself
+                if not (larr[-1] < fmin or larr[0] > fmax):
+                    overlapping.append(data_files[j][k])
+        file_antpairs = {f: set(meta['antpairs']) for f, meta in zip(overlapping, io.get_uvh5_metadata(overlapping))}
 
         # iterate over baseline groups (for memory efficiency)
         data_conts, flag_conts, std_conts, num_conts = [], [], [], []
@@ -648,10 +660,19 @@ def lst_bin_files(data_files, input_cals=None, dlst=None, verbose=True, ntimes_p
                     # if overlap, get relevant time indicies
                     tinds = (larr > fmin) & (larr < fmax)
 
+                    # skip files without any baselines from blgroup, without opening them
+                    antpairs = file_antpairs[data_files[j][k]]
+                    if not np.any([(bl in antpairs) or (bl[::-1] in antpairs) for bl in blgroup]):
+                        utils.echo("No baselines from blgroup {} found in {}, skipping file for these bls".format(bi + 1, data_files[j][k]), verbose=verbose)
+                        continue
+
                     # load data: only times needed for this output LST-bin file
-                    hd = io.HERAData(data_files[j][k], filetype='uvh5')
+                    if data_files[j][k] not in hds:
+                        hds[data_files[j][k]] = io.HERAData(data_files[j][k], filetype='uvh5')
+                    hd = hds[data_files[j][k]]
                     try:
-                        data, flags, nsamps = hd.read(bls=blgroup, times=tarr[tinds])
+                        # views avoid keeping a second copy of the data in the cached HERAData object
+                        data, flags, nsamps = hd.read(bls=blgroup, times=tarr[tinds], views=True)
                         data.phase_type = 'drift'
                     except ValueError:
                         # if no baselines in the file, skip this file
@@ -59,7 +59,9 @@ def predict_noise_variance_from_autos(bl, data, dt=None, df=None, nsamples=None)
 
     ap1, ap2 = split_pol(bl[2])
     auto_bl1, auto_bl2 = (bl[0], bl[0], join_pol(ap1, ap1)), (bl[1], bl[1], join_pol(ap2, ap2))
-    var = np.abs(data[auto_bl1] * data[auto_bl2] / dt / df)
+    var = np.abs(data[auto_bl1] * data[auto_bl2])
+    # casting dt * df to the precision of the autocorrelations keeps single precision data in single precision
+    var = var / np.asarray(dt * df, dtype=var.dtype)
     if nsamples is not None:
         return var / nsamples[bl]
     return var
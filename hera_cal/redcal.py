@@ -6,19 +6,129 @@ import numpy as np
 from copy import deepcopy
 import argparse
 import os
+import pickle
+import hashlib
+import functools
+import contextlib
+import inspect
+import sys
+import tempfile
+import shutil
+import time
+import json
+import h5py
 import linsolve
+from scipy.sparse import csr_matrix
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 from . import utils
 from . import version
 from .noise import predict_noise_variance_from_autos
-from .datacontainer import DataContainer
-from .utils import split_pol, conj_pol, split_bl, reverse_bl, join_bl, join_pol, comply_pol
+from .datacontainer import DataContainer, ArrayContainer
+from .utils import split_pol, conj_pol, split_bl, reverse_bl, join_bl, join_pol, comply_pol, polnum2str, polstr2num
+from .utils import _precision_dtypes
 from .io import HERAData, HERACal, write_cal, save_redcal_meta
 from .apply_cal import calibrate_in_place
 
 
 SEC_PER_DAY = 86400.
 IDEALIZED_BL_TOL = 1e-8  # bl_error_tol for redcal.get_reds when using antenna positions calculated from reds
+_REDS_CACHE = OrderedDict()  # in-process LRU cache of redundancy structures, see set_reds_cache()
+_REDS_CACHE_SETTINGS = {'maxsize': 32, 'cache_dir': None}
+FIRSTCAL_BATCH_SIZE = 2**22  # max number of baseline pair product samples held in memory at once in firstcal
+REDCAL_TIMING_STAGES = ['read', 'firstcal', 'logcal', 'omnical', 'remove_degen', 'chisq', 'expand', 'write']
+
+
+def set_reds_cache(maxsize=32, cache_dir=None):
+    '''Configure the memoization of get_reds, filter_reds, and reds_to_antpos. Results are keyed by a hash of
+    all of the arguments (e.g. antpos, bl_error_tol, pols, pol_mode, and filters), so that repeated calls
+    with the same array layout (e.g. for every file in a night) skip recomputing the same redundancies.
+
+    Arguments:
+        maxsize: maximum number of results to keep in the in-process least-recently-used cache.
+            0 disables caching in memory. Default 32.
+        cache_dir: optional path to a directory for an on-disk cache that persists between processes, e.g.
+            shared by all jobs on a node. Cache files are pickles named by the hash with the extension
+            ".reds_cache". Like filter caches, they are meant as short-term scratch. Default None uses no
+            on-disk cache.
+    '''
+    _REDS_CACHE_SETTINGS['maxsize'] = maxsize
+    _REDS_CACHE_SETTINGS['cache_dir'] = cache_dir
+    while len(_REDS_CACHE) > max(maxsize, 0):
+        _REDS_CACHE.popitem(last=False)
+
+
+@contextlib.contextmanager
+def _reds_cache_dir(cache_dir):
+    '''Context manager that sets the on-disk cache directory (see set_reds_cache) while it is active, restoring the
+    previous setting afterwards. Does nothing if cache_dir is None.'''
+    previous = _REDS_CACHE_SETTINGS['cache_dir']
+    if cache_dir is not None:
+        _REDS_CACHE_SETTINGS['cache_dir'] = cache_dir
+    try:
+        yield
+    finally:
+        _REDS_CACHE_SETTINGS['cache_dir'] = previous
+
+
+def clear_reds_cache():
+    '''Empty the in-process cache of get_reds, filter_reds, and reds_to_antpos results. Does not affect
+    the on-disk cache, if any.'''
+    _REDS_CACHE.clear()
+
+
+def _copy_reds_result(result):
+    '''Copy a cached list of lists of baselines or dictionary of antenna positions so that it can be
+    safely modified by the caller without modifying the cache.'''
+    if isinstance(result, dict):
+        return {ant: np.array(pos) for ant, pos in result.items()}
+    return [list(red) for red in result]
+
+
+def _cache_reds(func):
+    '''Decorator for memoizing functions of redundancies using the cache configured by set_reds_cache().'''
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        maxsize, cache_dir = _REDS_CACHE_SETTINGS['maxsize'], _REDS_CACHE_SETTINGS['cache_dir']
+        if maxsize <= 0 and cache_dir is None:
+            return func(*args, **kwargs)
+
+        # hash the function name and all arguments, sorting sets so that equivalent inputs hash the same
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = [(name, sorted(val, key=repr) if isinstance(val, (set, frozenset)) else val)
+                     for name, val in bound.arguments.items()]
+        try:
+            key = hashlib.sha256(pickle.dumps((func.__name__, arguments), protocol=4)).hexdigest()
+        except (TypeError, AttributeError, pickle.PicklingError):  # e.g. dictionary views can't be hashed this way
+            return func(*args, **kwargs)
+
+        if key in _REDS_CACHE:
+            _REDS_CACHE.move_to_end(key)
+            return _copy_reds_result(_REDS_CACHE[key])
+        cache_file = None if cache_dir is None else os.path.join(cache_dir, key + '.reds_cache')
+        result = None
+        if cache_file is not None and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'rb') as f:
+                    result = pickle.load(f)
+            except (pickle.UnpicklingError, EOFError, OSError):  # unreadable or corrupt, so recompute and overwrite it
+                result = None
+        if result is None:
+            result = func(*args, **kwargs)
+            if cache_file is not None:  # write to a temporary file first so that other jobs never read partial files
+                with tempfile.NamedTemporaryFile(dir=cache_dir, suffix='.tmp', delete=False) as f:
+                    pickle.dump(result, f, protocol=4)
+                os.replace(f.name, cache_file)
+        if maxsize > 0:
+            _REDS_CACHE[key] = result
+            while len(_REDS_CACHE) > maxsize:
+                _REDS_CACHE.popitem(last=False)
+        return _copy_reds_result(result)
+    return wrapper
 
 
 def get_pos_reds(antpos, bl_error_tol=1.0, include_autos=False):
@@ -54,31 +164,92 @@ def get_pos_reds(antpos, bl_error_tol=1.0, include_autos=False):
                 return newKey
         return
 
-    for i, ant1 in enumerate(keys):
-        if include_autos:
-            start_ind = i
+    def assign(delta):  # Find the key of the group a baseline belongs to and whether the baseline must be reversed
+        new_key = check_neighbors(delta)
+        if new_key is not None:  # forward baseline has a match
+            return new_key, False
+        new_key = check_neighbors(tuple([-d for d in delta]))
+        if new_key is not None:  # reverse baseline does have a match
+            return new_key, True
+        # this baseline is entirely new
+        if delta[0] <= 0 or (delta[0] == 0 and delta[1] <= 0) or (delta[0] == 0 and delta[1] == 0 and delta[2] <= 0):
+            delta, reverse = tuple([-d for d in delta]), True
         else:
-            start_ind = i + 1
-        for ant2 in keys[start_ind:]:
-            bl_pair = (ant1, ant2)
-            delta = tuple(np.round(1.0 * (np.array(ap[ant2]) - np.array(ap[ant1])) / bl_error_tol).astype(int))
-            new_key = check_neighbors(delta)
-            if new_key is None:  # forward baseline has no matches
-                new_key = check_neighbors(tuple([-d for d in delta]))
-                if new_key is not None:  # reverse baseline does have a match
-                    bl_pair = (ant2, ant1)
-            if new_key is not None:  # either the forward or reverse baseline has a match
-                reds[new_key].append(bl_pair)
-            else:  # this baseline is entirely new
-                if delta[0] <= 0 or (delta[0] == 0 and delta[1] <= 0) or (delta[0] == 0 and delta[1] == 0 and delta[2] <= 0):
-                    delta = tuple([-d for d in delta])
-                    bl_pair = (ant2, ant1)
-                reds[delta] = [bl_pair]
-
-    # sort reds by length and each red to make sure the first antenna of the first bl in each group is the lowest antenna number
-    orderedDeltas = [delta for (length, delta) in sorted(zip([np.linalg.norm(delta) for delta in reds.keys()], reds.keys()))]
-    return [sorted(reds[delta]) if sorted(reds[delta])[0][0] == np.min(reds[delta])
-            else sorted([reverse_bl(bl) for bl in reds[delta]]) for delta in orderedDeltas]
+            reverse = False
+        reds[delta] = len(reds)  # index of the new group
+        return delta, reverse
+
+    # compute all rounded baseline vectors at once, in the order of the loop over antenna pairs
+    ant1_inds, ant2_inds = np.triu_indices(len(keys), k=(0 if include_autos else 1))
+    pos_array = np.array([ap[ant] for ant in keys])
+    deltas = np.round(1.0 * (pos_array[ant2_inds] - pos_array[ant1_inds]) / bl_error_tol).astype(int)
+    if len(deltas) == 0:
+        return []
+
+    # Grouping depends only on the rounded baseline vector and on the groups that already exist, so it can be
+    # done once per unique vector in order of first appearance. This is only invalid if a group is created
+    # within rounding error of a vector that has already been assigned and which also appears again later.
+    shifted = deltas - np.min(deltas, axis=0)
+    spans = np.max(shifted, axis=0) + 1
+    delta_ids = (shifted[:, 0] * spans[1] + shifted[:, 1]) * spans[2] + shifted[:, 2]
+    _, first_inds, inverse = np.unique(delta_ids, return_index=True, return_inverse=True)
+    last_inds = np.zeros(len(first_inds), dtype=int)
+    np.maximum.at(last_inds, inverse, np.arange(len(inverse)))
+    unique_deltas = [tuple(delta) for delta in deltas[first_inds].tolist()]
+    last_ind_by_delta = dict(zip(unique_deltas, last_inds))
+    assignments = [None for delta in unique_deltas]
+    first_assignments = {}  # assignments of baselines that created a group, if different from later ones
+    assigned_deltas = set()
+    valid = True
+    for u in np.argsort(first_inds, kind='stable'):
+        n_groups = len(reds)
+        assignments[u] = assign(unique_deltas[u])
+        if len(reds) > n_groups:  # a new group was created, so check whether any earlier assignment could change
+            first_assignments[first_inds[u]] = assignments[u]
+            assignments[u] = assign(unique_deltas[u])
+            new_key = assignments[u][0]
+            neighbors = [tuple(k - e for k, e in zip(new_key, eps)) for eps in epsilons]
+            neighbors += [tuple(e - k for k, e in zip(new_key, eps)) for eps in epsilons]
+            if np.any([(n in assigned_deltas) and (last_ind_by_delta[n] > first_inds[u]) for n in neighbors]):
+                valid = False
+                break
+        assigned_deltas.add(unique_deltas[u])
+
+    if not valid:  # fall back on assigning each baseline in order
+        reds = {}
+        assignments = [assign(delta) for delta in map(tuple, deltas.tolist())]
+        first_assignments, inverse = {}, np.arange(len(assignments))
+
+    # look up the group and orientation of every baseline
+    group_keys = list(reds.keys())
+    groups = np.array([reds[key] for key, reverse in assignments])[inverse]
+    reverse = np.array([reverse for key, reverse in assignments])[inverse]
+    for ind, (key, rev) in first_assignments.items():
+        groups[ind], reverse[ind] = reds[key], rev
+    first = np.where(reverse, ant2_inds, ant1_inds)
+    second = np.where(reverse, ant1_inds, ant2_inds)
+
+    # make sure the first antenna of the first bl in each group is the lowest antenna, using the rank of each antenna
+    ranks = np.empty(len(keys), dtype=int)
+    ranks[sorted(range(len(keys)), key=keys.__getitem__)] = np.arange(len(keys))
+    min_first, min_any = np.full(len(group_keys), len(keys)), np.full(len(group_keys), len(keys))
+    np.minimum.at(min_first, groups, ranks[first])
+    np.minimum.at(min_any, groups, np.minimum(ranks[first], ranks[second]))
+    flip = (min_first != min_any)[groups]
+    first, second = np.where(flip, second, first), np.where(flip, first, second)
+
+    # sort reds by length and then by each baseline within each group
+    group_keys_array = np.array(group_keys)
+    lengths = np.linalg.norm(group_keys_array, axis=1)
+    group_order = np.empty(len(group_keys), dtype=int)
+    group_order[np.lexsort(group_keys_array.T[::-1].tolist() + [lengths])] = np.arange(len(group_keys))
+    bl_order = np.lexsort((ranks[second], ranks[first], group_order[groups]))
+    boundaries = np.flatnonzero(np.diff(group_order[groups][bl_order])) + 1
+    key_array = np.empty(len(keys), dtype=object)
+    key_array[:] = keys
+    first_ants, second_ants = key_array[first[bl_order]].tolist(), key_array[second[bl_order]].tolist()
+    starts, ends = [0] + boundaries.tolist(), boundaries.tolist() + [len(bl_order)]
+    return [list(zip(first_ants[start:end], second_ants[start:end])) for start, end in zip(starts, ends)]
 
 
 def add_pol_reds(reds, pols=['nn'], pol_mode='1pol'):
@@ -112,6 +283,7 @@ def add_pol_reds(reds, pols=['nn'], pol_mode='1pol'):
     return redsWithPols
 
 
+@_cache_reds
 def get_reds(antpos, pols=['nn'], pol_mode='1pol', bl_error_tol=1.0, include_autos=False):
     """ Combines redcal.get_pos_reds() and redcal.add_pol_reds(). See their documentation.
 
@@ -138,6 +310,7 @@ def get_reds(antpos, pols=['nn'], pol_mode='1pol', bl_error_tol=1.0, include_aut
     return add_pol_reds(pos_reds, pols=pols, pol_mode=pol_mode)
 
 
+@_cache_reds
 def filter_reds(reds, bls=None, ex_bls=None, ants=None, ex_ants=None, ubls=None, ex_ubls=None,
                 pols=None, ex_pols=None, antpos=None, min_bl_cut=None, max_bl_cut=None, max_dims=None):
     '''
@@ -267,6 +440,7 @@ def filter_reds(reds, bls=None, ex_bls=None, ants=None, ex_ants=None, ubls=None,
     return reds
 
 
+@_cache_reds
 def reds_to_antpos(reds, tol=1e-10):
     '''Computes a set of antenna positions consistent with the given redundancies.
     Useful for projecting out phase slope degeneracies, see https://arxiv.org/abs/1712.07212
@@ -337,132 +511,79 @@ def _build_polarity_baseline_groups(dly_cal_data, reds, edge_cut=0, max_rel_angl
     return polarity_groups
 
 
-def _infer_polarity_flips(polarity_groups, prior_is_flipped, prior_even_vs_odd_IDs):
-    '''Take a set of polarity groups built by _build_polarity_baseline_groups() and prior
-    identifications of which antennas are flipped and which groups of baselines are "even"
-    (0 or 2 polarity flipped antennas) and which ones are "odd" (1 polarity flipped antenna).
-    Use those priors to infer as many additional flips and groups IDs as possible and return
-    the updated is_flipped and even_vs_odd_IDs dictionaries after getting stuck.
-    '''
-    is_flipped, even_vs_odd_IDs = deepcopy(prior_is_flipped), deepcopy(prior_even_vs_odd_IDs)
-
-    while True:
-        n_flipped, n_groups_IDed = len(is_flipped), len(even_vs_odd_IDs)
-
-        # loop over all groupings
-        for key, (grp1, grp2) in polarity_groups.items():
-            # if we think we know whether this group is even/odd or odd/even
-            if key in even_vs_odd_IDs:
-                even, odd = {'even/odd': (grp1, grp2), 'odd/even': (grp2, grp1)}[even_vs_odd_IDs[key]]
-
-                # use information about group and a known flip to infer other flips
-                for bl in even:
-                    ant0, ant1 = utils.split_bl(bl)
-                    if (ant0 in is_flipped) and (ant1 in is_flipped):
-                        assert is_flipped[ant0] == is_flipped[ant1], str((ant0, ant1))
-                    elif (ant0 in is_flipped):
-                        is_flipped[ant1] = is_flipped[ant0]
-                    elif (ant1 in is_flipped):
-                        is_flipped[ant0] = is_flipped[ant1]
-                for bl in odd:
-                    ant0, ant1 = utils.split_bl(bl)
-                    if (ant0 in is_flipped) and (ant1 in is_flipped):
-                        assert is_flipped[ant0] != is_flipped[ant1], str((ant0, ant1))
-                    elif (ant0 in is_flipped):
-                        is_flipped[ant1] = not is_flipped[ant0]
-                    elif (ant1 in is_flipped):
-                        is_flipped[ant0] = not is_flipped[ant1]
-
-            # try to infer if this group is even/odd or odd/even from two known flips
-            else:
-                for labels, grp in zip([['even/odd', 'odd/even'], ['odd/even', 'even/odd']], [grp1, grp2]):
-                    for bl in grp:
-                        ant0, ant1 = utils.split_bl(bl)
-                        if (ant0 in is_flipped) and (ant1 in is_flipped):
-                            if is_flipped[ant0] == is_flipped[ant1]:
-                                even_vs_odd_IDs[key] = labels[0]
-                            else:
-                                even_vs_odd_IDs[key] = labels[1]
-
-        # if no new identifications were made this iteration, break
-        if (n_flipped == len(is_flipped)) and (n_groups_IDed == len(even_vs_odd_IDs)):
+def _reduce_parity_row(pivots, row):
+    '''Reduce a GF(2) equation (bitmask with the right-hand side in bit 0) against a dictionary mapping pivot bits
+    to previously added equations. Independent equations are added to pivots in place. Returns the reduced row:
+    0 if the equation was redundant, 1 if it contradicts the previous equations, and anything else if it was added.'''
+    while row > 1:
+        pivot = row.bit_length() - 1
+        if pivot not in pivots:
+            pivots[pivot] = row
             break
+        row ^= pivots[pivot]
+    return row
 
-    return is_flipped, even_vs_odd_IDs
 
+def _solve_polarity_flips(polarity_groups, ants):
+    '''Find which antennas are polarity flipped given a set of polarity groups built by _build_polarity_baseline_groups().
+
+    Each antenna has an unknown flip bit and each baseline's parity (the XOR of its antennas' flips) must be the same
+    within each group and opposite between the two groups of the same unique baseline. These are linear equations over
+    GF(2), which are solved by Gaussian elimination with python integers as bitsets in polynomial time. Degeneracies
+    are broken by assuming that the most lopsided groups are even/odd and then that the antenna involved mostly in
+    even baselines in each connected set of antennas is not flipped.
 
-def _check_polarity_results(polarity_groups, is_flipped, even_vs_odd_IDs):
-    '''For a set of polarity_groups (see _build_polarity_baseline_groups()) determine of the proposed solution
-    set of is_flipped dictionary and even_vs_odd_IDs built by _determine_polarity_flips() is consistent.
+    Returns:
+        is_flipped: dictionary mapping antennas to Booleans, or to None for antennas without any unambiguous baselines.
+            If the polarity groups are inconsistent with any set of flips, returns None.
+        even_vs_odd_IDs: dictionary mapping polarity group keys to 'even/odd' or 'odd/even'. None if no solution.
     '''
+    # represent each antenna's flip as bit i + 1 of a python int, leaving bit 0 for the right-hand side of equations
+    ants = sorted(ants)
+    ant_bits = {ant: 1 << (i + 1) for i, ant in enumerate(ants)}
+    bl_ants = {bl: utils.split_bl(bl) for grp1, grp2 in polarity_groups.values() for bl in grp1 + grp2}
+    bl_rows = {bl: ant_bits[ant0] ^ ant_bits[ant1] for bl, (ant0, ant1) in bl_ants.items()}
+    pivots = {}
+
+    # all baselines in a group must have the same parity as the group's first baseline, up to the group flip
+    ref_rows = {}
     for key, (grp1, grp2) in polarity_groups.items():
-        # parse majority and minority groups into "even/odd" or "odd/even"
-        even, odd = {'even/odd': (grp1, grp2), 'odd/even': (grp2, grp1)}[even_vs_odd_IDs[key]]
-        # assert that antennas in even baselines have the same polarity
-        for bl in even:
-            ant0, ant1 = utils.split_bl(bl)
-            assert is_flipped[ant0] == is_flipped[ant1], str((ant0, ant1))
-        # assert that antennas in oddd baselines have different polarities
-        for bl in odd:
-            ant0, ant1 = utils.split_bl(bl)
-            assert is_flipped[ant0] != is_flipped[ant1], str((ant0, ant1))
-
-
-def _find_starting_is_flipped(polarity_groups, ants, even_vs_odd_IDs):
-    '''Pick an antenna that participates mostly in even groups as a "not flipped" reference.'''
-    # Count how many times each antenna is involved in an assumed even group minus odd group
+        rows = [bl_rows[bl] for bl in grp1] + [bl_rows[bl] ^ 1 for bl in grp2]
+        ref_rows[key] = rows[0]
+        for row in rows[1:]:
+            if _reduce_parity_row(pivots, row ^ rows[0]) == 1:
+                return None, None
+
+    # assume the most lopsided groups are even/odd whenever that's not already determined by previous equations
+    even_vs_odd_IDs = {}
+    for key in sorted(polarity_groups, key=lambda k: len(polarity_groups[k][0]) - len(polarity_groups[k][1]), reverse=True):
+        _reduce_parity_row(pivots, ref_rows[key])
+    for key in polarity_groups:
+        even_vs_odd_IDs[key] = ['even/odd', 'odd/even'][_reduce_parity_row(pivots, ref_rows[key])]
+
+    # pick antennas that participate mostly in even groups as "not flipped" references
     ant_even_counts = {ant: 0 for ant in ants}
     for key, (grp1, grp2) in polarity_groups.items():
-        if key in even_vs_odd_IDs:
-            even, odd = {'even/odd': (grp1, grp2), 'odd/even': (grp2, grp1)}[even_vs_odd_IDs[key]]
-            for grp, to_add in zip([even, odd], [1, -1]):
-                for bl in grp:
-                    ant_even_counts[utils.split_bl(bl)[0]] += to_add
-                    ant_even_counts[utils.split_bl(bl)[1]] += to_add
-
-    # Select reference antenna based on maximizing the even - odd difference.
-    refant = sorted(ant_even_counts, key=ant_even_counts.get)[-1]
-    is_flipped = {refant: False}
-    return is_flipped
-
-
-def _recursive_try_assumptions(polarity_groups, ants, prior_is_flipped, prior_even_vs_odd_IDs, depth, max_recursion_depth=5):
-    '''Given a set of polarity groups and a partial solution for which antennas are flipped and which groups are "even"
-    (0 or 2 polarity flips) and which ones are "odd" (1 polarity flip), this function recursively tries new assumptions
-    for group IDs until a new solution is found and returned. If a contradiction or the max_recursion_depth is reached
-    an AssertionError is raised. '''
-    # If a full solution has been found for all antennas, check that solution and return it
-    if len(prior_is_flipped) == len(ants):
-        _check_polarity_results(polarity_groups, prior_is_flipped, prior_even_vs_odd_IDs)
-        return prior_is_flipped, prior_even_vs_odd_IDs
-
-    # If we've gone too deep without finding a solution, stop this line of inquiry
-    assert depth <= max_recursion_depth
-
-    # If all IDs have been made but a solution still hasn't been found, stop this line of inquiry
-    assert len(prior_even_vs_odd_IDs) < len(polarity_groups)
-
-    # sort polarity_group keys by number of "group 1" baselines minus "group 2" baselines, pick out first one not yet solved
-    group_keys = sorted(polarity_groups, key=lambda k: len(polarity_groups[k][0]) - len(polarity_groups[k][1]), reverse=True)
-    new_assumption_key = [k for k in group_keys if k not in prior_even_vs_odd_IDs][0]
-
-    # Try assuming both that the next group is even/odd and that it's odd/even
-    for assumed_ID in ['even/odd', 'odd/even']:
-        even_vs_odd_IDs = deepcopy(prior_even_vs_odd_IDs)
-        even_vs_odd_IDs[new_assumption_key] = assumed_ID
-        # find new starting assumption about antennas based on the current even_vs_odd_IDs
-        prior_is_flipped = _find_starting_is_flipped(polarity_groups, ants, even_vs_odd_IDs)
-        try:
-            new_is_flipped, new_even_vs_odd_IDs = _infer_polarity_flips(polarity_groups, prior_is_flipped, even_vs_odd_IDs)
-            return _recursive_try_assumptions(polarity_groups, ants, new_is_flipped, new_even_vs_odd_IDs,
-                                              depth + 1, max_recursion_depth=max_recursion_depth)
-        except AssertionError:
-            pass  # a contradiction or the max assertion depth was reached, so move on.
-
-    assert False  # neither solution worked, so move on to another line of inquiry
+        even, odd = {'even/odd': (grp1, grp2), 'odd/even': (grp2, grp1)}[even_vs_odd_IDs[key]]
+        for grp, to_add in zip([even, odd], [1, -1]):
+            for bl in grp:
+                for ant in bl_ants[bl]:
+                    ant_even_counts[ant] += to_add
+    constrained = set([ant for bl_pair in bl_ants.values() for ant in bl_pair])
+    for ant in sorted(constrained, key=ant_even_counts.get, reverse=True):
+        _reduce_parity_row(pivots, ant_bits[ant])
+
+    # back substitute, starting from the lowest pivots which only depend on the right-hand side
+    solution = 0
+    for pivot in sorted(pivots):
+        row = pivots[pivot] ^ (1 << pivot)
+        if (bin(row & solution).count('1') + row) % 2:
+            solution |= (1 << pivot)
+    is_flipped = {ant: (bool(solution & ant_bits[ant]) if ant in constrained else None) for ant in ants}
+    return is_flipped, even_vs_odd_IDs
 
 
-def find_polarity_flipped_ants(dly_cal_data, reds, edge_cut=0, max_rel_angle=(np.pi / 8), max_recursion_depth=6):
+def find_polarity_flipped_ants(dly_cal_data, reds, edge_cut=0, max_rel_angle=(np.pi / 8), max_recursion_depth=None):
     '''Looks at delay calibrated (but not phase calibrated or redcaled) data to determine which
     antennas appear to have reversed polarities (effectively a factor of -1 in the gains).
 
@@ -472,15 +593,14 @@ def find_polarity_flipped_ants(dly_cal_data, reds, edge_cut=0, max_rel_angle=(np
            "odd" group (1 flip), but we don't know which is which yet. Usually the larger group is the
            even one, but if a redundant baseline has involves many polarity flipped antennas, the majority
            group might be the odd one.
-        2) Pick the unique baseline that seems the most lopsided (more group 1 and than group 2) and
-           make an assumption about whether it's even or odd.
-        3) Given that assumption, pick an reference antenna that's involved mostly in even groups
-           and define its polarity as "not flipped."
-        4) Follow that chain of logic as far as possible, identifying as many groups and antennas as possible.
-        5) If a full solution is found, return it.
-        5) When we get stuck, make another assumption recursively (go to 2) about the most-lopsided un-IDed group.
-        6) Continue until a contradiction arises or the max_recursion_depth is reached. In that case, try the
-           opposite assumption at the previous step, eventually recursively trying all assumptions.
+        2) Treat each antenna's flip as an unknown bit. Every pair of baselines in the same class must have the
+           same parity (XOR of their antennas' bits) and every pair in opposite classes must have opposite parities.
+           Solve this linear system over GF(2) with Gaussian elimination. If it's inconsistent, there's no solution.
+        3) Break the remaining degeneracies by assuming that the most lopsided unique baselines (more group 1
+           than group 2) have an even majority, unless that's already determined by the equations.
+        4) Finally, pick a reference antenna that's involved mostly in even groups in each connected set of
+           antennas and define its polarity as "not flipped."
+    This scales polynomially with the number of antennas and baselines, no matter how many antennas are flipped.
 
     Arugments:
         dly_cal_data: DataContainer mapping baseline tuples e.g. (0, 1, 'Jee') to delay-only calibrated visibilities
@@ -488,20 +608,20 @@ def find_polarity_flipped_ants(dly_cal_data, reds, edge_cut=0, max_rel_angle=(np
         edge_cut: number of channels to exclude for each edge of the band when computing median phase
         max_rel_angle: cutoff median phase to assign baselines the "majority" polarity group.
             (pi - max_rel_angle() is the cutoff for "minority" group. Must be between 0 and pi/2.
-        max_recursion_depth: maximum number of assumptions to try before giving up. Warning: the complexity
-            of this scales exponentially as 2^max_recursion_depth.
+        max_recursion_depth: deprecated and ignored. Previously the maximum number of assumptions to try
+            in a recursive search that scaled exponentially as 2^max_recursion_depth.
 
     Returns:
-        is_flipped: dictionary mapping antenna tuple e.g. (0, 'Jee') to Booleans.
-            If no solution is found returns a dictionary mapping antennas to None.
+        is_flipped: dictionary mapping antenna tuple e.g. (0, 'Jee') to Booleans. Antennas without any
+            unambiguous baselines are mapped to None. If no solution is found returns a dictionary
+            mapping antennas to None.
     '''
 
     ants = set([ant for red in reds for bl in red for ant in utils.split_bl(bl)])
     polarity_groups = _build_polarity_baseline_groups(dly_cal_data, reds, edge_cut=edge_cut, max_rel_angle=np.pi / 8)
 
-    try:
-        is_flipped, even_vs_odd_IDs = _recursive_try_assumptions(polarity_groups, ants, {}, {}, 1, max_recursion_depth=5)
-    except AssertionError:  # No solution is found.
+    is_flipped, even_vs_odd_IDs = _solve_polarity_flips(polarity_groups, ants)
+    if is_flipped is None:  # No solution is found.
         is_flipped = {ant: None for ant in ants}
 
     return is_flipped
@@ -579,8 +699,23 @@ def make_sol_finite(sol):
             sol[k][~np.isfinite(sol[k])] = np.ones_like(sol[k][~np.isfinite(sol[k])])
 
 
+def _check_omnical_accel(accel):
+    '''Validates the accel argument of the Omnical solvers.'''
+    if accel not in [None, 'anderson']:
+        raise ValueError("Unrecognized omnical acceleration: {}. Must be None or 'anderson'.".format(accel))
+    return accel
+
+
+def _anderson_mixing_coefficient(dstep_norm2, dstep_dot_step):
+    '''Per-pixel Anderson(1) mixing coefficient theta, which minimizes |step - theta * (step - prev_step)|^2
+    given |step - prev_step|^2 and Re[(step - prev_step)^* . step] summed over variables. The accelerated
+    iterate is then new_sol - theta * (new_sol - prev_new_sol). Pixels whose step didn't change get theta = 0.'''
+    changed = dstep_norm2 > 0
+    return np.where(changed, dstep_dot_step / np.where(changed, dstep_norm2, 1), 0).astype(dstep_norm2.dtype)
+
+
 class OmnicalSolver(linsolve.LinProductSolver):
-    def __init__(self, data, sol0, wgts={}, gain=.3, **kwargs):
+    def __init__(self, data, sol0, wgts={}, gain=.3, accel=None, **kwargs):
         """Set up a nonlinear system of equations of the form g_i * g_j.conj() * V_mdl = V_ij
         to linearize via the Omnical algorithm described in HERA Memo 50
         (scripts/notebook/omnical_convergence.ipynb).
@@ -600,11 +735,16 @@ class OmnicalSolver(linsolve.LinProductSolver):
             gain: The fractional step made toward the new solution each iteration.  Default is 0.3.
                 Values in the range 0.1 to 0.5 are generally safe.  Increasing values trade speed
                 for stability.
+            accel: optional acceleration of the iteration. None (default) takes damped steps of size gain.
+                'anderson' applies Anderson(1) mixing, extrapolating each pixel's step using the previous
+                iterate and step, which typically halves the number of iterations needed to converge.
+                Either way, pixels whose chi^2 doesn't improve stop updating.
             **kwargs: keyword arguments of constants (python variables in keys of data that
                 are not to be solved for) which are passed to linsolve.LinProductSolver.
         """
         linsolve.LinProductSolver.__init__(self, data, sol0, wgts=wgts, **kwargs)
         self.gain = np.float32(gain)  # float32 to avoid accidentally promoting data to doubles.
+        self.accel = _check_omnical_accel(accel)
 
     def _get_ans0(self, sol, keys=None):
         '''Evaluate the system of equations given input sol.
@@ -647,6 +787,7 @@ class OmnicalSolver(linsolve.LinProductSolver):
         sol_u = {k: v[update].flatten() for k, v in sol.items()}
         iters = np.zeros(chisq.shape, dtype=np.int)
         conv = np.ones_like(chisq)
+        prev_u = None  # previous iterate and step for Anderson mixing
         for i in range(1, maxiter + 1):
             if verbose:
                 print('Beginning iteration %d/%d' % (i, maxiter))
@@ -670,6 +811,14 @@ class OmnicalSolver(linsolve.LinProductSolver):
                 sol_sum_u[uij] += numerator
             new_sol_u = {k: v * ((1 - self.gain) + self.gain * sol_sum_u[k] / sol_wgt_u[k])
                          for k, v in sol_u.items()}
+            if self.accel == 'anderson':
+                step_u = {k: v - sol_u[k] for k, v in new_sol_u.items()}
+                if prev_u is not None:
+                    dstep_u = {k: v - prev_u[1][k] for k, v in step_u.items()}
+                    theta = _anderson_mixing_coefficient(sum([(v * v.conj()).real for v in dstep_u.values()]),
+                                                         sum([(dstep_u[k].conj() * v).real for k, v in step_u.items()]))
+                    new_sol_u = {k: v - theta * (v - prev_u[0][k] - prev_u[1][k]) for k, v in new_sol_u.items()}
+                prev_u = (sol_u, step_u)
             dmdl_u = self._get_ans0(new_sol_u)
             # check if i % check_every is 0, which is purposely one less than the '1' up at the top of the loop
             if i < maxiter and (i < check_after or (i % check_every) != 0):
@@ -698,12 +847,241 @@ class OmnicalSolver(linsolve.LinProductSolver):
                 dmdl_u = {k: v[update_u] for k, v in dmdl_u.items()}
                 wgts_u = {k: v[update_u] for k, v in wgts_u.items()}
                 sol_u = {k: v[update_u] for k, v in new_sol_u.items()}
+                if prev_u is not None:
+                    prev_u = tuple({k: v[update_u] for k, v in p.items()} for p in prev_u)
                 update = tuple(u[update_u] for u in update)
             if verbose:
                 print('    <CHISQ> = %f, <CONV> = %f, CNT = %d', (np.mean(chisq), np.mean(conv), update[0].size))
 
 
+class OmnicalArraySolver:
+    def __init__(self, data, sol0, reds, wgts={}, gain=.3, accel=None):
+        """Set up the same system of equations as OmnicalSolver, g_i * g_j.conj() * V_mdl = V_ij, but with
+        data, weights, and solutions stacked into arrays and each equation described by integer indices
+        into those arrays. This avoids parsing and eval-ing linsolve equation strings and lets every step
+        of the Omnical iteration be a vectorized gather or scatter-add. Results match OmnicalSolver up to
+        floating point round-off.
+
+        Args:
+            data: visibility data in the dictionary format {(ant1,ant2,pol): np.array}. Must contain every
+                baseline in reds (or its complex conjugate).
+            sol0: dictionary of starting guess gains and unique model visibilities, keyed by antenna tuples
+                like (ant,antpol) or by the first baseline tuple in each redundant group.
+            reds: list of lists of redundant baseline tuples, e.g. (ind1,ind2,pol). The first item in each
+                list is taken to be the key for the unique baseline visibility solution.
+            wgts: dictionary of real weights in the same format as data. Weights are treated as 1/sigma^2.
+                Default is {}, which means all 1.0s.
+            gain: The fractional step made toward the new solution each iteration.  Default is 0.3.
+                Values in the range 0.1 to 0.5 are generally safe.  Increasing values trade speed
+                for stability.
+            accel: optional acceleration of the iteration. None (default) takes damped steps of size gain.
+                'anderson' applies Anderson(1) mixing, extrapolating each pixel's step using the previous
+                iterate and step, which typically halves the number of iterations needed to converge.
+                Either way, pixels whose chi^2 doesn't improve stop updating.
+        """
+        dc = DataContainer(data)
+        self.keys = [bl for red in reds for bl in red]
+        self.sol_keys = list(sol0.keys())
+        sol_index = {k: n for n, k in enumerate(self.sol_keys)}
+
+        # integer indices into the stacked solution for each term of each equation
+        self.gi = np.array([sol_index[split_bl(bl)[0]] for bl in self.keys], dtype=int)
+        self.gj = np.array([sol_index[split_bl(bl)[1]] for bl in self.keys], dtype=int)
+        self.ui = np.array([sol_index[red[0]] for red in reds for bl in red], dtype=int)
+        # interleave terms as (gi, gj, ui) per equation so that np.add.at accumulates in the same order as OmnicalSolver
+        self.terms = np.ravel(np.vstack((self.gi, self.gj, self.ui)).T)
+
+        self.data = np.array([dc[bl] for bl in self.keys])
+        self.sol0 = np.array([sol0[k] for k in self.sol_keys])
+        if len(wgts) == 0:
+            wgts = {bl: np.float32(1.) for bl in self.keys}
+        wc = DataContainer(wgts)
+        self.wgts = np.array([wc[bl] * np.ones(self.data.shape[1:], dtype=np.float32) for bl in self.keys])
+        self.gain = np.float32(gain)  # float32 to avoid accidentally promoting data to doubles.
+        self.accel = _check_omnical_accel(accel)
+
+    def _get_ans0(self, sol):
+        '''Evaluate g_i * g_j.conj() * V_mdl for every equation, given stacked solutions sol
+        with the variables along the first axis.'''
+        return sol[self.gi] * sol[self.gj].conj() * sol[self.ui]
+
+    def _accumulate(self, per_eq_terms, dtype):
+        '''Scatter-add per-term values of shape (3 * Neqs, Npixels), interleaved like self.terms,
+        into a per-variable sum of shape (Nvariables, Npixels).'''
+        out = np.zeros((len(self.sol_keys), per_eq_terms.shape[1]), dtype=dtype)
+        np.add.at(out, self.terms, per_eq_terms)
+        return out
+
+    def solve_iteratively(self, conv_crit=1e-10, maxiter=50, check_every=4, check_after=1, verbose=False):
+        """Repeatedly solves and updates solution until convergence or maxiter is reached.
+        Returns a meta-data about the solution and the solution itself.
+
+        Args:
+            conv_crit: A convergence criterion (default 1e-10) below which to stop iterating.
+                Converegence is measured L2-norm of the change in the solution of all the variables
+                divided by the L2-norm of the solution itself.
+            maxiter: An integer maximum number of iterations to perform before quitting. Default 50.
+            check_every: Compute convergence and updates weights every Nth iteration (saves computation). Default 4.
+            check_after: Start computing convergence and updating weights after the first N iterations.  Default 1.
+
+        Returns: meta, sol
+            meta: a dictionary with metadata about the solution, including
+                iter: the number of iterations taken to reach convergence (or maxiter), with dimensions of the data.
+                chisq: the chi^2 of the solution produced by the final iteration, with dimensions of the data.
+                conv_crit: the convergence criterion evaluated at the final iteration, with dimensions of the data.
+            sol: a dictionary of complex solutions keyed like sol0, with dimensions of the data.
+        """
+        sol = self.sol0.copy()
+        dmdl_u = self._get_ans0(sol)
+        chisq = np.sum(np.abs(self.data - dmdl_u)**2 * self.wgts, axis=0)
+        update = np.where(chisq > 0)
+        # arrays with '_u' are flattened to (Nvariables or Neqs, Npixels) and only include pixels that need updating
+        dmdl_u = dmdl_u[(slice(None),) + update]
+        # wgts_u hold the wgts the user provides.  dwgts_u is what is actually used to wgt the data
+        wgts_u = self.wgts[(slice(None),) + update]
+        sol_u = sol[(slice(None),) + update]
+        iters = np.zeros(chisq.shape, dtype=int)
+        conv = np.ones_like(chisq)
+        prev_u = None  # previous iterate and step for Anderson mixing
+        for i in range(1, maxiter + 1):
+            if verbose:
+                print('Beginning iteration %d/%d' % (i, maxiter))
+            if (i % check_every) == 1:
+                # compute data wgts: dwgts = sum(V_mdl^2 / n^2) = sum(V_mdl^2 * wgts)
+                # don't need to update data weighting with every iteration
+                dwgts_u = dmdl_u * dmdl_u.conj() * wgts_u
+                sol_wgt_u = self._accumulate(np.repeat(dwgts_u, 3, axis=0), dwgts_u.dtype)
+                dw_u = self.data[(slice(None),) + update] * dwgts_u
+            # compute sum(wgts * V_meas / V_mdl)
+            numerator = dw_u / dmdl_u
+            sol_sum_u = self._accumulate(np.stack((numerator, numerator.conj(), numerator), axis=1).reshape(self.terms.size, numerator.shape[1]),
+                                         numerator.dtype)
+            new_sol_u = sol_u * ((1 - self.gain) + self.gain * sol_sum_u / sol_wgt_u)
+            if self.accel == 'anderson':
+                step_u = new_sol_u - sol_u
+                if prev_u is not None:
+                    dstep_u = step_u - prev_u[1]
+                    theta = _anderson_mixing_coefficient(np.sum((dstep_u * dstep_u.conj()).real, axis=0),
+                                                         np.sum((dstep_u.conj() * step_u).real, axis=0))
+                    new_sol_u = new_sol_u - theta * (new_sol_u - prev_u[0] - prev_u[1])
+                prev_u = (sol_u, step_u)
+            dmdl_u = self._get_ans0(new_sol_u)
+            # check if i % check_every is 0, which is purposely one less than the '1' up at the top of the loop
+            if i < maxiter and (i < check_after or (i % check_every) != 0):
+                # Fast branch when we aren't expensively computing convergence/chisq
+                sol_u = new_sol_u
+            else:
+                # Slow branch when we compute convergence/chisq
+                new_chisq_u = np.sum(np.abs(self.data[(slice(None),) + update] - dmdl_u)**2 * wgts_u, axis=0)
+                chisq_u = chisq[update]
+                gotbetter_u = (chisq_u > new_chisq_u)
+                where_gotbetter_u = np.where(gotbetter_u)
+                update_where = tuple(u[where_gotbetter_u] for u in update)
+                chisq[update_where] = new_chisq_u[where_gotbetter_u]
+                iters[update_where] = i
+                new_sol_u = np.where(gotbetter_u, new_sol_u, sol_u)
+                deltas_u = new_sol_u - sol_u
+                conv_u = np.sqrt(np.sum((deltas_u * deltas_u.conj()).real, axis=0)
+                                 / np.sum((new_sol_u * new_sol_u.conj()).real, axis=0))
+                conv[update_where] = conv_u[where_gotbetter_u]
+                sol[(slice(None),) + update] = new_sol_u
+                update_u = np.where((conv_u > conv_crit) & gotbetter_u)
+                if update_u[0].size == 0 or i == maxiter:
+                    meta = {'iter': iters, 'chisq': chisq, 'conv_crit': conv}
+                    return meta, {k: sol[n] for n, k in enumerate(self.sol_keys)}
+                dmdl_u = dmdl_u[:, update_u[0]]
+                wgts_u = wgts_u[:, update_u[0]]
+                sol_u = new_sol_u[:, update_u[0]]
+                if prev_u is not None:
+                    prev_u = tuple(p[:, update_u[0]] for p in prev_u)
+                update = tuple(u[update_u] for u in update)
+            if verbose:
+                print('    <CHISQ> = %f, <CONV> = %f, CNT = %d' % (np.mean(chisq), np.mean(conv), update[0].size))
+
+
+def _mean_pairwise_product(amps):
+    """Mean of amps[i] * amps[j] over all ordered pairs of different i and j, computed in closed form
+    as ((sum amps)^2 - sum amps^2) / (N * (N - 1)) instead of by forming every pair."""
+    N = len(amps)
+    total = np.sum(amps, axis=0, dtype=np.float64)
+    return ((total**2 - np.sum(np.asarray(amps, dtype=np.float64)**2, axis=0)) / (N * (N - 1))).astype(amps.dtype)
+
+
+class _FactorizedLinearSystem:
+    def __init__(self, ls, rcond=None):
+        """Factorization of the A matrix of a linsolve.LinearSolver whose equations and weights are the
+        same for every data sample, so that the least-squares solution x = (At W A)^-1 At W y for new data y
+        is just two matrix products. Matches linsolve's shared-inverse solution up to floating point round-off.
+
+        Args:
+            ls: linsolve.LinearSolver with scalar weights and constants and without conjugated parameters
+            rcond: cutoff ratio for singular values of AtA. Default is the resolution of ls.dtype, like linsolve.
+        """
+        xs, ys, vals = ls.get_A_sparse()
+        A = csr_matrix((vals[0], (xs, ys)), shape=ls._A_shape()[:2])
+        if rcond is None:
+            rcond = np.finfo(ls.dtype).resolution
+        self.AtAi = np.linalg.pinv(A.T.dot(A).toarray(), rcond=rcond, hermitian=True)
+        # A already includes sqrt(wgts), so fold the other sqrt(wgts) of the weighted data into At
+        sqrt_wgts = np.array([ls.wgts[k] for k in ls.keys], dtype=ls.dtype)**.5
+        self.Atw = csr_matrix(A.T.multiply(sqrt_wgts[None, :]))
+        self.prm_order = ls.prm_order
+
+    def solve(self, y):
+        """Solve for the parameters given data y, stacked along the first axis in the order of the
+        equations in the original solver. Returns a dictionary mapping parameter names to solutions
+        with the shape of y[0]."""
+        x = self.AtAi.dot(self.Atw.dot(y.reshape(len(y), -1)))
+        x.shape = x.shape[:1] + y.shape[1:]
+        return {p: x[n] for p, n in self.prm_order.items()}
+
+    @property
+    def nbytes(self):
+        """Memory in bytes used by the factorized matrices."""
+        return self.AtAi.nbytes + self.Atw.data.nbytes + self.Atw.indices.nbytes + self.Atw.indptr.nbytes
+
+
+class _FactorizedLogProductSystem:
+    def __init__(self, lps, rcond=None):
+        """Factorization of the amplitude and phase systems of a linsolve.LogProductSolver, reusable
+        for new data with the same equations and weights. See _FactorizedLinearSystem."""
+        self.dtype = lps.dtype
+        self.amp = _FactorizedLinearSystem(lps.ls_amp, rcond=rcond)
+        self.phs = (None if lps.ls_phs is None else _FactorizedLinearSystem(lps.ls_phs, rcond=rcond))
+
+    def solve(self, y):
+        """Solve for the parameters given data y (not its logarithm), stacked along the first axis in
+        the order of the equations in the original solver, just like linsolve.LogProductSolver.solve()."""
+        logy = np.log(y)
+        sol_amp = self.amp.solve(logy.real)
+        if self.phs is None:
+            return {k: np.exp(sol_amp[k]).astype(self.dtype) for k in sol_amp}
+        sol_phs = self.phs.solve(logy.imag)
+        return {k: np.exp(sol_amp[k] + np.complex64(1j) * sol_phs[k]).astype(self.dtype) for k in sol_amp}
+
+    @property
+    def nbytes(self):
+        """Memory in bytes used by the factorized matrices."""
+        return self.amp.nbytes + (0 if self.phs is None else self.phs.nbytes)
+
+
+def _cache_nbytes(value):
+    """Memory in bytes of the arrays (or objects with an nbytes attribute) in a cached value, which may be
+    nested in tuples, lists, or dictionaries."""
+    if isinstance(value, (tuple, list)):
+        return sum([_cache_nbytes(v) for v in value])
+    if isinstance(value, dict):
+        return sum([_cache_nbytes(v) for v in value.values()])
+    return getattr(value, 'nbytes', 0)
+
+
 class RedundantCalibrator:
+    # factorized logcal and firstcal systems of equations and degeneracy projectors shared by all instances,
+    # so that each chunk of data calibrated with the same reds skips building and inverting these matrices.
+    # Least recently used entries are evicted once the cache holds more than solver_cache_max_bytes of arrays.
+    _solver_cache = OrderedDict()
+    _solver_cache_nbytes = {}
+    solver_cache_max_bytes = 2**30
 
     def __init__(self, reds, check_redundancy=False):
         """Initialization of a class object for performing redundant calibration with logcal
@@ -718,6 +1096,7 @@ class RedundantCalibrator:
 
         self.reds = reds
         self.pol_mode = parse_pol_mode(self.reds)
+        self._fc_eq_keys = {}  # maps baseline pairs to firstcal equation strings
 
         if check_redundancy:
             nDegens = self.count_degens(assume_redundant=False)
@@ -754,23 +1133,96 @@ class RedundantCalibrator:
         Returns:
             solver: instantiated solver with redcal equations and weights
         """
-        dtype = list(data.values())[0].dtype
+        d_ls, w_ls = self._solver_data(data, wgts=wgts, detrend_phs=detrend_phs)
+        return solver(data=d_ls, wgts=w_ls, **kwargs)
+
+    def _solver_data(self, data, wgts={}, detrend_phs=False, gains={}):
+        """Maps redcal equations to data and weights for a linsolve solver. See _solver() for arguments.
+        Optionally divides gains (keyed like (1,'Jnn'), missing gains are 1.0s) out of the data as the
+        equations are built, which avoids calibrating a full copy of the data.
+
+        Returns:
+            d_ls: dictionary mapping linsolve equation strings to data
+            w_ls: dictionary mapping linsolve equation strings to weights (empty if wgts is empty)
+        """
         dc = DataContainer(data)
         eqs = self.build_eqs(dc)
+
+        def _calibrated(bl):
+            ant1, ant2 = split_bl(bl)
+            if ant1 not in gains and ant2 not in gains:
+                return dc[bl]
+            return dc[bl] / np.asarray(gains.get(ant1, 1) * np.conj(gains.get(ant2, 1)), dtype=dc[bl].dtype)
+
         self.phs_avg = {}  # detrend phases within redundant group, used for logcal to avoid phase wraps
         if detrend_phs:
             for blgrp in self.reds:
-                self.phs_avg[blgrp[0]] = np.exp(-np.complex64(1j) * np.median(np.unwrap([np.log(dc[bl]).imag for bl in blgrp], axis=0), axis=0))
+                self.phs_avg[blgrp[0]] = np.exp(-np.complex64(1j) * np.median(np.unwrap([np.log(_calibrated(bl)).imag for bl in blgrp], axis=0), axis=0))
                 for bl in blgrp:
                     self.phs_avg[bl] = self.phs_avg[blgrp[0]].astype(dc[bl].dtype)
         d_ls, w_ls = {}, {}
         for eq, key in eqs.items():
-            d_ls[eq] = dc[key] * self.phs_avg.get(key, np.float32(1))
+            d_ls[eq] = _calibrated(key) * self.phs_avg.get(key, np.float32(1))
         if len(wgts) > 0:
             wc = DataContainer(wgts)
             for eq, key in eqs.items():
                 w_ls[eq] = wc[key]
-        return solver(data=d_ls, wgts=w_ls, **kwargs)
+        return d_ls, w_ls
+
+    def _cached_solve(self, solver, data, wgts={}, mode='default', **kwargs):
+        """Solves a linsolve.LinearSolver or linsolve.LogProductSolver system of equations, reusing the
+        factorization of the A matrix from any previous call (by any instance) with the same equations,
+        weights, and data type. The factorization is a pseudoinverse, so only modes 'default' and 'pinv'
+        are cached. Other modes and systems with per-sample weights or constants are solved directly by linsolve.
+
+        Args:
+            solver: linsolve.LinearSolver or linsolve.LogProductSolver
+            data: dictionary mapping linsolve equation strings to data
+            wgts: dictionary mapping linsolve equation strings to weights. Default {} means all 1.0s.
+            mode: solving mode. 'default' and 'pinv' use the cached factorization, anything else is
+                passed to linsolve (see linsolve.LinearSolver.solve).
+            **kwargs: other keyword arguments passed into the solver, e.g. sparse.
+
+        Returns:
+            sol: dictionary of solutions keyed by linsolve variable names, as returned by solver.solve()
+        """
+        keys = tuple(data.keys())
+        if (mode not in ['default', 'pinv']) or len(kwargs.get('constants', {})) > 0 \
+                or not all([np.ndim(w) == 0 for w in wgts.values()]):
+            return solver(data=data, wgts=wgts, **kwargs).solve(mode=mode)
+        dtype = linsolve.infer_dtype(list(data.values()) + list(wgts.values()))
+        cache_key = (solver.__name__, keys, tuple([float(wgts[k]) for k in keys]) if len(wgts) > 0 else None, dtype)
+
+        cache = RedundantCalibrator._solver_cache
+        if cache_key in cache:
+            cache.move_to_end(cache_key)
+            factorized = cache[cache_key]
+        else:
+            ls = solver(data=data, wgts=wgts, **kwargs)
+            if solver is linsolve.LogProductSolver:
+                factorized = _FactorizedLogProductSystem(ls)
+            elif not ls.re_im_split:
+                factorized = _FactorizedLinearSystem(ls)
+            else:
+                return ls.solve(mode=mode)
+            RedundantCalibrator._add_to_solver_cache(cache_key, factorized)
+        return factorized.solve(np.array([data[k] for k in keys]))
+
+    @classmethod
+    def _add_to_solver_cache(cls, cache_key, value):
+        """Add value to the cache shared by all instances, then evict least recently used entries until the
+        cache fits in solver_cache_max_bytes. The newest entry is always kept."""
+        cache, nbytes = cls._solver_cache, cls._solver_cache_nbytes
+        cache[cache_key] = value
+        nbytes[cache_key] = _cache_nbytes(value)
+        while len(cache) > 1 and sum(nbytes.values()) > cls.solver_cache_max_bytes:
+            nbytes.pop(cache.popitem(last=False)[0])
+
+    @classmethod
+    def clear_solver_cache(cls):
+        """Empty the cache of factorized systems of equations and degeneracy projectors shared by all instances."""
+        cls._solver_cache.clear()
+        cls._solver_cache_nbytes.clear()
 
     def unpack_sol_key(self, k):
         """Turn linsolve's internal variable string into antenna or baseline tuple (with polarization)."""
@@ -800,8 +1252,42 @@ class RedundantCalibrator:
             ubl_sols[blgrp[0]] = np.average(d_gp, axis=0)  # XXX add option for median here?
         return ubl_sols
 
+    def _firstcal_pairs(self, pairing='all'):
+        '''Picks the pairs of baselines within each redundant group whose phase differences
+        are used by firstcal to solve for delays and phase offsets.
+
+        Arguments:
+            pairing: 'all' for every pair within each redundant group (which scales as the square of
+                the group size), 'chain' for each baseline paired only with the next one in its group
+                (which spans the same space of delay differences with far fewer equations), or an
+                integer k to pair each baseline with k randomly chosen partners in its group on top of
+                the chain, which keeps every group connected. Random partners are drawn reproducibly.
+
+        Returns:
+            pairs: list of (bl1, bl2) tuples, where bl1 precedes bl2 in their redundant group
+        '''
+        if pairing == 'all':
+            return [(bl1, bl2) for bls in self.reds for i, bl1 in enumerate(bls) for bl2 in bls[i + 1:]]
+        if pairing == 'chain':
+            return [(bl1, bl2) for bls in self.reds for bl1, bl2 in zip(bls[:-1], bls[1:])]
+        if not isinstance(pairing, (int, np.integer)) or isinstance(pairing, bool) or pairing < 1:
+            raise ValueError("pairing must be 'all', 'chain', or a positive integer, not {}.".format(pairing))
+
+        rng = np.random.RandomState(0)
+        pairs = []
+        for bls in self.reds:
+            n = len(bls)
+            inds = {(i, i + 1) for i in range(n - 1)}
+            for i in range(n):
+                others = np.delete(np.arange(n), i)
+                partners = rng.choice(others, size=min(pairing, n - 1), replace=False)
+                inds |= {(min(i, j), max(i, j)) for j in partners}
+            pairs += [(bls[i], bls[j]) for i, j in sorted(inds)]
+        return pairs
+
     def _firstcal_iteration(self, data, df, f0, wgts={}, offsets_only=False, edge_cut=0,
-                            sparse=False, mode='default', norm=True, medfilt=False, kernel=(1, 11)):
+                            sparse=False, mode='default', norm=True, medfilt=False, kernel=(1, 11),
+                            pairs=None, precision='double', fft_workers=1):
         '''Runs a single iteration of firstcal, which uses phase differences between nominally
         redundant meausrements to solve for delays and phase offsets that produce gains of the
         form: np.exp(2j * np.pi * delay * freqs + 1j * offset).
@@ -810,6 +1296,8 @@ class RedundantCalibrator:
             df: frequency change between data bins, scales returned delays by 1/df.
             f0: frequency of the first channel in the data
             offsets_only: only solve for phase offsets, dly_sol will be {}
+            pairs: list of (bl1, bl2) baseline pairs to compare. Default None uses all pairs within
+                each redundant group. See RedundantCalibrator._firstcal_pairs().
             For all other arguments, see RedundantCalibrator.firstcal()
 
         Returns:
@@ -822,35 +1310,42 @@ class RedundantCalibrator:
             wgts = {k: np.ones_like(data[k], dtype=np.float32) for k in data}
         wgts = DataContainer(wgts)
         taus_offs, twgts = {}, {}
-        for bls in self.reds:
-            for i, bl1 in enumerate(bls):
-                d1, w1 = data[bl1], wgts[bl1]
-                for bl2 in bls[i + 1:]:
-                    d12 = d1 * np.conj(data[bl2])
-                    if norm:
-                        ad12 = np.abs(d12)
-                        d12 /= np.where(ad12 == 0, np.float32(1), ad12)
-                    w12 = w1 * wgts[bl2]
-                    taus_offs[(bl1, bl2)] = utils.fft_dly(d12, df, f0=f0, wgts=w12, medfilt=medfilt,
-                                                          kernel=kernel, edge_cut=edge_cut)
-                    twgts[(bl1, bl2)] = np.sum(w12)
+        if pairs is None:
+            pairs = self._firstcal_pairs()
+        Ntimes = data[next(iter(data))].shape[0]
+        batch_size = max(1, FIRSTCAL_BATCH_SIZE // (Ntimes * Nfreqs))
+        for start in range(0, len(pairs), batch_size):
+            # stack baseline pair products and get all of their delays at once
+            batch = pairs[start:start + batch_size]
+            d12 = np.array([data[bl1] * np.conj(data[bl2]) for bl1, bl2 in batch])
+            if norm:
+                ad12 = np.abs(d12)
+                d12 /= np.where(ad12 == 0, np.float32(1), ad12)
+            w12 = np.array([wgts[bl1] * wgts[bl2] for bl1, bl2 in batch])
+            dlys, offs = utils.fft_dly_batch(d12, df, f0=f0, wgts=w12, medfilt=medfilt, kernel=kernel,
+                                             edge_cut=edge_cut, workers=fft_workers, precision=precision)
+            for n, pair in enumerate(batch):
+                taus_offs[pair] = (dlys[n], offs[n])
+                twgts[pair] = np.sum(w12[n])
         d_ls, w_ls = {}, {}
         for (bl1, bl2), tau_off_ij in taus_offs.items():
-            ai, aj = split_bl(bl1)
-            am, an = split_bl(bl2)
-            i, j, m, n = (self.pack_sol_key(k) for k in (ai, aj, am, an))
-            eq_key = '%s-%s-%s+%s' % (i, j, m, n)
+            if (bl1, bl2) not in self._fc_eq_keys:  # equation strings are reused between iterations
+                ai, aj = split_bl(bl1)
+                am, an = split_bl(bl2)
+                i, j, m, n = (self.pack_sol_key(k) for k in (ai, aj, am, an))
+                self._fc_eq_keys[(bl1, bl2)] = '%s-%s-%s+%s' % (i, j, m, n)
+            eq_key = self._fc_eq_keys[(bl1, bl2)]
             d_ls[eq_key] = np.array(tau_off_ij)
             w_ls[eq_key] = twgts[(bl1, bl2)]
-        ls = linsolve.LinearSolver(d_ls, wgts=w_ls, sparse=sparse)
-        sol = ls.solve(mode=mode)
+        sol = self._cached_solve(linsolve.LinearSolver, d_ls, wgts=w_ls, mode=mode, sparse=sparse)
         dly_sol = {self.unpack_sol_key(k): v[0] for k, v in sol.items()}
         off_sol = {self.unpack_sol_key(k): v[1] for k, v in sol.items()}
         return dly_sol, off_sol
 
     def firstcal(self, data, freqs, wgts={}, maxiter=25, conv_crit=1e-6,
                  sparse=False, mode='default', norm=True, medfilt=False, kernel=(1, 11),
-                 edge_cut=0, max_rel_angle=(np.pi / 8), max_recursion_depth=6):
+                 edge_cut=0, max_rel_angle=(np.pi / 8), max_recursion_depth=None, pairing='all', precision='double',
+                 fft_workers=1):
         """Solve for a calibration solution parameterized by a single delay and phase offset
         per antenna using the phase difference between nominally redundant measurements.
         Delays are solved in a single iteration, but phase offsets are solved for
@@ -876,8 +1371,13 @@ class RedundantCalibrator:
                 for find_polarity_flipped_ants or when computing delays and offsets in utils.fft_dly
             max_rel_angle: cutoff median phase to assign baselines the "majority" polarity group.
                 (pi - max_rel_angle() is the cutoff for "minority" group. Must be between 0 and pi/2.
-            max_recursion_depth: maximum number of assumptions to try before giving up.
-                Warning: the maximum complexity of this scales exponentially as 2^max_recursion_depth.
+            max_recursion_depth: deprecated and ignored, see find_polarity_flipped_ants.
+            pairing: which pairs of baselines within each redundant group to compare. 'all' (default) uses
+                every pair, 'chain' uses each baseline and the next one in its group, and an integer k adds
+                k random partners per baseline to the chain. The latter two scale linearly with group size.
+            precision: 'double' (default) computes delays with double precision FFTs and returns gains in the
+                precision of the data. 'single' keeps FFTs, delays, and gains in single precision.
+            fft_workers: number of threads used for the delay FFTs (see utils.fft_dly_batch). Default 1.
 
         Returns:
             meta: dictionary of metadata (including delays and suspected antenna flips for each integration)
@@ -886,12 +1386,17 @@ class RedundantCalibrator:
         """
         df = np.median(np.ediff1d(freqs))
         dtype = np.find_common_type([d.dtype for d in data.values()], [])
+        if precision == 'single':
+            dtype = _precision_dtypes(precision)[0]
+            freqs = np.asarray(freqs, dtype=np.float32)
+        pairs = self._firstcal_pairs(pairing)
 
         # iteratively solve for offsets to account for phase wrapping
         for i in range(maxiter):
             dlys, delta_off = self._firstcal_iteration(data, df=df, f0=freqs[0], wgts=wgts, edge_cut=edge_cut,
                                                        offsets_only=(i > 0), sparse=sparse, mode=mode,
-                                                       norm=norm, medfilt=medfilt, kernel=kernel)
+                                                       norm=norm, medfilt=medfilt, kernel=kernel, pairs=pairs,
+                                                       precision=precision, fft_workers=fft_workers)
             if i == 0:  # only solve for delays on the first iteration, also apply polarity flips
                 g_fc = {ant: np.array(np.exp(2j * np.pi * np.outer(dly, freqs)),
                                       dtype=dtype) for ant, dly in dlys.items()}
@@ -940,10 +1445,8 @@ class RedundantCalibrator:
             sol: dictionary of gain and visibility solutions in the {(index,antpol): np.array}
                 and {(ind1,ind2,pol): np.array} formats respectively
         """
-        fc_data = deepcopy(data)
-        calibrate_in_place(fc_data, sol0)
-        ls = self._solver(linsolve.LogProductSolver, fc_data, wgts=wgts, detrend_phs=True, sparse=sparse)
-        sol = ls.solve(mode=mode)
+        d_ls, w_ls = self._solver_data(data, wgts=wgts, detrend_phs=True, gains=sol0)
+        sol = self._cached_solve(linsolve.LogProductSolver, d_ls, wgts=w_ls, mode=mode, sparse=sparse)
         sol = {self.unpack_sol_key(k): sol[k] for k in sol.keys()}
         for ubl_key in [k for k in sol.keys() if len(k) == 3]:
             sol[ubl_key] = sol[ubl_key] * self.phs_avg[ubl_key].conj()
@@ -978,7 +1481,8 @@ class RedundantCalibrator:
         sol = {self.unpack_sol_key(k): sol[k] for k in sol.keys()}
         return meta, sol
 
-    def omnical(self, data, sol0, wgts={}, gain=.3, conv_crit=1e-10, maxiter=50, check_every=4, check_after=1):
+    def omnical(self, data, sol0, wgts={}, gain=.3, conv_crit=1e-10, maxiter=50, check_every=4, check_after=1,
+                engine='array', freq_chunks=None, nthreads=1, accel=None):
         """Use the Liu et al 2010 Omnical algorithm to linearize equations and iteratively minimize chi^2.
 
         Args:
@@ -993,19 +1497,94 @@ class RedundantCalibrator:
             gain: The fractional step made toward the new solution each iteration.  Default is 0.3.
                 Values in the range 0.1 to 0.5 are generally safe.  Increasing values trade speed
                 for stability.
+            engine: 'array' (default) solves with OmnicalArraySolver, which stacks data and solutions
+                into arrays and indexes equations with integers. 'linsolve' solves with OmnicalSolver,
+                which parses linsolve equation strings. Both produce the same results up to round-off,
+                but 'array' is much faster for large arrays.
+            freq_chunks: number of slices to split the frequency (last) axis of the data into, each of which
+                is solved independently. Since omnical treats each pixel independently, this doesn't change
+                the results. Default None uses one slice per thread.
+            nthreads: number of threads with which to solve frequency slices in parallel. NumPy releases
+                the GIL during the heavy array operations, so this uses multiple cores without copying the
+                data into other processes. Default 1 is serial.
+            accel: None (default) or 'anderson', which accelerates convergence with Anderson(1) mixing,
+                typically halving the number of iterations. See OmnicalArraySolver for more details.
 
         Returns:
             meta: dictionary of information about the convergence and chi^2 of the solution
             sol: dictionary of gain and visibility solutions in the {(index,antpol): np.array}
                 and {(ind1,ind2,pol): np.array} formats respectively
         """
+        if freq_chunks is None:
+            freq_chunks = nthreads
+        Nfreqs = max([np.shape(v)[-1] for v in data.values() if np.ndim(v) > 0], default=1)
+        if min(freq_chunks, Nfreqs) > 1:
+            def _slice(dct, fslice):
+                return {k: (v[..., fslice] if np.ndim(v) > 0 and np.shape(v)[-1] == Nfreqs else v) for k, v in dct.items()}
+
+            def _solve(fslice):
+                return self.omnical(_slice(data, fslice), _slice(sol0, fslice), wgts=_slice(wgts, fslice), gain=gain,
+                                    conv_crit=conv_crit, maxiter=maxiter, check_every=check_every,
+                                    check_after=check_after, engine=engine, freq_chunks=1, accel=accel)
+
+            fslices = [slice(chans[0], chans[-1] + 1) for chans in np.array_split(np.arange(Nfreqs), min(freq_chunks, Nfreqs))]
+            if nthreads > 1:
+                with ThreadPoolExecutor(max_workers=nthreads) as executor:
+                    results = list(executor.map(_solve, fslices))
+            else:
+                results = [_solve(fslice) for fslice in fslices]
+            meta = {k: np.concatenate([m[k] for m, _ in results], axis=-1) for k in results[0][0]}
+            sol = {k: np.concatenate([s[k] for _, s in results], axis=-1) for k in results[0][1]}
+            return meta, sol
+
+        if engine == 'array':
+            ls = OmnicalArraySolver(data, sol0, self.reds, wgts=wgts, gain=gain, accel=accel)
+            return ls.solve_iteratively(conv_crit=conv_crit, maxiter=maxiter, check_every=check_every, check_after=check_after)
+        elif engine != 'linsolve':
+            raise ValueError("Unrecognized omnical engine: {}. Must be 'array' or 'linsolve'.".format(engine))
 
         sol0 = {self.pack_sol_key(k): sol0[k] for k in sol0.keys()}
-        ls = self._solver(OmnicalSolver, data, sol0=sol0, wgts=wgts, gain=gain)
+        ls = self._solver(OmnicalSolver, data, sol0=sol0, wgts=wgts, gain=gain, accel=accel)
         meta, sol = ls.solve_iteratively(conv_crit=conv_crit, maxiter=maxiter, check_every=check_every, check_after=check_after)
         sol = {self.unpack_sol_key(k): sol[k] for k in sol.keys()}
         return meta, sol
 
+    def _degen_projectors(self, ants, gainPols, antpols):
+        """Builds the matrices that project gain phases onto the degenerate subspace of redcal for
+        remove_degen_gains(), reusing them from any previous call (by any instance) with the same
+        antennas, redundancies, and pol_mode.
+
+        Args:
+            ants: list of antenna tuples like (index,antpol), in the order of the gains
+            gainPols: numpy array of the antpol of each antenna in ants
+            antpols: list of unique antpols in gainPols
+
+        Returns:
+            Rgains: maps gain phases to degenerate parameters (either average phases or phase slopes)
+            Mgains: like (AtA)^-1 At in linear estimator formalism. It's a normalized estimator of degeneracies
+        """
+        if not hasattr(self, '_reds_key'):
+            self._reds_key = tuple([tuple(red) for red in self.reds])
+        cache_key = ('remove_degen_gains', tuple(ants), tuple(antpols), self.pol_mode, self._reds_key)
+        cache = RedundantCalibrator._solver_cache
+        if cache_key in cache:
+            cache.move_to_end(cache_key)
+            return cache[cache_key]
+
+        antpos = reds_to_antpos(self.reds)
+        positions = np.array([antpos[ant[0]] for ant in ants])
+        if self.pol_mode == '1pol' or self.pol_mode == '4pol_minV':
+            # In 1pol and 4pol_minV, the phase degeneracies are 1 overall phase and 2 tip-tilt terms
+            Rgains = np.hstack((positions, np.ones((positions.shape[0], 1))))
+        else:  # pol_mode is '4pol'
+            # two columns give sums for two different polarizations
+            phasePols = np.vstack((gainPols == antpols[0], gainPols == antpols[1])).T
+            Rgains = np.hstack((positions, phasePols))
+        Mgains = np.linalg.pinv(Rgains.T.dot(Rgains)).dot(Rgains.T)
+
+        RedundantCalibrator._add_to_solver_cache(cache_key, (Rgains, Mgains))
+        return Rgains, Mgains
+
     def remove_degen_gains(self, gains, degen_gains=None, mode='phase'):
         """ Removes degeneracies from solutions (or replaces them with those in degen_sol).  This
         function in nominally intended for use with firstcal, which returns (phase/delay) solutions
@@ -1051,19 +1630,8 @@ class RedundantCalibrator:
         gainSols = np.array([gains[ant] for ant in ants])
         degenGains = np.array([degen_gains[ant] for ant in ants])
 
-        # Build matrices for projecting gain degeneracies
-        antpos = reds_to_antpos(self.reds)
-        positions = np.array([antpos[ant[0]] for ant in gains])
-        if self.pol_mode == '1pol' or self.pol_mode == '4pol_minV':
-            # In 1pol and 4pol_minV, the phase degeneracies are 1 overall phase and 2 tip-tilt terms
-            # Rgains maps gain phases to degenerate parameters (either average phases or phase slopes)
-            Rgains = np.hstack((positions, np.ones((positions.shape[0], 1))))
-        else:  # pol_mode is '4pol'
-            # two columns give sums for two different polarizations
-            phasePols = np.vstack((gainPols == antpols[0], gainPols == antpols[1])).T
-            Rgains = np.hstack((positions, phasePols))
-        # Mgains is like (AtA)^-1 At in linear estimator formalism. It's a normalized estimator of degeneracies
-        Mgains = np.linalg.pinv(Rgains.T.dot(Rgains)).dot(Rgains.T)
+        # Build (or reuse) matrices for projecting gain degeneracies
+        Rgains, Mgains = self._degen_projectors(list(ants), gainPols, antpols)
 
         # degenToRemove is the amount we need to move in the degenerate subspace
         if mode == 'phase':
@@ -1072,16 +1640,13 @@ class RedundantCalibrator:
             gainSols -= np.einsum('ij,jkl', Rgains, degenToRemove)
         else:  # working on complex data
             # Fix phase terms
+            gainAmps, degenAmps = np.abs(gainSols), np.abs(degenGains)
             degenToRemove = np.einsum('ij,jkl', Mgains, np.angle(gainSols * np.conj(degenGains)))
             gainSols *= np.exp(np.complex64(-1j) * np.einsum('ij,jkl', Rgains, degenToRemove))
             # Fix abs terms: fixes the mean abs product of gains (as they appear in visibilities)
             for pol in antpols:
-                meanSqAmplitude = np.mean([np.abs(g1 * g2) for (a1, p1), g1 in gains.items()
-                                           for (a2, p2), g2 in gains.items()
-                                           if p1 == pol and p2 == pol and a1 != a2], axis=0)
-                degenMeanSqAmplitude = np.mean([np.abs(degen_gains[k1] * degen_gains[k2]) for k1 in gains.keys()
-                                                for k2 in gains.keys()
-                                                if k1[1] == pol and k2[1] == pol and k1[0] != k2[0]], axis=0)
+                meanSqAmplitude = _mean_pairwise_product(gainAmps[gainPols == pol])
+                degenMeanSqAmplitude = _mean_pairwise_product(degenAmps[gainPols == pol])
                 gainSols[gainPols == pol] *= (degenMeanSqAmplitude / meanSqAmplitude)**.5
 
         # Create new solutions dictionary
@@ -1176,9 +1741,16 @@ def predict_chisq_per_bl(reds):
         predicted_chisq_per_bl: dictionary mapping baseline tuples to the expected
             value of chi^2 = |Vij - gigj*Vi-j|^2/sigmaij^2.
     '''
+    # this only depends on reds, so reuse the result from any previous call (e.g. on another chunk of data)
+    return dict(_predict_chisq_per_bl(tuple([tuple(red) for red in reds])))
+
+
+@functools.lru_cache(maxsize=8)
+def _predict_chisq_per_bl(reds):
+    '''Helper function for predict_chisq_per_bl, cached on reds as a tuple of tuples of baselines.'''
     bls = [bl for red in reds for bl in red]
     dummy_data = DataContainer({bl: np.ones((1, 1), dtype=np.complex) for bl in bls})
-    rc = RedundantCalibrator(reds)
+    rc = RedundantCalibrator([list(red) for red in reds])
     solver = rc._solver(linsolve.LogProductSolver, dummy_data)
 
     A = solver.ls_amp.get_A()[:, :, 0]
@@ -1220,7 +1792,11 @@ def predict_chisq_per_ant(reds):
     predicted_chisq_per_bl = predict_chisq_per_bl(reds)
     bls = [bl for red in reds for bl in red]
     ants = sorted(set([ant for bl in bls for ant in split_bl(bl)]))
-    return {ant: np.sum([predicted_chisq_per_bl[bl] for bl in bls if ant in split_bl(bl)]) for ant in ants}
+    dofs_per_ant = {ant: [] for ant in ants}
+    for bl in bls:
+        for ant in set(split_bl(bl)):
+            dofs_per_ant[ant].append(predicted_chisq_per_bl[bl])
+    return {ant: np.sum(dofs) for ant, dofs in dofs_per_ant.items()}
 
 
 def normalized_chisq(data, data_wgts, reds, vis_sols, gains):
@@ -1251,13 +1827,14 @@ def normalized_chisq(data, data_wgts, reds, vis_sols, gains):
     chisq, _, chisq_per_ant, _ = utils.chisq(data, vis_sols, data_wgts=data_wgts, gains=gains,
                                              reds=reds, split_by_antpol=(pol_mode in ['1pol', '2pol']))
     predicted_chisq_per_ant = predict_chisq_per_ant(reds)
-    chisq_per_ant = {ant: cs / predicted_chisq_per_ant[ant] for ant, cs in chisq_per_ant.items()}
+    # cast DoFs to the dtype of chisq so that single precision chisqs stay single precision
+    chisq_per_ant = {ant: cs / np.asarray(cs).dtype.type(predicted_chisq_per_ant[ant]) for ant, cs in chisq_per_ant.items()}
     if pol_mode in ['1pol', '2pol']:  # in this case, chisq is split by antpol
         for antpol in chisq.keys():
-            chisq[antpol] /= np.sum([cspa / 2.0 for ant, cspa in predicted_chisq_per_ant.items()
-                                     if antpol in ant], axis=0)
+            predicted = np.sum([cspa / 2.0 for ant, cspa in predicted_chisq_per_ant.items() if antpol in ant], axis=0)
+            chisq[antpol] /= chisq[antpol].dtype.type(predicted)
     else:
-        chisq /= np.sum(list(predicted_chisq_per_ant.values())) / 2.0
+        chisq /= chisq.dtype.type(np.sum(list(predicted_chisq_per_ant.values())) / 2.0)
     return chisq, chisq_per_ant
 
 
@@ -1291,14 +1868,37 @@ def rekey_vis_sols(cal, reds):
                 del cal['v_omnical'][bl], cal['vf_omnical'][bl]
 
 
+def _noise_wgts_from_autos(bls, data):
+    '''Inverse noise variance weights for each baseline in bls, predicted from the autocorrelations in
+    data using noise.predict_noise_variance_from_autos and computing integration times once per antenna pair.'''
+    dts = {}
+    for bl in bls:
+        if bl[:2] not in dts:
+            dts[bl[:2]] = np.median(np.ediff1d(data.times_by_bl[bl[:2]])) * SEC_PER_DAY
+    return {bl: predict_noise_variance_from_autos(bl, data, dt=dts[bl[:2]])**-1 for bl in bls}
+
+
+def _broadcast_shape(arrays):
+    '''Shape that all arrays broadcast to. np.broadcast only takes up to 32 arrays, so they are folded
+    in 31 at a time, along with a zero-strided placeholder with the shape of those already seen.'''
+    shape = ()
+    for i in range(0, len(arrays), 31):
+        shape = np.broadcast(np.broadcast_to(0, shape), *arrays[i:i + 31]).shape
+    return shape
+
+
 def linear_cal_update(bls, cal, data, all_reds, weight_by_nsamples=False, weight_by_flags=False):
     '''Solve for unsolved gains or unique baseline visibilities (but not both simultaneously)
     using existing gain/visibility solutions in cal.
 
+    Since every equation d_ij = g_i g_j^* V_ij has only one unknown term, the weighted least-squares
+    solution is computed directly (per time and frequency) as a weighted average over all the baselines
+    that include each unknown, rather than by building and solving a linsolve.LinearSolver.
+
     Arguments:
         bls: list of baseline tuples like (0,1,'nn') to solve for the single remaining term
             using the corresponding data and the prior gain/visibility solutions. If any
-            bl has two unsolved terms, linsolve will throw an error.
+            bl has two unsolved terms, a ValueError is raised.
         cal: dictionary of redundant calibration solutions, updated in place, like the one
             produced by redcal.redundantly_calibrate(). See that function more details.
         data: DataContainer mapping baseline-pol tuples like (0,1,'nn') to complex data of
@@ -1312,38 +1912,20 @@ def linear_cal_update(bls, cal, data, all_reds, weight_by_nsamples=False, weight
             to downweight the equations they participate in. If a particular frequency
             and integration is flagged for all input data, this will produce np.nan
     '''
-    # use RedundantCalibrator to build up constants and equations
-    rc_all = RedundantCalibrator(all_reds)
-    consts = {rc_all.pack_sol_key(ant): cal['g_omnical'][ant] for ant in cal['g_omnical']}
-    all_reds_sets = [set(red) for red in all_reds]
-    for bl in cal['v_omnical']:
-        for red, red_set in zip(all_reds, all_reds_sets):
-            if bl in red_set:
-                consts.update({rc_all.pack_sol_key(red[0]): cal['v_omnical'][bl]})
-                match_found = True
-                break
-    eqs = {eq_str: bl for eq_str, bl in rc_all.build_eqs().items() if bl in bls}
-
-    # map baselines to ubls
-    bl_to_ubl_map = {bl: None for bl in bls}
+    # map baselines to the unique baseline keys of all_reds and to any existing visibility solutions
+    ubl_of = {bl: red[0] for red in all_reds for bl in red}
+    vis_consts = {ubl_of[bl]: cal['v_omnical'][bl] for bl in cal['v_omnical'] if bl in ubl_of}
+    bls = [bl for bl in bls if bl in ubl_of]
+    bl_to_ubl_map = {}
     for red in all_reds:
-        for bl in bls:
-            if bl in red:
-                bls_in_sol = [k for k in cal['v_omnical'] if k in red]
-                if len(bls_in_sol) > 0:
-                    bl_to_ubl_map[bl] = bls_in_sol[0]
-                else:
-                    bl_to_ubl_map[bl] = red[0]
+        bls_in_sol = [k for k in red if k in cal['v_omnical']]
+        for bl in red:
+            bl_to_ubl_map[bl] = (bls_in_sol[0] if len(bls_in_sol) > 0 else red[0])
 
     # build up weights
-    bl_wgts = {bl: 1.0 for bl in bls}
-    total_wgts = {ubl: 0.0 for ubl in bl_to_ubl_map.values()}
-    total_wgts.update({ant: 0.0 for bl in bls for ant in split_bl(bl)})
+    bl_wgts = _noise_wgts_from_autos(bls, data)
     for bl in bls:
         ant0, ant1 = split_bl(bl)
-        # weight by inverse noise variance inferred from autocorrelations
-        dt = np.median(np.ediff1d(data.times_by_bl[bl[:2]])) * SEC_PER_DAY
-        bl_wgts[bl] = (predict_noise_variance_from_autos(bl, data, dt=dt))**-1
         bl_wgts[bl][~np.isfinite(bl_wgts[bl])] = 0.0
         if weight_by_nsamples:
             bl_wgts[bl] *= cal['vns_omnical'][bl_to_ubl_map[bl]]  # weight by nsamples in the bl group
@@ -1354,17 +1936,49 @@ def linear_cal_update(bls, cal, data, all_reds, weight_by_nsamples=False, weight
                 bl_wgts[bl] *= (1.0 - cal['gf_omnical'][ant0])
             if ant1 in cal['gf_omnical']:
                 bl_wgts[bl] *= (1.0 - cal['gf_omnical'][ant1])
-        total_wgts[bl_to_ubl_map[bl]] += bl_wgts[bl]
-        total_wgts[ant0] += bl_wgts[bl]
-        total_wgts[ant1] += bl_wgts[bl]
 
-    d_ls = {eq: data[bl] for eq, bl in eqs.items()}
-    w_ls = {eq: bl_wgts[bl] for eq, bl in eqs.items()}
-    ls = linsolve.LinearSolver(d_ls, wgts=w_ls, **consts)
-    sol = {rc_all.unpack_sol_key(k): val for k, val in ls.solve(mode='pinv').items()}
-    for k in sol:  # flag data when it has zero or undefined weight
-        sol[k][(total_wgts[k] == 0) | ~np.isfinite(total_wgts[k])] = np.nan
-    return sol
+    # write each equation as d = coeff * x for its single unknown x, conjugating the equation if x = g_j^*
+    unknowns, coeffs, d_ls = [], [], []
+    for bl in bls:
+        ant0, ant1 = split_bl(bl)
+        terms_known = [ant0 in cal['g_omnical'], ant1 in cal['g_omnical'], ubl_of[bl] in vis_consts]
+        if np.sum(terms_known) != 2:
+            raise ValueError('Baseline {} must have exactly one unsolved term, '
+                             'but it has {}.'.format(bl, 3 - np.sum(terms_known)))
+        if not terms_known[2]:
+            unknowns.append(ubl_of[bl])
+            coeffs.append(cal['g_omnical'][ant0] * np.conj(cal['g_omnical'][ant1]))
+            d_ls.append(data[bl])
+        elif not terms_known[0]:
+            unknowns.append(ant0)
+            coeffs.append(np.conj(cal['g_omnical'][ant1]) * vis_consts[ubl_of[bl]])
+            d_ls.append(data[bl])
+        else:
+            unknowns.append(ant1)
+            coeffs.append(np.conj(cal['g_omnical'][ant0] * vis_consts[ubl_of[bl]]))
+            d_ls.append(np.conj(data[bl]))
+    if len(unknowns) == 0:
+        return {}
+
+    # weighted least squares solution: x = sum(w * coeff^* * d) / sum(w * |coeff|^2) for each unknown
+    shape = _broadcast_shape(d_ls + coeffs)
+    coeffs = np.array([np.broadcast_to(c, shape) for c in coeffs])
+    d_ls = np.array([np.broadcast_to(d, shape) for d in d_ls])
+    w_ls = np.array([np.broadcast_to(bl_wgts[bl], shape) for bl in bls])
+    keys = list(dict.fromkeys(unknowns))
+    key_inds = np.array([keys.index(k) for k in unknowns])
+    num = np.zeros((len(keys),) + shape, dtype=np.result_type(d_ls, coeffs))
+    den = np.zeros((len(keys),) + shape, dtype=np.finfo(num.dtype).dtype)  # keeps single precision solutions single
+    total_wgts = np.zeros((len(keys),) + shape, dtype=den.dtype)
+    np.add.at(num, key_inds, w_ls * np.conj(coeffs) * d_ls)
+    np.add.at(den, key_inds, w_ls * np.abs(coeffs)**2)
+    np.add.at(total_wgts, key_inds, w_ls)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sol_array = np.where(den > 0, num / den, 0)
+
+    # flag data when it has zero or undefined weight
+    sol_array[(total_wgts == 0) | ~np.isfinite(total_wgts)] = np.nan
+    return {k: sol for k, sol in zip(keys, sol_array)}
 
 
 def expand_omni_sol(cal, all_reds, data, nsamples):
@@ -1415,8 +2029,7 @@ def expand_omni_sol(cal, all_reds, data, nsamples):
 
     # Update chisq and chisq per ant to include all baselines between working antennas
     rekey_vis_sols(cal, good_ants_reds)
-    dts_by_bl = {bl: np.median(np.ediff1d(data.times_by_bl[bl[:2]])) * SEC_PER_DAY for bl in good_ants_bls}
-    data_wgts = {bl: predict_noise_variance_from_autos(bl, data, dt=dts_by_bl[bl])**-1 for bl in good_ants_bls}
+    data_wgts = _noise_wgts_from_autos(good_ants_bls, data)
     cal['chisq'], cal['chisq_per_ant'] = normalized_chisq(data, data_wgts, good_ants_reds, cal['v_omnical'], cal['g_omnical'])
 
     # Reassign omnical visibility solutions to the first entry in each group in all_reds
@@ -1457,8 +2070,7 @@ def expand_omni_sol(cal, all_reds, data, nsamples):
 
         # compute new chisq_per_ant for new gains
         data_subset = DataContainer({bl: data[bl] for bl in bls_to_use})
-        dts_by_bl = {bl: np.median(np.ediff1d(data.times_by_bl[bl[:2]])) * SEC_PER_DAY for bl in bls_to_use}
-        data_wgts = {bl: predict_noise_variance_from_autos(bl, data, dt=dts_by_bl[bl])**-1 for bl in bls_to_use}
+        data_wgts = _noise_wgts_from_autos(bls_to_use, data)
         _, _, chisq_per_ant, _ = utils.chisq(data_subset, cal['v_omnical'], data_wgts=data_wgts,
                                              gains=cal['g_omnical'], reds=all_reds)
         reds_for_chisq = filter_reds(all_reds, bls=bls_for_chisq)
@@ -1491,7 +2103,8 @@ def expand_omni_sol(cal, all_reds, data, nsamples):
 
 def redundantly_calibrate(data, reds, freqs=None, times_by_bl=None, fc_conv_crit=1e-6,
                           fc_maxiter=50, oc_conv_crit=1e-10, oc_maxiter=500, check_every=10,
-                          check_after=50, gain=.4, max_dims=2):
+                          check_after=50, gain=.4, max_dims=2, prior_cal=None, fc_pairing='all', oc_nthreads=1,
+                          oc_accel=None, precision='double', fc_fft_workers=1):
     '''Performs all three steps of redundant calibration: firstcal, logcal, and omnical.
 
     Arguments:
@@ -1517,15 +2130,35 @@ def redundantly_calibrate(data, reds, freqs=None, times_by_bl=None, fc_conv_crit
             with remove_degen() and must be later abscaled. None is no limit. 2 is a classically
             "redundantly calibratable" planar array.  More than 2 usually arises with subarrays of
             redundant baselines. Antennas will be excluded from reds to satisfy this.
+        prior_cal: optional dictionary of results from a previous calibration of the same data (e.g. before
+            additional antennas were excluded), in the same format as the dictionary returned by this function.
+            If provided, firstcal and logcal are skipped: 'fc_meta' and 'g_firstcal' are taken from prior_cal
+            and omnical is seeded with prior_cal['g_omnical'] and prior_cal['v_omnical'], restricted to the
+            antennas and baselines in reds. Unique baselines without a prior visibility solution are seeded
+            with an average of the data calibrated by the prior gains.
+        fc_pairing: which pairs of baselines within each redundant group firstcal compares. 'all' (default)
+            uses every pair, 'chain' uses each baseline and the next in its group, and an integer k adds k random
+            partners per baseline to the chain. See RedundantCalibrator.firstcal() for more details.
+        fc_fft_workers: number of threads used for firstcal's delay FFTs. Default 1, since chunks may already be
+            calibrated in many processes. See RedundantCalibrator.firstcal() for more details.
+        oc_nthreads: number of threads with which to run omnical on slices of the frequency axis in parallel.
+            Default 1 is serial. See RedundantCalibrator.omnical() for more details.
+        oc_accel: optional acceleration of the omnical iteration. None (default) or 'anderson', which typically
+            halves the number of iterations. See RedundantCalibrator.omnical() for more details.
+        precision: 'double' (default) calibrates in the precision of the input data. 'single' casts the data
+            to complex64 and keeps every stage (including the returned gains, visibilities, and chisqs) in
+            single precision, which halves memory and speeds up omnical at the cost of ~1e-6 relative accuracy.
 
     Returns a dictionary of results with the following keywords:
         'g_firstcal': firstcal gains in dictionary keyed by ant-pol tuples like (1,'Jnn').
             Gains are Ntimes x Nfreqs gains but fully described by a per-antenna delay.
+            All per-antenna results are ArrayContainers, i.e. dictionary-like views into a single array
+            in the layout of a UVCal gain_array (see datacontainer.ArrayContainer).
         'gf_firstcal': firstcal gain flags in the same format as 'g_firstcal'. Will be all False.
         'g_omnical': full omnical gain dictionary (which include firstcal gains) in the same format.
             Flagged gains will be 1.0s.
         'gf_omnical': omnical flag dictionary in the same format. Flags arise from NaNs in log/omnical.
-        'v_omnical': omnical visibility solutions dictionary with baseline-pol tuple keys that are the
+        'v_omnical': omnical visibility solutions DataContainer with baseline-pol tuple keys that are the
             first elements in each of the sub-lists of reds. Flagged visibilities will be 0.0s.
         'vf_omnical': omnical visibility flag dictionary in the same format. Flags arise from NaNs.
         'chisq': chi^2 per degree of freedom for the omnical solution. Normalized using noise derived
@@ -1536,28 +2169,68 @@ def redundantly_calibrate(data, reds, freqs=None, times_by_bl=None, fc_conv_crit
             for all visibilities that an antenna participates in.
         'fc_meta' : dictionary that includes delays and identifies flipped antennas
         'omni_meta': dictionary of information about the omnical convergence and chi^2 of the solution
+        'timing_meta': dictionary mapping the stages 'firstcal', 'logcal', 'omnical', 'remove_degen', and 'chisq'
+            to their wall clock times in seconds. Firstcal and logcal times are 0 if prior_cal is provided.
     '''
     rv = {}  # dictionary of return values
+    rv['timing_meta'] = {'firstcal': 0.0, 'logcal': 0.0}
     filtered_reds = filter_reds(reds, max_dims=max_dims)
     rc = RedundantCalibrator(filtered_reds)
     if freqs is None:
         freqs = data.freqs
     if times_by_bl is None:
         times_by_bl = data.times_by_bl
-
-    # perform firstcal
-    rv['fc_meta'], rv['g_firstcal'] = rc.firstcal(data, freqs, maxiter=fc_maxiter, conv_crit=fc_conv_crit)
+    complex_dtype = _precision_dtypes(precision)[0]
+    if precision == 'single':
+        data = DataContainer({bl: np.asarray(data[bl], dtype=complex_dtype) for bl in data.keys()})
+
+    if prior_cal is not None:
+        # fall back to a cold start if prior_cal lacks solutions (of the right shape) for any antenna being calibrated
+        ants = set([ant for red in filtered_reds for bl in red for ant in split_bl(bl)])
+        data_shape = np.shape(data[filtered_reds[0][0]]) if len(filtered_reds) > 0 else None
+        if not all([(ant in prior_cal['g_firstcal']) and (ant in prior_cal['g_omnical'])
+                    and (np.shape(prior_cal['g_omnical'][ant]) == data_shape) for ant in ants]):
+            prior_cal = None
+
+    if prior_cal is None:
+        # perform firstcal
+        t0 = time.perf_counter()
+        rv['fc_meta'], rv['g_firstcal'] = rc.firstcal(data, freqs, maxiter=fc_maxiter, conv_crit=fc_conv_crit,
+                                                      pairing=fc_pairing, precision=precision, fft_workers=fc_fft_workers)
+        rv['timing_meta']['firstcal'] = time.perf_counter() - t0
+
+        # perform logcal
+        t0 = time.perf_counter()
+        _, log_sol = rc.logcal(data, sol0=rv['g_firstcal'])
+        rv['timing_meta']['logcal'] = time.perf_counter() - t0
+    else:
+        # warm start: reuse firstcal and seed omnical with prior solutions for the remaining antennas
+        rv['fc_meta'] = {key: {ant: prior_cal['fc_meta'][key][ant] for ant in ants} for key in ['dlys', 'polarity_flips']}
+        rv['g_firstcal'] = {ant: prior_cal['g_firstcal'][ant] for ant in ants}
+        log_sol = {ant: np.array(prior_cal['g_omnical'][ant], dtype=(complex_dtype if precision == 'single' else None))
+                   for ant in ants}
+        for red in filtered_reds:
+            prior_bls = [bl for bl in red if bl in prior_cal['v_omnical']]
+            if len(prior_bls) > 0:
+                log_sol[red[0]] = np.array(prior_cal['v_omnical'][prior_bls[0]],
+                                           dtype=(complex_dtype if precision == 'single' else None))
+            else:
+                log_sol[red[0]] = np.mean([data[bl] / (log_sol[split_bl(bl)[0]] * np.conj(log_sol[split_bl(bl)[1]]))
+                                           for bl in red], axis=0)
     rv['gf_firstcal'] = {ant: np.zeros_like(g, dtype=bool) for ant, g in rv['g_firstcal'].items()}
 
-    # perform logcal and omnical
-    _, log_sol = rc.logcal(data, sol0=rv['g_firstcal'])
+    # perform omnical
+    t0 = time.perf_counter()
     make_sol_finite(log_sol)
     data_wgts = {bl: predict_noise_variance_from_autos(bl, data, dt=(np.median(np.ediff1d(times_by_bl[bl[:2]]))
                                                                      * SEC_PER_DAY))**-1 for bl in data.keys()}
     rv['omni_meta'], omni_sol = rc.omnical(data, log_sol, wgts=data_wgts, conv_crit=oc_conv_crit, maxiter=oc_maxiter,
-                                           check_every=check_every, check_after=check_after, gain=gain)
+                                           check_every=check_every, check_after=check_after, gain=gain, nthreads=oc_nthreads,
+                                           accel=oc_accel)
+    rv['timing_meta']['omnical'] = time.perf_counter() - t0
 
     # update omnical flags and then remove degeneracies
+    t0 = time.perf_counter()
     rv['g_omnical'], rv['v_omnical'] = get_gains_and_vis_from_sol(omni_sol)
     rv['gf_omnical'] = {ant: ~np.isfinite(g) for ant, g in rv['g_omnical'].items()}
     rv['vf_omnical'] = DataContainer({bl: ~np.isfinite(v) for bl, v in rv['v_omnical'].items()})
@@ -1566,16 +2239,21 @@ def redundantly_calibrate(data, reds, freqs=None, times_by_bl=None, fc_conv_crit
     rv['g_omnical'], rv['v_omnical'] = get_gains_and_vis_from_sol(rd_sol)
     rv['v_omnical'] = DataContainer(rv['v_omnical'])
     rv['g_omnical'] = {ant: g * ~rv['gf_omnical'][ant] + rv['gf_omnical'][ant] for ant, g in rv['g_omnical'].items()}
+    rv['timing_meta']['remove_degen'] = time.perf_counter() - t0
 
     # compute chisqs
+    t0 = time.perf_counter()
     rv['chisq'], rv['chisq_per_ant'] = normalized_chisq(data, data_wgts, filtered_reds, rv['v_omnical'], rv['g_omnical'])
+    rv['timing_meta']['chisq'] = time.perf_counter() - t0
     return rv
 
 
 def redcal_iteration(hd, nInt_to_load=None, pol_mode='2pol', bl_error_tol=1.0, ex_ants=[],
                      solar_horizon=0.0, flag_nchan_low=0, flag_nchan_high=0, fc_conv_crit=1e-6,
                      fc_maxiter=50, oc_conv_crit=1e-10, oc_maxiter=500, check_every=10, check_after=50,
-                     gain=.4, max_dims=2, verbose=False, **filter_reds_kwargs):
+                     gain=.4, max_dims=2, fc_pairing='all', fc_fft_workers=1, oc_nthreads=1, oc_accel=None, precision='double', nprocs=1,
+                     warm_start_cache=None, data_cache=None, data_cache_dir=None, omnivis_filename=None, memmap_dir=None,
+                     verbose=False, **filter_reds_kwargs):
     '''Perform redundant calibration (firstcal, logcal, and omnical) an entire HERAData object, loading only
     nInt_to_load integrations at a time and skipping and flagging times when the sun is above solar_horizon.
 
@@ -1606,17 +2284,59 @@ def redcal_iteration(hd, nInt_to_load=None, pol_mode='2pol', bl_error_tol=1.0, e
             with remove_degen() and must be later abscaled. None is no limit. 2 is a classically
             "redundantly calibratable" planar array.  More than 2 usually arises with subarrays of
             redundant baselines. Antennas will be excluded from reds to satisfy this.
+        fc_pairing: which pairs of baselines within each redundant group firstcal compares. 'all' (default)
+            uses every pair, 'chain' uses each baseline and the next in its group, and an integer k adds k random
+            partners per baseline to the chain. See RedundantCalibrator.firstcal() for more details.
+        fc_fft_workers: number of threads used for firstcal's delay FFTs. Default 1, since chunks may already be
+            calibrated in many processes. See RedundantCalibrator.firstcal() for more details.
+        oc_nthreads: number of threads with which to run omnical on slices of the frequency axis in parallel.
+            Default 1 is serial. See RedundantCalibrator.omnical() for more details.
+        oc_accel: optional acceleration of the omnical iteration. None (default) or 'anderson', which typically
+            halves the number of iterations. See RedundantCalibrator.omnical() for more details.
+        precision: 'double' (default) or 'single'. If 'single', uvh5 data are read as complex64 and calibrated
+            entirely in single precision (see redundantly_calibrate), as are omni_meta's chisq and conv_crit.
+        nprocs: number of processes to use for calibrating independent chunks of times and polarizations in
+            parallel. Default 1 calibrates all chunks serially in this process. If greater than 1, each chunk
+            is loaded with partial i/o from hd.filepaths by its worker process, which requires 'uvh5' filetype
+            for hd (which may be one file or a list of files). Since data already loaded into hd (and any changes
+            made to it) would then be ignored, hd must not have data loaded, or a ValueError is raised.
+        warm_start_cache: optional dictionary, updated in place, that holds the full-precision calibration
+            solution for each chunk of times and polarizations, along with the ex_ants and settings used.
+            If passed to a subsequent call of redcal_iteration on the same hd with the same settings and a
+            superset of ex_ants, firstcal and logcal are skipped and omnical is seeded with the previous
+            solutions for the remaining antennas (see redundantly_calibrate's prior_cal). Otherwise, or if the
+            previous solution lacks any of the antennas being calibrated, each chunk is calibrated from scratch.
+            Only solutions are kept in warm_start_cache; see data_cache for also skipping re-reading the data.
+        data_cache: optional dictionary, updated in place, that holds the data and nsamples of each chunk of times
+            and polarizations read with partial i/o (i.e. if nInt_to_load is not None or nprocs > 1), keyed by its
+            polarizations and times. If passed to a subsequent call of redcal_iteration on the same hd with the same
+            nInt_to_load, flag_nchan_low, flag_nchan_high, and precision, each chunk is taken from data_cache rather
+            than re-read from disk, regardless of ex_ants. This trades memory (or scratch disk) for i/o.
+        data_cache_dir: optional path to an existing directory in which data_cache keeps each chunk as a pickle
+            rather than in memory. Files are not deleted when the chunk is loaded, so this should be scratch space
+            that outlives data_cache. Default None keeps chunks in memory. Ignored if data_cache is None.
+        omnivis_filename: optional path to a uvh5 file (overwritten if it exists) to which the omnical visibility
+            solutions of each chunk of times and polarizations are written as soon as it's calibrated, rather than
+            being kept in memory for the whole night. 'v_omnical', 'vf_omnical', and 'vns_omnical' are then not
+            returned. Requires hd to be a single uvh5 file. Visibilities that are never solved for (e.g. times
+            flagged for the sun) are written as 1.0s, flagged, with 0 nsamples.
+        memmap_dir: optional path to an existing directory in which to memory-map the per-antenna results
+            (gains, gain flags, and chisq_per_ant) to .npy files that are filled in as each chunk is calibrated,
+            rather than holding them in memory. Combined with omnivis_filename and nInt_to_load, this bounds
+            memory use by the size of a chunk rather than the number of integrations.
         verbose: print calibration progress updates
         filter_reds_kwargs: additional filters for the redundancies (see redcal.filter_reds for documentation)
 
     Returns a dictionary of results with the following keywords:
         'g_firstcal': firstcal gains in dictionary keyed by ant-pol tuples like (1,'Jnn').
             Gains are Ntimes x Nfreqs gains but fully described by a per-antenna delay.
+            All per-antenna results are ArrayContainers, i.e. dictionary-like views into a single array
+            in the layout of a UVCal gain_array (see datacontainer.ArrayContainer).
         'gf_firstcal': firstcal gain flags in the same format as 'g_firstcal'. Will be all False.
         'g_omnical': full omnical gain dictionary (which include firstcal gains) in the same format.
             Flagged gains will be 1.0s.
         'gf_omnical': omnical flag dictionary in the same format. Flags arise from NaNs in log/omnical.
-        'v_omnical': omnical visibility solutions dictionary with baseline-pol tuple keys that are the
+        'v_omnical': omnical visibility solutions DataContainer with baseline-pol tuple keys that are the
             first elements in each of the sub-lists of reds. Flagged visibilities will be 0.0s.
         'vf_omnical': omnical visibility flag dictionary in the same format. Flags arise from NaNs.
         'vns_omnical': omnical visibility nsample dictionary that counts the number of unflagged redundancies.
@@ -1628,15 +2348,32 @@ def redcal_iteration(hd, nInt_to_load=None, pol_mode='2pol', bl_error_tol=1.0, e
             for all visibilities that an antenna participates in.
         'fc_meta' : dictionary that includes delays and identifies flipped antennas
         'omni_meta': dictionary of information about the omnical convergence and chi^2 of the solution
+        'timing_meta': dictionary of telemetry about where time was spent. Has one entry per chunk of times and
+            polarizations calibrated (in the order they finished) for 'pols', 'tind_start', 'tind_stop', the wall
+            clock time in seconds of each stage in REDCAL_TIMING_STAGES, and 'max_rss_mb', the peak resident memory
+            of the process that calibrated the chunk (nan where unavailable). Also has 'omni_iter_hist', a dictionary mapping the same
+            keys as omni_meta to histograms of the number of omnical iterations over unflagged times and channels,
+            and 'initial_read', the time spent loading the whole file if hd had no data loaded and no partial i/o.
     '''
+    if omnivis_filename is not None:
+        assert hd.filetype == 'uvh5', 'Writing omnical visibilities chunk by chunk only available for uvh5 filetype.'
+    if nprocs > 1 and hd.data_array is not None:
+        raise ValueError('With nprocs > 1, each chunk is read from hd.filepaths by a worker process, which would ignore '
+                         'the data already loaded into hd. Use nprocs=1 or a HERAData object without loaded data.')
+    real_dtype = _precision_dtypes(precision)[1]
+    read_kwargs = {'data_array_dtype': np.complex64} if (precision == 'single' and hd.filetype == 'uvh5') else {}
+    t0 = time.perf_counter()
     if nInt_to_load is not None:
         assert hd.filetype == 'uvh5', 'Partial loading only available for uvh5 filetype.'
+    elif nprocs > 1:
+        assert hd.filetype == 'uvh5', 'Parallel calibration with nprocs > 1 only available for uvh5 filetype.'
     else:
         if hd.data_array is None:  # if data loading hasn't happened yet, load the whole file
-            hd.read()
+            hd.read(return_data=False, **read_kwargs)
         if hd.times is None:  # load metadata into HERAData object if necessary
             for key, value in hd.get_metadata_dict().items():
                 setattr(hd, key, value)
+    initial_read_time = time.perf_counter() - t0
 
     # get basic antenna, polarization, and observation info
     nTimes, nFreqs = len(hd.times), len(hd.freqs)
@@ -1646,29 +2383,35 @@ def redcal_iteration(hd, nInt_to_load=None, pol_mode='2pol', bl_error_tol=1.0, e
     ants = [(ant, antpol) for ant in ant_nums for antpol in antpols]
     pol_load_list = _get_pol_load_list(hd.pols, pol_mode=pol_mode)
 
-    # initialize gains to 1s, gain flags to True, and chisq to 0s
+    # initialize gains to 1s, gain flags to True, and chisq to 0s, each stored in a single contiguous array
     rv = {}  # dictionary of return values
-    rv['g_firstcal'] = {ant: np.ones((nTimes, nFreqs), dtype=np.complex64) for ant in ants}
-    rv['gf_firstcal'] = {ant: np.ones((nTimes, nFreqs), dtype=bool) for ant in ants}
-    rv['g_omnical'] = {ant: np.ones((nTimes, nFreqs), dtype=np.complex64) for ant in ants}
-    rv['gf_omnical'] = {ant: np.ones((nTimes, nFreqs), dtype=bool) for ant in ants}
+    for key, dtype, fill_value in [('g_firstcal', np.complex64, 1), ('gf_firstcal', bool, True), ('g_omnical', np.complex64, 1),
+                                   ('gf_omnical', bool, True), ('chisq_per_ant', np.float32, 0)]:
+        filename = (None if memmap_dir is None else os.path.join(memmap_dir, key + '.npy'))
+        rv[key] = ArrayContainer(ants, nTimes, nFreqs, dtype=dtype, fill_value=fill_value, filename=filename)
     rv['chisq'] = {antpol: np.zeros((nTimes, nFreqs), dtype=np.float32) for antpol in antpols}
-    rv['chisq_per_ant'] = {ant: np.zeros((nTimes, nFreqs), dtype=np.float32) for ant in ants}
 
-    # get reds and then intitialize omnical visibility solutions to all 1s and all flagged
+    # get reds and then intitialize omnical visibility solutions to all 1s and all flagged (or an output file to write them to)
     all_reds = get_reds({ant: hd.antpos[ant] for ant in ant_nums}, bl_error_tol=bl_error_tol,
                         pol_mode=pol_mode, pols=set([pol for pols in pol_load_list for pol in pols]))
-    rv['v_omnical'] = DataContainer({red[0]: np.ones((nTimes, nFreqs), dtype=np.complex64) for red in all_reds})
-    rv['vf_omnical'] = DataContainer({red[0]: np.ones((nTimes, nFreqs), dtype=bool) for red in all_reds})
-    rv['vns_omnical'] = DataContainer({red[0]: np.zeros((nTimes, nFreqs), dtype=np.float32) for red in all_reds})
+    if omnivis_filename is None:
+        vis_stores = {'v_omnical': ArrayContainer([red[0] for red in all_reds], nTimes, nFreqs, dtype=np.complex64, fill_value=1),
+                      'vf_omnical': ArrayContainer([red[0] for red in all_reds], nTimes, nFreqs, dtype=bool, fill_value=True),
+                      'vns_omnical': ArrayContainer([red[0] for red in all_reds], nTimes, nFreqs, dtype=np.float32, fill_value=0)}
+        for key, store in vis_stores.items():
+            rv[key] = DataContainer(store)  # values are views into the store's array
+        omnivis_writer = None
+    else:
+        vis_stores = {}
+        omnivis_writer = _initialize_omnivis_file(hd.filepaths[0], [red[0] for red in all_reds], omnivis_filename)
     filtered_reds = filter_reds(all_reds, ex_ants=ex_ants, antpos=hd.antpos, **filter_reds_kwargs)
 
     # setup metadata dictionaries
     rv['fc_meta'] = {'dlys': {ant: np.full(nTimes, np.nan) for ant in ants}}
     rv['fc_meta']['polarity_flips'] = {ant: np.full(nTimes, np.nan) for ant in ants}
-    rv['omni_meta'] = {'chisq': {str(pols): np.zeros((nTimes, nFreqs), dtype=float) for pols in pol_load_list}}
+    rv['omni_meta'] = {'chisq': {str(pols): np.zeros((nTimes, nFreqs), dtype=real_dtype) for pols in pol_load_list}}
     rv['omni_meta']['iter'] = {str(pols): np.zeros((nTimes, nFreqs), dtype=int) for pols in pol_load_list}
-    rv['omni_meta']['conv_crit'] = {str(pols): np.zeros((nTimes, nFreqs), dtype=float) for pols in pol_load_list}
+    rv['omni_meta']['conv_crit'] = {str(pols): np.zeros((nTimes, nFreqs), dtype=real_dtype) for pols in pol_load_list}
 
     # solar flagging
     lat, lon, alt = hd.telescope_location_lat_lon_alt_degrees
@@ -1677,63 +2420,277 @@ def redcal_iteration(hd, nInt_to_load=None, pol_mode='2pol', bl_error_tol=1.0, e
     if verbose and np.any(solar_flagged):
         print(len(hd.times[solar_flagged]), 'integrations flagged due to sun above', solar_horizon, 'degrees.')
 
-    # loop over polarizations and times, performing partial loading if desired
+    # build up a list of independent calibration jobs, one per polarization group and time chunk
+    jobs = []
     for pols in pol_load_list:
-        if verbose:
-            print('Now calibrating', pols, 'polarization(s)...')
         reds = filter_reds(filtered_reds, ex_ants=ex_ants, pols=pols)
         if nInt_to_load is not None:  # split up the integrations to load nInt_to_load at a time
             tind_groups = np.split(np.arange(nTimes)[~solar_flagged],
                                    np.arange(nInt_to_load, len(hd.times[~solar_flagged]), nInt_to_load))
         else:
             tind_groups = [np.arange(nTimes)[~solar_flagged]]  # just load a single group
-        for tinds in tind_groups:
-            if len(tinds) > 0:
+        jobs += [(pols, tinds, reds) for tinds in tind_groups if len(tinds) > 0]
+    cal_kwargs = {'fc_conv_crit': fc_conv_crit, 'fc_maxiter': fc_maxiter, 'oc_conv_crit': oc_conv_crit,
+                  'oc_maxiter': oc_maxiter, 'check_every': check_every, 'check_after': check_after,
+                  'max_dims': max_dims, 'gain': gain, 'fc_pairing': fc_pairing, 'fc_fft_workers': fc_fft_workers, 'oc_nthreads': oc_nthreads,
+                  'oc_accel': oc_accel, 'precision': precision}
+    # warm starts are only taken from calibrations with the same settings and a subset of the current ex_ants
+    ex_ants = frozenset(ex_ants)
+    warm_start_settings = repr((sorted(cal_kwargs.items()), fSlice, bl_error_tol, pol_mode, sorted(filter_reds_kwargs.items(), key=repr)))
+
+    def _warm_start_cal(cache_key):
+        entry = (None if warm_start_cache is None else warm_start_cache.get(cache_key, None))
+        if entry is not None and entry['settings'] == warm_start_settings and entry['ex_ants'] <= ex_ants:
+            return entry['cal']
+        return None
+
+    # cached data are only taken from the same file(s), frequencies, and precision, regardless of ex_ants
+    data_cache_settings = repr((hd.filepaths, fSlice, precision))
+
+    def _cached_chunk(cache_key):
+        entry = (None if data_cache is None else data_cache.get(cache_key, None))
+        if entry is not None and entry['settings'] == data_cache_settings:
+            return entry['chunk']
+        return None
+
+    def _cache_chunk(cache_key, chunk):
+        if data_cache is not None and chunk is not None:
+            data_cache[cache_key] = {'settings': data_cache_settings, 'chunk': chunk}
+
+    timing_records = []
+    if nprocs > 1:  # dispatch jobs to a pool of processes, each of which performs its own partial i/o
+        with ProcessPoolExecutor(max_workers=nprocs) as executor:
+            futures = {}
+            for pols, tinds, reds in jobs:
+                cache_key = (str(pols), tinds[0], tinds[-1])
+                futures[executor.submit(_redcal_chunk_from_file, hd.filepaths, hd.times[tinds], hd.freqs[fSlice], pols,
+                                        reds, filter_reds(all_reds, pols=pols), prior_cal=_warm_start_cal(cache_key),
+                                        cached_chunk=_cached_chunk(cache_key), return_chunk=(data_cache is not None),
+                                        data_cache_dir=data_cache_dir, **cal_kwargs)] = (pols, tinds, cache_key)
+            for future in as_completed(futures):
+                pols, tinds, cache_key = futures[future]
                 if verbose:
-                    print('    Now calibrating times', hd.times[tinds[0]], 'through', hd.times[tinds[-1]], '...')
-                if nInt_to_load is None:  # don't perform partial I/O
-                    data, _, nsamples = hd.build_datacontainers()  # this may contain unused polarizations, but that's OK
-                    for bl in data:
-                        data[bl] = data[bl][tinds, fSlice]  # cut down size of DataContainers to match unflagged indices
-                        nsamples[bl] = nsamples[bl][tinds, fSlice]
-                else:  # perform partial i/o
-                    data, _, nsamples = hd.read(times=hd.times[tinds], frequencies=hd.freqs[fSlice], polarizations=pols)
-                cal = redundantly_calibrate(data, reds, freqs=hd.freqs[fSlice], times_by_bl=hd.times_by_bl,
-                                            fc_conv_crit=fc_conv_crit, fc_maxiter=fc_maxiter,
-                                            oc_conv_crit=oc_conv_crit, oc_maxiter=oc_maxiter,
-                                            check_every=check_every, check_after=check_after, max_dims=max_dims, gain=gain)
-                expand_omni_sol(cal, filter_reds(all_reds, pols=pols), data, nsamples)
-
-                # gather results
-                for ant in cal['g_omnical'].keys():
-                    rv['g_firstcal'][ant][tinds, fSlice] = cal['g_firstcal'][ant]
-                    rv['gf_firstcal'][ant][tinds, fSlice] = cal['gf_firstcal'][ant]
-                    rv['g_omnical'][ant][tinds, fSlice] = cal['g_omnical'][ant]
-                    rv['gf_omnical'][ant][tinds, fSlice] = cal['gf_omnical'][ant]
-                    rv['chisq_per_ant'][ant][tinds, fSlice] = cal['chisq_per_ant'][ant]
-                for ant in cal['fc_meta']['dlys'].keys():
-                    rv['fc_meta']['dlys'][ant][tinds] = cal['fc_meta']['dlys'][ant]
-                    rv['fc_meta']['polarity_flips'][ant][tinds] = cal['fc_meta']['polarity_flips'][ant]
-                for bl in cal['v_omnical'].keys():
-                    rv['v_omnical'][bl][tinds, fSlice] = cal['v_omnical'][bl]
-                    rv['vf_omnical'][bl][tinds, fSlice] = cal['vf_omnical'][bl]
-                    rv['vns_omnical'][bl][tinds, fSlice] = cal['vns_omnical'][bl]
-                if pol_mode in ['1pol', '2pol']:
-                    for antpol in cal['chisq'].keys():
-                        rv['chisq'][antpol][tinds, fSlice] = cal['chisq'][antpol]
-                else:  # duplicate chi^2 into both antenna polarizations
-                    for antpol in rv['chisq'].keys():
-                        rv['chisq'][antpol][tinds, fSlice] = cal['chisq']
-                rv['omni_meta']['chisq'][str(pols)][tinds, fSlice] = cal['omni_meta']['chisq']
-                rv['omni_meta']['iter'][str(pols)][tinds, fSlice] = cal['omni_meta']['iter']
-                rv['omni_meta']['conv_crit'][str(pols)][tinds, fSlice] = cal['omni_meta']['conv_crit']
+                    print('    Finished calibrating', pols, 'times', hd.times[tinds[0]], 'through', hd.times[tinds[-1]], '...')
+                if data_cache is not None:
+                    cal, chunk = future.result()
+                    _cache_chunk(cache_key, chunk)
+                else:
+                    cal = future.result()
+                if warm_start_cache is not None:
+                    warm_start_cache[cache_key] = {'settings': warm_start_settings, 'ex_ants': ex_ants, 'cal': cal}
+                t0 = time.perf_counter()
+                _gather_redcal_chunk(rv, vis_stores, cal, tinds, fSlice, pols, pol_mode)
+                if omnivis_writer is not None:
+                    _write_omnivis_chunk(omnivis_writer, omnivis_filename, cal, hd.times[tinds], fSlice, pols)
+                timing_records.append(_redcal_chunk_timing(cal, pols, tinds, write=time.perf_counter() - t0))
+        if omnivis_writer is not None:
+            _write_omnivis_chunk(omnivis_writer, omnivis_filename, None, hd.times[solar_flagged], fSlice, omnivis_writer.pols)
+        rv['timing_meta'] = _summarize_redcal_timing(timing_records, rv['omni_meta'], solar_flagged, fSlice, oc_maxiter)
+        rv['timing_meta']['initial_read'] = initial_read_time
+        return rv
 
+    # loop over polarizations and times, performing partial loading if desired
+    for n, (pols, tinds, reds) in enumerate(jobs):
+        if verbose:
+            if n == 0 or pols != jobs[n - 1][0]:
+                print('Now calibrating', pols, 'polarization(s)...')
+            print('    Now calibrating times', hd.times[tinds[0]], 'through', hd.times[tinds[-1]], '...')
+        cache_key = (str(pols), tinds[0], tinds[-1])
+        prior_cal = _warm_start_cal(cache_key)
+        cached_chunk = _cached_chunk(cache_key)
+        t0 = time.perf_counter()
+        if cached_chunk is not None:  # reuse data read by a previous call
+            data, nsamples = _load_chunk(cached_chunk)
+        elif nInt_to_load is None:  # don't perform partial I/O
+            data, _, nsamples = hd.build_datacontainers(views=True)  # this may contain unused polarizations, but that's OK
+            for bl in data:
+                data[bl] = data[bl][tinds, fSlice]  # cut down size of DataContainers to match unflagged indices
+                nsamples[bl] = nsamples[bl][tinds, fSlice]
+        else:  # perform partial i/o
+            data, _, nsamples = hd.read(times=hd.times[tinds], frequencies=hd.freqs[fSlice], polarizations=pols,
+                                        views=True, **read_kwargs)
+            if data_cache is not None:
+                _cache_chunk(cache_key, _store_chunk(data, nsamples, cache_dir=data_cache_dir))
+        read_time = time.perf_counter() - t0
+        cal = redundantly_calibrate(data, reds, freqs=hd.freqs[fSlice], times_by_bl=hd.times_by_bl,
+                                    prior_cal=prior_cal, **cal_kwargs)
+        t0 = time.perf_counter()
+        expand_omni_sol(cal, filter_reds(all_reds, pols=pols), data, nsamples)
+        expand_time = time.perf_counter() - t0
+        if warm_start_cache is not None:
+            warm_start_cache[cache_key] = {'settings': warm_start_settings, 'ex_ants': ex_ants, 'cal': cal}
+        t0 = time.perf_counter()
+        _gather_redcal_chunk(rv, vis_stores, cal, tinds, fSlice, pols, pol_mode)
+        if omnivis_writer is not None:
+            _write_omnivis_chunk(omnivis_writer, omnivis_filename, cal, hd.times[tinds], fSlice, pols)
+        timing_records.append(_redcal_chunk_timing(cal, pols, tinds, read=read_time, expand=expand_time,
+                                                   write=time.perf_counter() - t0))
+        if omnivis_writer is not None:
+            del data, nsamples, cal  # free up memory before loading the next chunk
+
+    if omnivis_writer is not None:
+        _write_omnivis_chunk(omnivis_writer, omnivis_filename, None, hd.times[solar_flagged], fSlice, omnivis_writer.pols)
+    rv['timing_meta'] = _summarize_redcal_timing(timing_records, rv['omni_meta'], solar_flagged, fSlice, oc_maxiter)
+    rv['timing_meta']['initial_read'] = initial_read_time
     return rv
 
 
+def _redcal_chunk_from_file(filepaths, times, freqs, pols, reds, all_reds, prior_cal=None, cached_chunk=None,
+                            return_chunk=False, data_cache_dir=None, **cal_kwargs):
+    '''Helper function for parallelized redcal_iteration. Loads a single chunk of times, frequencies, and
+    polarizations from a uvh5 file (or from cached_chunk, if not None), redundantly calibrates it, and expands
+    the solution to all_reds. If return_chunk, also returns the chunk newly read from the file in the format of
+    _store_chunk (or None if it came from cached_chunk).'''
+    t0 = time.perf_counter()
+    chunk = None
+    if cached_chunk is not None:
+        data, nsamples = _load_chunk(cached_chunk)
+    else:
+        hd = HERAData(filepaths)
+        read_kwargs = {'data_array_dtype': np.complex64} if cal_kwargs.get('precision', 'double') == 'single' else {}
+        data, _, nsamples = hd.read(times=times, frequencies=freqs, polarizations=pols, views=True, **read_kwargs)
+        if return_chunk:
+            chunk = _store_chunk(data, nsamples, cache_dir=data_cache_dir)
+    read_time = time.perf_counter() - t0
+    cal = redundantly_calibrate(data, reds, freqs=freqs, times_by_bl=data.times_by_bl, prior_cal=prior_cal, **cal_kwargs)
+    t0 = time.perf_counter()
+    expand_omni_sol(cal, all_reds, data, nsamples)
+    cal['timing_meta'].update({'read': read_time, 'expand': time.perf_counter() - t0, 'max_rss_mb': _max_rss_mb()})
+    if return_chunk:
+        return cal, chunk
+    return cal
+
+
+def _store_chunk(data, nsamples, cache_dir=None):
+    '''Prepare a chunk of data and nsamples for redcal_iteration's data_cache: either the tuple (data, nsamples)
+    itself or, if cache_dir is not None, the path to a new pickle of it in cache_dir. See _load_chunk.'''
+    if cache_dir is None:
+        return (data, nsamples)
+    fd, filename = tempfile.mkstemp(suffix='.redcal_chunk', dir=cache_dir)
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump((data, nsamples), f, protocol=4)
+    return filename
+
+
+def _load_chunk(chunk):
+    '''Return the (data, nsamples) tuple of a chunk prepared by _store_chunk, loading it from disk if necessary.'''
+    if isinstance(chunk, str):
+        with open(chunk, 'rb') as f:
+            return pickle.load(f)
+    return chunk
+
+
+def _max_rss_mb():
+    '''Peak resident set size of this process in MB (ru_maxrss is in kB on Linux, but bytes on macOS),
+    or nan where the resource module is unavailable, i.e. on Windows.'''
+    try:
+        import resource
+    except ImportError:
+        return np.nan
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (2**20 if sys.platform == 'darwin' else 2**10)
+
+
+def _redcal_chunk_timing(cal, pols, tinds, **stage_times):
+    '''Helper function for redcal_iteration. Builds a record of the timing of calibrating one chunk of times
+    and polarizations from the stage timings in cal['timing_meta'] (e.g. firstcal and omnical, see
+    redundantly_calibrate) and additional stage_times (e.g. read and write) in seconds. Stages not timed are 0.'''
+    record = {'pols': str(pols), 'tind_start': int(tinds[0]), 'tind_stop': int(tinds[-1]) + 1}
+    record.update({stage: 0.0 for stage in REDCAL_TIMING_STAGES})
+    record['max_rss_mb'] = _max_rss_mb()
+    record.update(cal['timing_meta'])  # if the chunk was calibrated by another process, this includes its max_rss_mb
+    record.update(stage_times)
+    return record
+
+
+def _summarize_redcal_timing(timing_records, omni_meta, solar_flagged, fSlice, oc_maxiter):
+    '''Helper function for redcal_iteration. Turns a list of per-chunk timing records (see _redcal_chunk_timing)
+    into a dictionary of arrays with one entry per chunk and adds histograms of the number of omnical iterations
+    over unflagged times and channels.'''
+    keys = ['pols', 'tind_start', 'tind_stop'] + REDCAL_TIMING_STAGES + ['max_rss_mb']
+    dtypes = [str, int, int] + [float] * len(REDCAL_TIMING_STAGES) + [float]
+    timing_meta = {key: np.array([record[key] for record in timing_records], dtype=dtype) for key, dtype in zip(keys, dtypes)}
+    timing_meta['omni_iter_hist'] = {pols: np.bincount(np.ravel(iters[~solar_flagged, fSlice]), minlength=oc_maxiter + 1)
+                                     for pols, iters in omni_meta['iter'].items()}
+    return timing_meta
+
+
+def _gather_redcal_chunk(rv, vis_stores, cal, tinds, fSlice, pols, pol_mode):
+    '''Helper function for redcal_iteration. Scatters the results of redundantly calibrating one chunk
+    of times and polarizations (cal) into the full set of results (rv) and the ArrayContainers that back
+    its visibility DataContainers (vis_stores), modifying them in place.'''
+    for key in ['g_firstcal', 'gf_firstcal', 'g_omnical', 'gf_omnical', 'chisq_per_ant']:
+        rv[key].set_chunk({ant: cal[key][ant] for ant in cal['g_omnical']}, tinds, fSlice)
+    for ant in cal['fc_meta']['dlys'].keys():
+        rv['fc_meta']['dlys'][ant][tinds] = cal['fc_meta']['dlys'][ant]
+        rv['fc_meta']['polarity_flips'][ant][tinds] = cal['fc_meta']['polarity_flips'][ant]
+    for key, store in vis_stores.items():
+        store.set_chunk(cal[key], tinds, fSlice)
+    if pol_mode in ['1pol', '2pol']:
+        for antpol in cal['chisq'].keys():
+            rv['chisq'][antpol][tinds, fSlice] = cal['chisq'][antpol]
+    else:  # duplicate chi^2 into both antenna polarizations
+        for antpol in rv['chisq'].keys():
+            rv['chisq'][antpol][tinds, fSlice] = cal['chisq']
+    rv['omni_meta']['chisq'][str(pols)][tinds, fSlice] = cal['omni_meta']['chisq']
+    rv['omni_meta']['iter'][str(pols)][tinds, fSlice] = cal['omni_meta']['iter']
+    rv['omni_meta']['conv_crit'][str(pols)][tinds, fSlice] = cal['omni_meta']['conv_crit']
+
+
+def _initialize_omnivis_file(filepath, bls, omnivis_filename):
+    '''Helper function for redcal_iteration. Creates an empty uvh5 file at omnivis_filename with the metadata of
+    filepath, selected down to the unique baselines in bls, and returns the HERAData object used to write to it.'''
+    hd_out = HERAData(filepath)
+    hd_out.select(bls=list(bls))
+    hd_out.pols = [polnum2str(polnum, x_orientation=hd_out.x_orientation) for polnum in hd_out.polarization_array]
+    hd_out.history += version.history_string()
+    hd_out.initialize_uvh5_file(omnivis_filename, clobber=True)
+    return hd_out
+
+
+def _write_omnivis_chunk(hd_out, omnivis_filename, cal, times, fSlice, pols):
+    '''Helper function for redcal_iteration. Writes the omnical visibility solutions of one chunk of times and
+    polarizations (cal, which may be None) to the file initialized by _initialize_omnivis_file(). Baselines,
+    channels, or times without solutions are written as 1.0s, flagged, with 0 nsamples.'''
+    pols = [pol for pol in hd_out.pols if pol in pols]  # file order
+    blt_inds = np.arange(hd_out.Nblts)[np.isin(hd_out.time_array, times)]
+    if (len(blt_inds) == 0) or (len(pols) == 0):
+        return
+    shape = (len(blt_inds), 1, hd_out.Nfreqs, len(pols))
+    data, flags, nsamples = np.ones(shape, dtype=np.complex64), np.ones(shape, dtype=bool), np.zeros(shape, dtype=np.float32)
+
+    if cal is not None:
+        t_inds = np.searchsorted(times, hd_out.time_array[blt_inds])
+        unique_bl_nums, bl_inv = np.unique(hd_out.baseline_array[blt_inds], return_inverse=True)
+        sols = [DataContainer(cal[key]) for key in ['v_omnical', 'vf_omnical', 'vns_omnical']]
+        for n, bl_num in enumerate(unique_bl_nums):
+            rows = np.flatnonzero(bl_inv == n)
+            antpair = hd_out.baseline_to_antnums(bl_num)
+            for p, pol in enumerate(pols):
+                if antpair + (pol,) in sols[0]:
+                    for out, sol in zip([data, flags, nsamples], sols):
+                        out[rows, 0, fSlice, p] = sol[antpair + (pol,)][t_inds[rows]]
+
+    hd_out.write_uvh5_part(omnivis_filename, data, flags, nsamples, blt_inds=blt_inds,
+                           polarizations=[polstr2num(pol, x_orientation=hd_out.x_orientation) for pol in pols])
+
+
+def _set_uvh5_history(filename, history):
+    '''Replace the history in the header of an existing uvh5 file.'''
+    with h5py.File(filename, 'r+') as f:
+        del f['Header/history']
+        f['Header/history'] = np.string_(history)
+
+
 def _redcal_run_write_results(cal, hd, fistcal_filename, omnical_filename, omnivis_filename,
-                              meta_filename, outdir, clobber=False, verbose=False, add_to_history=''):
-    '''Helper function for writing the results of redcal_run.'''
+                              meta_filename, outdir, clobber=False, verbose=False, add_to_history='',
+                              omnivis_streamed=False, timing_meta=None):
+    '''Helper function for writing the results of redcal_run. If omnivis_streamed, the omnical visibilities
+    have already been written to omnivis_filename by redcal_iteration, so only its history is updated.
+    If timing_meta is not None, the time spent writing each file (except the metadata file itself) is
+    added to it in place under 'write_times' and it is saved to the metadata file.'''
+    write_times = {}
+    t0 = time.perf_counter()
     # get antnums2antnames dictionary
     antnums2antnames = dict(zip(hd.antenna_numbers, hd.antenna_names))
     
@@ -1749,27 +2706,53 @@ def _redcal_run_write_results(cal, hd, fistcal_filename, omnical_filename, omniv
               x_orientation=hd.x_orientation, telescope_location=hd.telescope_location,
               antenna_positions=antenna_positions, lst_array=lst_array,
               history=version.history_string(add_to_history), antnums2antnames=antnums2antnames)
+    write_times['firstcal'] = time.perf_counter() - t0
 
     if verbose:
         print('Now saving omnical gains to', os.path.join(outdir, omnical_filename))
+    t0 = time.perf_counter()
     write_cal(omnical_filename, cal['g_omnical'], hd.freqs, hd.times, flags=cal['gf_omnical'],
               quality=cal['chisq_per_ant'], total_qual=cal['chisq'], outdir=outdir, overwrite=clobber,
               x_orientation=hd.x_orientation, telescope_location=hd.telescope_location,
               antenna_positions=antenna_positions, lst_array=lst_array,
               history=version.history_string(add_to_history), antnums2antnames=antnums2antnames)
+    write_times['omnical'] = time.perf_counter() - t0
 
-    if verbose:
-        print('Now saving omnical visibilities to', os.path.join(outdir, omnivis_filename))
-    hd_out = HERAData(hd.filepaths[0], filetype=hd.filetype)
-    hd_out.read(bls=cal['v_omnical'].keys())
-    hd_out.update(data=cal['v_omnical'], flags=cal['vf_omnical'], nsamples=cal['vns_omnical'])
-    hd_out.history += version.history_string(add_to_history)
-    hd_out.write_uvh5(os.path.join(outdir, omnivis_filename), clobber=True)
+    t0 = time.perf_counter()
+    if omnivis_streamed:
+        _set_uvh5_history(os.path.join(outdir, omnivis_filename),
+                          HERAData(hd.filepaths[0]).history + version.history_string(add_to_history))
+    else:
+        if verbose:
+            print('Now saving omnical visibilities to', os.path.join(outdir, omnivis_filename))
+        hd_out = HERAData(hd.filepaths[0], filetype=hd.filetype)
+        hd_out.read(bls=cal['v_omnical'].keys())
+        hd_out.update(data=cal['v_omnical'], flags=cal['vf_omnical'], nsamples=cal['vns_omnical'])
+        hd_out.history += version.history_string(add_to_history)
+        hd_out.write_uvh5(os.path.join(outdir, omnivis_filename), clobber=True)
+    write_times['omnivis'] = time.perf_counter() - t0
 
     if verbose:
         print('Now saving redcal metadata to ', os.path.join(outdir, meta_filename))
+    if timing_meta is not None:
+        timing_meta['write_times'] = write_times
     save_redcal_meta(os.path.join(outdir, meta_filename), cal['fc_meta'], cal['omni_meta'], hd.freqs,
-                     hd.times, hd.lsts, hd.antpos, hd.history + version.history_string(add_to_history))
+                     hd.times, hd.lsts, hd.antpos, hd.history + version.history_string(add_to_history),
+                     timing_meta=timing_meta)
+    return write_times
+
+
+def _log_redcal_timing(timing_log, input_data, run_number, ex_ants, timing_meta):
+    '''Helper function for redcal_run. Appends one JSON record per calibrated chunk of times and polarizations in
+    timing_meta (see redcal_iteration) to the file timing_log, which is thus a structured log in JSON Lines format.'''
+    with open(timing_log, 'a') as f:
+        for n in range(len(timing_meta['pols'])):
+            record = {'file': input_data, 'run': run_number, 'n_ex_ants': len(ex_ants)}
+            for key in ['pols', 'tind_start', 'tind_stop'] + REDCAL_TIMING_STAGES + ['max_rss_mb']:
+                record[key] = timing_meta[key][n].item()
+            if np.isnan(record['max_rss_mb']):
+                record['max_rss_mb'] = None  # unavailable, and NaN isn't valid JSON
+            f.write(json.dumps(record) + '\n')
 
 
 def redcal_run(input_data, filetype='uvh5', firstcal_ext='.first.calfits', omnical_ext='.omni.calfits',
@@ -1778,7 +2761,8 @@ def redcal_run(input_data, filetype='uvh5', firstcal_ext='.first.calfits', omnic
                bl_error_tol=1.0, ex_ants=[], ant_z_thresh=4.0, max_rerun=5, solar_horizon=0.0,
                flag_nchan_low=0, flag_nchan_high=0, fc_conv_crit=1e-6, fc_maxiter=50,
                oc_conv_crit=1e-10, oc_maxiter=500, check_every=10, check_after=50, gain=.4, add_to_history='',
-               max_dims=2, verbose=False, **filter_reds_kwargs):
+               max_dims=2, fc_pairing='all', fc_fft_workers=1, oc_nthreads=1, oc_accel=None, precision='double', nprocs=1, warm_start=False,
+               reds_cache_dir=None, stream=False, timing_log=None, verbose=False, **filter_reds_kwargs):
     '''Perform redundant calibration (firstcal, logcal, and omnical) an uvh5 data file, saving firstcal and omnical
     results to calfits and uvh5. Uses partial io if desired, performs solar flagging, and iteratively removes antennas
     with high chi^2, rerunning calibration as necessary.
@@ -1830,84 +2814,300 @@ def redcal_run(input_data, filetype='uvh5', firstcal_ext='.first.calfits', omnic
             "redundantly calibratable" planar array.  More than 2 usually arises with subarrays of
             redundant baselines. Antennas will be excluded from reds to satisfy this.
         add_to_history: string to add to history of output firstcal and omnical files
+        fc_pairing: which pairs of baselines within each redundant group firstcal compares. 'all' (default)
+            uses every pair, 'chain' uses each baseline and the next in its group, and an integer k adds k random
+            partners per baseline to the chain. See RedundantCalibrator.firstcal() for more details.
+        fc_fft_workers: number of threads used for firstcal's delay FFTs. Default 1, since chunks may already be
+            calibrated in many processes. See RedundantCalibrator.firstcal() for more details.
+        oc_nthreads: number of threads with which to run omnical on slices of the frequency axis in parallel.
+            Default 1 is serial. See RedundantCalibrator.omnical() for more details.
+        oc_accel: optional acceleration of the omnical iteration. None (default) or 'anderson', which typically
+            halves the number of iterations. See RedundantCalibrator.omnical() for more details.
+        precision: 'double' (default) or 'single'. If 'single', uvh5 data are read as complex64 and calibrated
+            entirely in single precision (see redundantly_calibrate), as are omni_meta's chisq and conv_crit.
+        nprocs: number of processes to use for calibrating independent chunks of times and polarizations in
+            parallel (see redcal_iteration). Default 1 is serial. Values greater than 1 require 'uvh5' filetype.
+            Each chunk is then read from disk by its worker process, so if input_data is a HERAData object,
+            it must not have data loaded, or a ValueError is raised.
+        warm_start: if True, re-runs after excluding high chi^2 antennas skip firstcal and logcal and seed
+            omnical with the previous run's solutions for the remaining antennas (see redcal_iteration's
+            warm_start_cache). Only the solutions are kept between re-runs, so data are reloaded as usual.
+            If 'memory' or 'disk', each chunk of data read with partial i/o (i.e. if nInt_to_load is not None
+            or nprocs > 1) is also kept between re-runs (see redcal_iteration's data_cache), either in memory or
+            in a scratch directory in outdir that is deleted when done, trading memory or disk space for i/o.
+        reds_cache_dir: optional path to a directory for caching redundancies on disk, shared between jobs that
+            calibrate data with the same array layout. Overrides the cache_dir of set_reds_cache for this call only.
+        stream: if True, write the omnical visibilities for each chunk of nInt_to_load integrations to the omnivis
+            file as soon as it's calibrated and fill in per-antenna results in memory-mapped scratch files in outdir,
+            which are converted to calfits at the end. Memory use is then bounded by the size of a chunk rather than
+            the number of integrations. Requires 'uvh5' filetype. See redcal_iteration's omnivis_filename and memmap_dir.
+        timing_log: optional path to a file to which a JSON record of the timing of each chunk of each run of
+            redcal_iteration is appended, one per line. Regardless, the timing telemetry of the final run (see
+            redcal_iteration's 'timing_meta'), the time spent opening and reading input_data in 'load_time', the wall
+            clock time of every run in 'run_times', and the time spent writing each output file in 'write_times' are
+            saved to the metadata file.
         verbose: print calibration progress updates
         filter_reds_kwargs: additional filters for the redundancies (see redcal.filter_reds for documentation)
 
     Returns:
-        cal: the dictionary result of the final run of redcal_iteration (see above for details)
+        cal: the dictionary result of the final run of redcal_iteration (see above for details). If stream,
+            it does not include omnical visibilities and per-antenna results are memory-mapped from files
+            that have been deleted (which still works on POSIX systems until cal is garbage collected).
     '''
-    if isinstance(input_data, str):
-        hd = HERAData(input_data, filetype=filetype)
-        if filetype != 'uvh5' or nInt_to_load is None:
-            hd.read()
-
-    elif isinstance(input_data, HERAData):
-        hd = input_data
-        input_data = hd.filepaths[0]
-    else:
-        raise TypeError('input_data must be a single string path to a visibility data file or a HERAData object')
-
-    ex_ants = set(ex_ants)
-    from hera_qm.metrics_io import load_metric_file
-    if ant_metrics_file is not None:
-        for ant in load_metric_file(ant_metrics_file)['xants']:
-            ex_ants.add(ant[0])  # Just take the antenna number, flagging both polarizations
-    if a_priori_ex_ants_yaml is not None:
-        from hera_qm.metrics_io import read_a_priori_ant_flags
-        ex_ants = ex_ants.union(set(read_a_priori_ant_flags(a_priori_ex_ants_yaml, ant_indices_only=True)))
-    high_z_ant_hist = ''
-
-    # setup output
+    # use reds_cache_dir only for this call, rather than for every later call in this process
+    with _reds_cache_dir(reds_cache_dir):
+        t0 = time.perf_counter()
+        if isinstance(input_data, str):
+            hd = HERAData(input_data, filetype=filetype)
+            if filetype != 'uvh5' or (nInt_to_load is None and nprocs == 1):
+                read_kwargs = {'data_array_dtype': np.complex64} if (precision == 'single' and filetype == 'uvh5') else {}
+                hd.read(return_data=False, **read_kwargs)
+
+        elif isinstance(input_data, HERAData):
+            hd = input_data
+            input_data = hd.filepaths[0]
+        else:
+            raise TypeError('input_data must be a single string path to a visibility data file or a HERAData object')
+        if stream and hd.filetype != 'uvh5':
+            raise ValueError('Streaming redcal results to disk requires uvh5 filetype.')
+        if warm_start not in [False, True, 'memory', 'disk']:
+            raise ValueError("warm_start must be False, True, 'memory', or 'disk', not {}.".format(warm_start))
+        load_time = time.perf_counter() - t0
+
+        ex_ants = set(ex_ants)
+        from hera_qm.metrics_io import load_metric_file
+        if ant_metrics_file is not None:
+            for ant in load_metric_file(ant_metrics_file)['xants']:
+                ex_ants.add(ant[0])  # Just take the antenna number, flagging both polarizations
+        if a_priori_ex_ants_yaml is not None:
+            from hera_qm.metrics_io import read_a_priori_ant_flags
+            ex_ants = ex_ants.union(set(read_a_priori_ant_flags(a_priori_ex_ants_yaml, ant_indices_only=True)))
+        high_z_ant_hist = ''
+
+        # setup output
+        filename_no_ext = os.path.splitext(os.path.basename(input_data))[0]
+        if outdir is None:
+            outdir = os.path.dirname(input_data)
+
+        # loop over calibration, removing bad antennas and re-running if necessary
+        from hera_qm.ant_metrics import per_antenna_modified_z_scores
+        run_number = 0
+        run_times = []
+        warm_start_cache = ({} if warm_start else None)
+        data_cache = ({} if warm_start in ['memory', 'disk'] else None)
+        # memory-map the per-antenna results of every run (and cache data on disk) in the same scratch directory,
+        # deleted when done or on error
+        scratch = (tempfile.TemporaryDirectory(dir=outdir, prefix=filename_no_ext + '.redcal_scratch.')
+                   if (stream or warm_start == 'disk') else contextlib.nullcontext())
+        with scratch as scratch_dir:
+            while True:
+                # Run redundant calibration
+                if verbose:
+                    print('\nNow running redundant calibration without antennas', list(ex_ants), '...')
+                stream_kwargs = {}
+                if stream:  # write omnical visibilities directly to the final output and memory-map everything else
+                    stream_kwargs = {'omnivis_filename': os.path.join(outdir, filename_no_ext + omnivis_ext),
+                                     'memmap_dir': scratch_dir}
+                t0 = time.perf_counter()
+                cal = redcal_iteration(hd, nInt_to_load=nInt_to_load, pol_mode=pol_mode, bl_error_tol=bl_error_tol, ex_ants=ex_ants,
+                                       solar_horizon=solar_horizon, flag_nchan_low=flag_nchan_low, flag_nchan_high=flag_nchan_high,
+                                       fc_conv_crit=fc_conv_crit, fc_maxiter=fc_maxiter, oc_conv_crit=oc_conv_crit, oc_maxiter=oc_maxiter,
+                                       check_every=check_every, check_after=check_after, max_dims=max_dims, gain=gain,
+                                       fc_pairing=fc_pairing, fc_fft_workers=fc_fft_workers, oc_nthreads=oc_nthreads, oc_accel=oc_accel,
+                                       precision=precision,
+                                       nprocs=nprocs, warm_start_cache=warm_start_cache, data_cache=data_cache,
+                                       data_cache_dir=(scratch_dir if warm_start == 'disk' else None), verbose=verbose,
+                                       **stream_kwargs, **filter_reds_kwargs)
+                run_times.append(time.perf_counter() - t0)
+                if timing_log is not None:
+                    _log_redcal_timing(timing_log, input_data, run_number, ex_ants, cal['timing_meta'])
+
+                # Determine whether to add additional antennas to exclude
+                z_scores = per_antenna_modified_z_scores({ant: np.nanmedian(cspa) for ant, cspa in cal['chisq_per_ant'].items()
+                                                          if (ant[0] not in ex_ants) and not np.all(cspa == 0)})
+                n_ex = len(ex_ants)
+                for ant, score in z_scores.items():
+                    if (score >= ant_z_thresh):
+                        ex_ants.add(ant[0])
+                        bad_ant_str = 'Throwing out antenna ' + str(ant[0]) + ' for a z-score of ' + str(score) + ' on polarization ' + str(ant[1]) + '.\n'
+                        high_z_ant_hist += bad_ant_str
+                        if verbose:
+                            print(bad_ant_str)
+                run_number += 1
+                if len(ex_ants) == n_ex or run_number >= max_rerun:
+                    break
+                # If there is going to be a re-run and if iter0_prefix is not the empty string, then save the iter0 results.
+                if run_number == 1 and len(iter0_prefix) > 0:
+                    if stream:  # move the streamed omnical visibilities out of the way of the next run
+                        os.replace(os.path.join(outdir, filename_no_ext + omnivis_ext),
+                                   os.path.join(outdir, filename_no_ext + iter0_prefix + omnivis_ext))
+                    _redcal_run_write_results(cal, hd, filename_no_ext + iter0_prefix + firstcal_ext, filename_no_ext + iter0_prefix + omnical_ext,
+                                              filename_no_ext + iter0_prefix + omnivis_ext, filename_no_ext + iter0_prefix + meta_ext, outdir,
+                                              clobber=clobber, verbose=verbose, add_to_history=add_to_history + '\n' + 'Iteration 0 Results.\n',
+                                              omnivis_streamed=stream, timing_meta=dict(cal['timing_meta'], run_times=np.array(run_times)))
+
+            # output results files
+            cal['timing_meta']['run_times'] = np.array(run_times)
+            cal['timing_meta']['load_time'] = load_time
+            write_times = _redcal_run_write_results(cal, hd, filename_no_ext + firstcal_ext, filename_no_ext + omnical_ext,
+                                                    filename_no_ext + omnivis_ext, filename_no_ext + meta_ext, outdir, clobber=clobber,
+                                                    verbose=verbose, add_to_history=add_to_history + '\n' + high_z_ant_hist,
+                                                    omnivis_streamed=stream, timing_meta=cal['timing_meta'])
+            if timing_log is not None:
+                with open(timing_log, 'a') as f:
+                    f.write(json.dumps({'file': input_data, 'load_time': load_time, 'run_times': run_times,
+                                        'write_times': write_times}) + '\n')
+
+        return cal
+
+
+def _redcal_run_outputs(input_data, outdir=None, firstcal_ext='.first.calfits', omnical_ext='.omni.calfits',
+                        omnivis_ext='.omni_vis.uvh5', meta_ext='.redcal_meta.hdf5'):
+    '''Paths to the final firstcal, omnical, omnivis, and metadata files that redcal_run writes for input_data.'''
     filename_no_ext = os.path.splitext(os.path.basename(input_data))[0]
     if outdir is None:
         outdir = os.path.dirname(input_data)
+    return [os.path.join(outdir, filename_no_ext + ext) for ext in [firstcal_ext, omnical_ext, omnivis_ext, meta_ext]]
+
+
+def _estimate_redcal_run_memory(input_data, filetype='uvh5', nInt_to_load=None, precision='double'):
+    '''Rough estimate in bytes of the peak memory that redcal_run needs to calibrate input_data, based on the
+    size of the data, flags, and nsamples that are loaded at once (a few times over, for copies and solutions).
+    Returns None if the size can't be inferred without loading the data, i.e. for filetypes other than uvh5.'''
+    if filetype != 'uvh5':
+        return None
+    hd = HERAData(input_data)
+    nTimes = hd.Ntimes if nInt_to_load is None else min(nInt_to_load, hd.Ntimes)
+    bytes_per_sample = (8 if precision == 'single' else 16) + 1 + 4  # data, flags, and nsamples
+    return 4 * hd.Nbls * nTimes * hd.Nfreqs * hd.Npols * bytes_per_sample
+
+
+def _redcal_run_many_worker(input_data, redcal_run_kwargs):
+    '''Helper function for redcal_run_many. Runs redcal_run on a single file in a worker process, whose reds and
+    solver caches persist between files, and returns its wall clock time in seconds instead of the (large) result.'''
+    t0 = time.perf_counter()
+    redcal_run(input_data, **redcal_run_kwargs)
+    return time.perf_counter() - t0
+
+
+def redcal_run_many(input_data_list, nworkers=1, max_memory_gb=None, clobber=False, reds_cache_dir=None,
+                    verbose=False, **redcal_run_kwargs):
+    '''Run redcal_run on many files (e.g. a whole night) in a single job, scheduling them on a local pool of worker
+    processes. Each worker process calibrates many files in turn, so its in-memory caches of redundancies and
+    linear solvers (see set_reds_cache and RedundantCalibrator.clear_solver_cache) are reused between files with the
+    same array layout, and all workers share an on-disk cache of redundancies. The results are the same as running
+    redcal_run on each file separately. A file that fails to calibrate does not stop the others: its error is
+    printed and the remaining files are calibrated before a RuntimeError listing all failed files is raised.
 
-    # loop over calibration, removing bad antennas and re-running if necessary
-    from hera_qm.ant_metrics import per_antenna_modified_z_scores
-    run_number = 0
-    while True:
-        # Run redundant calibration
-        if verbose:
-            print('\nNow running redundant calibration without antennas', list(ex_ants), '...')
-        cal = redcal_iteration(hd, nInt_to_load=nInt_to_load, pol_mode=pol_mode, bl_error_tol=bl_error_tol, ex_ants=ex_ants,
-                               solar_horizon=solar_horizon, flag_nchan_low=flag_nchan_low, flag_nchan_high=flag_nchan_high,
-                               fc_conv_crit=fc_conv_crit, fc_maxiter=fc_maxiter, oc_conv_crit=oc_conv_crit, oc_maxiter=oc_maxiter,
-                               check_every=check_every, check_after=check_after, max_dims=max_dims, gain=gain,
-                               verbose=verbose, **filter_reds_kwargs)
-
-        # Determine whether to add additional antennas to exclude
-        z_scores = per_antenna_modified_z_scores({ant: np.nanmedian(cspa) for ant, cspa in cal['chisq_per_ant'].items()
-                                                  if (ant[0] not in ex_ants) and not np.all(cspa == 0)})
-        n_ex = len(ex_ants)
-        for ant, score in z_scores.items():
-            if (score >= ant_z_thresh):
-                ex_ants.add(ant[0])
-                bad_ant_str = 'Throwing out antenna ' + str(ant[0]) + ' for a z-score of ' + str(score) + ' on polarization ' + str(ant[1]) + '.\n'
-                high_z_ant_hist += bad_ant_str
-                if verbose:
-                    print(bad_ant_str)
-        run_number += 1
-        if len(ex_ants) == n_ex or run_number >= max_rerun:
-            break
-        # If there is going to be a re-run and if iter0_prefix is not the empty string, then save the iter0 results.
-        if run_number == 1 and len(iter0_prefix) > 0:
-            _redcal_run_write_results(cal, hd, filename_no_ext + iter0_prefix + firstcal_ext, filename_no_ext + iter0_prefix + omnical_ext,
-                                      filename_no_ext + iter0_prefix + omnivis_ext, filename_no_ext + iter0_prefix + meta_ext, outdir,
-                                      clobber=clobber, verbose=verbose, add_to_history=add_to_history + '\n' + 'Iteration 0 Results.\n')
+    Arguments:
+        input_data_list: list of paths to visibility data files to calibrate
+        nworkers: maximum number of files to calibrate simultaneously in separate processes. Default 1 calibrates
+            all files serially in this process.
+        max_memory_gb: optional limit in GB on the total estimated memory of the files being calibrated at once.
+            New files are only started when their estimated memory (see _estimate_redcal_run_memory) fits under
+            the limit, but at least one file is always being calibrated. Files whose memory can't be estimated
+            (i.e. not uvh5) are calibrated one at a time. Default None only limits the number of workers.
+        clobber: if False (default), files whose firstcal, omnical, omnivis, and metadata outputs all exist are
+            skipped. If True, all files are calibrated and existing outputs are overwritten.
+        reds_cache_dir: optional path to a directory for caching redundancies on disk (see redcal_run). If None
+            and nworkers > 1, a temporary directory is shared by the workers and deleted at the end.
+        verbose: print scheduling progress updates (and calibration progress updates from redcal_run)
+        redcal_run_kwargs: additional keyword arguments passed to redcal_run for every file, e.g. outdir,
+            filetype, the output file extensions, ex_ants, nInt_to_load, or the calibration settings.
 
-    # output results files
-    _redcal_run_write_results(cal, hd, filename_no_ext + firstcal_ext, filename_no_ext + omnical_ext,
-                              filename_no_ext + omnivis_ext, filename_no_ext + meta_ext, outdir, clobber=clobber,
-                              verbose=verbose, add_to_history=add_to_history + '\n' + high_z_ant_hist)
+    Returns:
+        runtimes: dictionary mapping each path in input_data_list to the wall clock time in seconds spent
+            calibrating it, or None if it was skipped because its outputs already exist.
 
-    return cal
+    Raises:
+        RuntimeError: if any file failed to calibrate, once all other files have been calibrated
+    '''
+    output_kwargs = {key: redcal_run_kwargs[key] for key in ['outdir', 'firstcal_ext', 'omnical_ext', 'omnivis_ext', 'meta_ext']
+                     if key in redcal_run_kwargs}
+    runtimes = {input_data: None for input_data in input_data_list}
+    to_run = []
+    for input_data in input_data_list:
+        if not clobber and all([os.path.exists(f) for f in _redcal_run_outputs(input_data, **output_kwargs)]):
+            if verbose:
+                print('Skipping', input_data, 'because its redcal outputs already exist.')
+        else:
+            to_run.append(input_data)
+
+    temp_cache_dir = None
+    if reds_cache_dir is None and nworkers > 1:
+        reds_cache_dir = temp_cache_dir = tempfile.mkdtemp(prefix='redcal_run_many.reds_cache.')
+    redcal_run_kwargs = dict(redcal_run_kwargs, clobber=clobber, reds_cache_dir=reds_cache_dir, verbose=verbose)
+    failures = OrderedDict()
 
+    def _record_failure(input_data, err):
+        failures[input_data] = '{}: {}'.format(type(err).__name__, err)
+        print('Failed to calibrate', input_data, 'with', failures[input_data], file=sys.stderr)
 
-def redcal_argparser():
-    '''Arg parser for commandline operation of redcal_run'''
+    try:
+        if nworkers <= 1:
+            for input_data in to_run:
+                try:
+                    runtimes[input_data] = _redcal_run_many_worker(input_data, redcal_run_kwargs)
+                except Exception as err:
+                    _record_failure(input_data, err)
+        else:
+            # estimate memory use in bytes, treating files of unknown size as taking up the whole limit
+            max_memory = None if max_memory_gb is None else max_memory_gb * 2**30
+            memory = {input_data: 0 for input_data in to_run}
+            if max_memory is not None:
+                for input_data in to_run:
+                    estimate = _estimate_redcal_run_memory(input_data, filetype=redcal_run_kwargs.get('filetype', 'uvh5'),
+                                                           nInt_to_load=redcal_run_kwargs.get('nInt_to_load', None),
+                                                           precision=redcal_run_kwargs.get('precision', 'double'))
+                    memory[input_data] = (max_memory if estimate is None else estimate)
+
+            # submit files in order as workers and memory free up, so that at most nworkers jobs are ever queued
+            with ProcessPoolExecutor(max_workers=nworkers) as executor:
+                queue, running = list(to_run), {}
+                while len(queue) > 0 or len(running) > 0:
+                    while len(queue) > 0 and len(running) < nworkers:
+                        in_use = np.sum([memory[f] for f in running.values()])
+                        if max_memory is not None and len(running) > 0 and in_use + memory[queue[0]] > max_memory:
+                            break
+                        input_data = queue.pop(0)
+                        if verbose:
+                            print('Now calibrating', input_data, '...')
+                        running[executor.submit(_redcal_run_many_worker, input_data, redcal_run_kwargs)] = input_data
+                    future = next(as_completed(running))
+                    input_data = running.pop(future)
+                    try:
+                        runtimes[input_data] = future.result()
+                    except Exception as err:
+                        _record_failure(input_data, err)
+                    else:
+                        if verbose:
+                            print('Finished calibrating', input_data, 'in', runtimes[input_data], 'seconds.')
+    finally:
+        if temp_cache_dir is not None:
+            shutil.rmtree(temp_cache_dir)
+
+    if len(failures) > 0:
+        raise RuntimeError('{} of {} files failed to calibrate:\n'.format(len(failures), len(to_run))
+                           + '\n'.join(['{}: {}'.format(input_data, err) for input_data, err in failures.items()]))
+    return runtimes
+
+
+def _firstcal_pairing(pairing):
+    '''Parses the --fc_pairing argument, which is either 'all', 'chain', or an integer number of random partners.'''
+    return int(pairing) if pairing.isdigit() else pairing
+
+
+def redcal_argparser(multiple_files=False):
+    '''Arg parser for commandline operation of redcal_run, or of redcal_run_many if multiple_files is True.'''
     a = argparse.ArgumentParser(description="Redundantly calibrate a file using hera_cal.redcal. This includes firstcal, logcal, and omnical. \
                                 Iteratively re-runs by flagging antennas with large chi^2. Saves the result to calfits and uvh5 files.")
-    a.add_argument("input_data", type=str, help="path to uvh5 visibility data file to calibrate.")
+    if multiple_files:
+        a.add_argument("input_data", type=str, nargs='+', help="paths to uvh5 visibility data files to calibrate.")
+        a.add_argument("--nworkers", type=int, default=1, help="maximum number of files to calibrate simultaneously in separate processes. Default 1 is serial.")
+        a.add_argument("--max_memory_gb", type=float, default=None, help="optional limit on the total estimated memory in GB of the files being \
+                       calibrated at once.")
+    else:
+        a.add_argument("input_data", type=str, help="path to uvh5 visibility data file to calibrate.")
     a.add_argument("--firstcal_ext", default='.first.calfits', type=str, help="string to replace file extension of input_data for saving firstcal calfits")
     a.add_argument("--omnical_ext", default='.omni.calfits', type=str, help="string to replace file extension of input_data for saving omnical calfits")
     a.add_argument("--omnivis_ext", default='.omni_vis.uvh5', type=str, help="string to replace file extension of input_data for saving omnical visibilities as uvh5")
@@ -1915,7 +3115,8 @@ def redcal_argparser():
     a.add_argument("--outdir", default=None, type=str, help="folder to save data products. Default is the same as the folder containing input_data")
     a.add_argument("--iter0_prefix", default='', type=str, help="if not default '', save the omnical results with this prefix appended to each file after the 0th iteration, \
                    but only if redcal has found any antennas to exclude and re-run without.")
-    a.add_argument("--clobber", default=False, action="store_true", help="overwrites existing files for the firstcal and omnical results")
+    a.add_argument("--clobber", default=False, action="store_true", help="overwrites existing files for the firstcal and omnical results"
+                   + ("; otherwise, files whose outputs already exist are skipped" if multiple_files else ""))
     a.add_argument("--verbose", default=False, action="store_true", help="print calibration progress updates")
 
     redcal_opts = a.add_argument_group(title='Runtime Options for Redcal')
@@ -1930,6 +3131,17 @@ def redcal_argparser():
     redcal_opts.add_argument("--flag_nchan_high", type=int, default=0, help="integer number of channels at the high frequency end of the band to always flag (default 0)")
     redcal_opts.add_argument("--nInt_to_load", type=int, default=None, help="number of integrations to load and calibrate simultaneously. Lower numbers save memory, but incur a CPU overhead. \
                              Default None loads all integrations.")
+    redcal_opts.add_argument("--nprocs", type=int, default=1, help="number of processes to use for calibrating independent chunks of times and polarizations in parallel. \
+                             Default 1 is serial. Values greater than 1 require uvh5 input.")
+    redcal_opts.add_argument("--warm_start", default=False, nargs='?', const=True, choices=['memory', 'disk'], help="seed re-runs after \
+                             antenna exclusion with the previous solutions, skipping firstcal and logcal. If 'memory' or 'disk', also keep \
+                             data read with partial i/o between re-runs in memory or in a scratch directory in outdir.")
+    redcal_opts.add_argument("--reds_cache_dir", type=str, default=None, help="optional path to a directory for caching redundancies on disk, \
+                             shared between jobs that calibrate data with the same array layout.")
+    redcal_opts.add_argument("--stream", default=False, action="store_true", help="write omnical visibilities chunk by chunk as they are calibrated \
+                             and memory-map per-antenna results, bounding memory use by nInt_to_load. Requires uvh5 input.")
+    redcal_opts.add_argument("--timing_log", type=str, default=None, help="optional path to a file to which JSON records of the timing \
+                             of each calibrated chunk are appended, one per line. Timing is also always saved to the metadata file.")
     redcal_opts.add_argument("--pol_mode", type=str, default='2pol', help="polarization mode of redundancies. Can be '1pol', '2pol', '4pol', or '4pol_minV'. See recal.get_reds documentation.")
     redcal_opts.add_argument("--bl_error_tol", type=float, default=1.0, help="the largest allowable difference between baselines in a redundant group")
     redcal_opts.add_argument("--min_bl_cut", type=float, default=None, help="cut redundant groups with average baseline lengths shorter than this length in meters")
@@ -1940,8 +3152,17 @@ def redcal_argparser():
     omni_opts = a.add_argument_group(title='Firstcal and Omnical-Specific Options')
     omni_opts.add_argument("--fc_conv_crit", type=float, default=1e-6, help="maximum allowed changed in firstcal phases for convergence")
     omni_opts.add_argument("--fc_maxiter", type=int, default=50, help="maximum number of firstcal iterations allowed for finding per-antenna phases")
+    omni_opts.add_argument("--fc_pairing", type=_firstcal_pairing, default='all', help="pairs of baselines within each redundant group that firstcal compares. \
+                           'all' (default) uses every pair, 'chain' uses each baseline and the next in its group, and an integer k adds k random partners per baseline.")
+    omni_opts.add_argument("--fc_fft_workers", type=int, default=1, help="number of threads used for firstcal's delay FFTs. Default 1 is serial.")
     omni_opts.add_argument("--oc_conv_crit", type=float, default=1e-10, help="maximum allowed relative change in omnical solutions for convergence")
     omni_opts.add_argument("--oc_maxiter", type=int, default=500, help="maximum number of omnical iterations allowed before it gives up")
+    omni_opts.add_argument("--oc_nthreads", type=int, default=1, help="number of threads with which to run omnical on slices of the frequency axis in parallel. \
+                           Default 1 is serial.")
+    omni_opts.add_argument("--oc_accel", type=str, default=None, choices=['anderson'], help="optional acceleration of the omnical iteration. \
+                           'anderson' uses Anderson(1) mixing, which typically halves the number of iterations. Default None is off.")
+    omni_opts.add_argument("--precision", type=str, default='double', choices=['single', 'double'], help="floating point precision of calibration. \
+                           'single' reads and calibrates data as complex64, halving memory use at the cost of ~1e-6 relative accuracy. Default 'double'.")
     omni_opts.add_argument("--check_every", type=int, default=10, help="compute omnical convergence every Nth iteration (saves computation).")
     omni_opts.add_argument("--check_after", type=int, default=50, help="start computing omnical convergence only after N iterations (saves computation).")
     omni_opts.add_argument("--gain", type=float, default=.4, help="The fractional step made toward the new solution each omnical iteration. Values in the range 0.1 to 0.5 are generally safe.")
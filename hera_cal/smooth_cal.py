@@ -29,42 +29,59 @@ from . import flag_utils
 from .noise import interleaved_noise_variance_estimate
 
 
-def single_iterative_fft_dly(gains, wgts, freqs, conv_crit=1e-5, maxiter=100):
+def single_iterative_fft_dly(gains, wgts, freqs, conv_crit=1e-5, maxiter=100, fft_workers=1):
     '''Iteratively find a single best-fit delay for a given gain waterfall for all times.
 
     Arguments:
-        gains: ndarray of shape=(Ntimes,Nfreqs) of complex calibration solutions
-        wgts: ndarray of shape=(Ntimes,Nfreqs) of real linear multiplicative weights
+        gains: ndarray of shape=(Ntimes,Nfreqs) of complex calibration solutions. Can also be
+            a stack of waterfalls of shape=(Nwaterfalls,Ntimes,Nfreqs), which are solved together.
+        wgts: ndarray of the same shape as gains of real linear multiplicative weights
             For the purposes of this function, wghts <= 0 are considered flags.
         freqs: ndarray of frequency channels in Hz
         conv_crit: convergence criterionf or relative change in the rephasor
         maxiter: maximum number of
+        fft_workers: number of threads used for each FFT (see utils.fft_dly_batch). Default 1.
 
     Returns:
-        tau: float, single best fit delay in s
+        tau: float, single best fit delay in s. If gains is a stack of waterfalls,
+            ndarray of shape=(Nwaterfalls,) of delays in s.
     '''
-    if np.sum(wgts) == 0:  # if all flagged, return 0 delay
-        return 0.0
+    if np.ndim(gains) == 2:
+        if np.sum(wgts) == 0:  # if all flagged, return 0 delay
+            return 0.0
+        return single_iterative_fft_dly(gains[None], wgts[None], freqs, conv_crit=conv_crit, maxiter=maxiter,
+                                        fft_workers=fft_workers)[0]
 
     df = np.median(np.diff(freqs))
     gains = deepcopy(gains)
     gains[wgts <= 0] = np.nan
-    avg_gains = np.nanmean(gains, axis=0, keepdims=True)
-    unflagged_channels = np.nonzero(np.isfinite(avg_gains[0]))
-    unflagged_range = slice(np.min(unflagged_channels), np.max(unflagged_channels) + 1)
+    avg_gains = np.nanmean(gains, axis=1, keepdims=True)
+    unflagged = np.isfinite(avg_gains[:, 0])
     avg_gains[~np.isfinite(avg_gains)] = 0
 
-    taus = []
-    for i in range(maxiter):
-        tau, _ = utils.fft_dly(avg_gains[:, unflagged_range], df)
-        taus.append(tau)
+    # group waterfalls by the range of unflagged channels, since that sets the FFT length
+    ranges = {}
+    for n in range(len(gains)):
+        if np.sum(wgts[n]) == 0 or not np.any(unflagged[n]):  # if all flagged, leave 0 delay
+            continue
+        unflagged_channels = np.nonzero(unflagged[n])[0]
+        ranges.setdefault((unflagged_channels[0], unflagged_channels[-1] + 1), []).append(n)
+
+    taus = np.zeros(len(gains))
+    for (low, high), inds in ranges.items():
+        active = np.array(inds)
+        for i in range(maxiter):
+            tau, _ = utils.fft_dly_batch(avg_gains[active, :, low:high], df, workers=fft_workers)
+            tau = tau[:, 0, 0]
+            taus[active] += tau
 
-        rephasor = np.exp(-2.0j * np.pi * tau[0][0] * freqs)
-        avg_gains *= rephasor
-        if np.mean(np.abs(rephasor - 1.0)) < conv_crit:
-            break
+            rephasor = np.exp(-2.0j * np.pi * tau[:, None, None] * freqs)
+            avg_gains[active] *= rephasor
+            active = active[~(np.mean(np.abs(rephasor - 1.0), axis=(1, 2)) < conv_crit)]
+            if len(active) == 0:
+                break
 
-    return np.sum(taus)
+    return taus
 
 
 def freq_filter(gains, wgts, freqs, filter_scale=10.0, skip_wgt=0.1,
@@ -286,11 +303,10 @@ def pick_reference_antenna(gains, flags, freqs, per_pol=True):
             else: ant-pol tuple e.g. (0, 'Jxx')
     '''
     # compute delay for all gains to flatten them as well as possible. Average over times.
-    rephasors = {}
-    for ant in gains.keys():
-        wgts = np.array(~(flags[ant]), dtype=float)
-        dly = single_iterative_fft_dly(gains[ant], wgts, freqs)
-        rephasors[ant] = np.exp(-2.0j * np.pi * dly * freqs)
+    ants = list(gains.keys())
+    dlys = single_iterative_fft_dly(np.array([gains[ant] for ant in ants]),
+                                    np.array([~(flags[ant]) for ant in ants], dtype=float), freqs)
+    rephasors = {ant: np.exp(-2.0j * np.pi * dly * freqs) for ant, dly in zip(ants, dlys)}
 
     def narrow_refant_candidates(candidates):
         '''Helper function for comparing refant candidates to another another looking for the one with the
@@ -0,0 +1,47 @@
+"""Benchmark firstcal baseline pairing strategies on hex arrays, reporting runtime and the delay
+solution difference relative to using all pairs within each redundant group.
+
+Run with ``python -m hera_cal.tests.profile_firstcal_pairing``."""
+import numpy as np
+import time
+from copy import deepcopy
+from hera_sim.antpos import hex_array
+
+from hera_cal import redcal as om
+from hera_cal.utils import split_bl
+
+NTIMES, NFREQS = 2, 256
+HEX_NUMS = {37: 4, 61: 5, 127: 7}
+PAIRINGS = ['all', 'chain', 1, 3]
+rng = np.random.RandomState(0)
+
+
+def build_data(nants):
+    antpos = hex_array(HEX_NUMS[nants], split_core=False, outriggers=0)
+    reds = om.get_reds(antpos, pols=['ee'], pol_mode='1pol')
+    freqs = np.linspace(1e8, 2e8, NFREQS)
+    ants = sorted(set([ant for red in reds for bl in red for ant in split_bl(bl)]))
+    gains = {ant: np.exp(2j * np.pi * freqs * 50e-9 * rng.randn())[None, :] for ant in ants}
+    data = {}
+    for red in reds:
+        vis = rng.randn(NTIMES, NFREQS) + 1j * rng.randn(NTIMES, NFREQS)
+        for bl in red:
+            noise = .3 * (rng.randn(NTIMES, NFREQS) + 1j * rng.randn(NTIMES, NFREQS))
+            data[bl] = (vis * gains[(bl[0], 'Jee')] * np.conj(gains[(bl[1], 'Jee')]) + noise).astype(np.complex64)
+    return reds, freqs, data
+
+
+if __name__ == '__main__':
+    print('{:>6} {:>8} {:>8} {:>10} {:>18}'.format('Nants', 'pairing', 'Npairs', 'time [s]', 'rms dly diff [ns]'))
+    for nants in HEX_NUMS:
+        reds, freqs, data = build_data(nants)
+        rc = om.RedundantCalibrator(reds)
+        for pairing in PAIRINGS:
+            t0 = time.time()
+            meta, _ = rc.firstcal(deepcopy(data), freqs, pairing=pairing)
+            runtime = time.time() - t0
+            if pairing == 'all':
+                all_dlys = meta['dlys']
+            rms = np.sqrt(np.mean([(meta['dlys'][ant] - all_dlys[ant])**2 for ant in all_dlys])) * 1e9
+            print('{:>6} {:>8} {:>8} {:>10.3f} {:>18.4f}'.format(nants, str(pairing), len(rc._firstcal_pairs(pairing)),
+                                                                 runtime, rms))
@@ -0,0 +1,29 @@
+"""Benchmark redcal.get_pos_reds against a pairwise reference implementation on hex arrays.
+
+Run with ``python -m hera_cal.tests.profile_get_pos_reds``."""
+import numpy as np
+import timeit
+from hera_sim.antpos import hex_array
+
+from hera_cal import redcal as om
+from hera_cal.tests.test_redcal import pairwise_get_pos_reds
+
+np.random.seed(0)
+POS_ERROR = .02  # meters
+HEX_NUMS = {37: 4, 127: 7, 331: 11, 1000: 19}
+
+
+def build_antpos(nants):
+    antpos = hex_array(HEX_NUMS[nants], sep=14.6, split_core=False, outriggers=0)
+    return {ant: antpos[ant] + POS_ERROR * np.random.randn(3) for ant in sorted(antpos.keys())[:nants]}
+
+
+if __name__ == '__main__':
+    print('{:>6} {:>12} {:>16} {:>8}'.format('Nants', 'pairwise [s]', 'get_pos_reds [s]', 'speedup'))
+    for nants in HEX_NUMS:
+        antpos = build_antpos(nants)
+        assert om.get_pos_reds(antpos) == pairwise_get_pos_reds(antpos)
+        number = max(1, 2000 // nants)
+        t_pairwise = min(timeit.repeat(lambda: pairwise_get_pos_reds(antpos), number=1, repeat=3))
+        t_vectorized = min(timeit.repeat(lambda: om.get_pos_reds(antpos), number=number, repeat=3)) / number
+        print('{:>6} {:>12.4f} {:>16.4f} {:>8.1f}'.format(nants, t_pairwise, t_vectorized, t_pairwise / t_vectorized))
@@ -0,0 +1,59 @@
+"""Benchmark accelerated omnical iteration schemes on hex arrays with redcal_run's default omnical settings,
+reporting the number of iterations, runtime, and chi^2 relative to the unaccelerated iteration.
+
+Run with ``python -m hera_cal.tests.profile_omnical_accel``."""
+import numpy as np
+import time
+from copy import deepcopy
+from hera_sim.antpos import hex_array
+from hera_sim.vis import sim_red_data
+
+from hera_cal import redcal as om
+
+NTIMES, NFREQS = 4, 64
+HEX_NUMS = {19: 3, 37: 4, 61: 5}
+DTYPES = [np.complex64, np.complex128]
+ACCELS = [None, 'anderson']
+OC_KWARGS = {'gain': .4, 'conv_crit': 1e-10, 'maxiter': 500, 'check_every': 10, 'check_after': 50}
+
+
+def build_data(hex_num, dtype, ntimes=NTIMES, nfreqs=NFREQS, seed=0):
+    '''Simulate noisy redundant visibilities of the given dtype on a hex array with hex_num antennas per side.'''
+    rng = np.random.RandomState(seed)
+    antpos = hex_array(hex_num, split_core=False, outriggers=0)
+    reds = om.get_reds(antpos, pols=['ee'], pol_mode='1pol')
+    gains, true_vis, data = sim_red_data(reds, shape=(ntimes, nfreqs), gain_scatter=.1)
+    data = {bl: (vis + 3e-2 * (rng.randn(ntimes, nfreqs) + 1j * rng.randn(ntimes, nfreqs))).astype(dtype)
+            for bl, vis in data.items()}
+    return reds, data
+
+
+def run_benchmarks(hex_nums=HEX_NUMS, dtypes=DTYPES, ntimes=NTIMES, nfreqs=NFREQS):
+    '''Run omnical with every scheme in ACCELS, starting from logcal, on simulated data for each number of antennas
+    (mapped to hex array sizes by hex_nums) and dtype. Returns a list of dictionaries with the number of antennas,
+    dtype name, accel, mean and max number of iterations, runtime in seconds, and the ratio of the mean final chi^2
+    to that of the unaccelerated iteration.'''
+    results = []
+    for nants, hex_num in hex_nums.items():
+        for dtype in dtypes:
+            reds, data = build_data(hex_num, dtype, ntimes=ntimes, nfreqs=nfreqs)
+            rc = om.RedundantCalibrator(reds)
+            _, sol0 = rc.logcal(data)
+            for accel in ACCELS:
+                t0 = time.time()
+                meta, sol = rc.omnical(data, deepcopy(sol0), accel=accel, **OC_KWARGS)
+                runtime = time.time() - t0
+                if accel is None:
+                    chisq = meta['chisq']
+                results.append({'nants': nants, 'dtype': np.dtype(dtype).name, 'accel': str(accel),
+                                'mean_iter': np.mean(meta['iter']), 'max_iter': int(np.max(meta['iter'])),
+                                'time': runtime, 'chisq_ratio': np.mean(meta['chisq']) / np.mean(chisq)})
+    return results
+
+
+if __name__ == '__main__':
+    header = ('Nants', 'dtype', 'accel', 'mean iter', 'max iter', 'time [s]', 'chisq ratio')
+    print('{:>6} {:>11} {:>10} {:>10} {:>9} {:>10} {:>14}'.format(*header))
+    for res in run_benchmarks():
+        print('{:>6} {:>11} {:>10} {:>10.1f} {:>9d} {:>10.3f} {:>14.8f}'.format(
+            res['nants'], res['dtype'], res['accel'], res['mean_iter'], res['max_iter'], res['time'], res['chisq_ratio']))
@@ -0,0 +1,56 @@
+"""Benchmark polarity flip detection on hex arrays with adversarial flip patterns, e.g. many flipped antennas,
+flips that make the odd group the majority for many unique baselines, and randomly ambiguous baselines.
+Reports runtime and whether the true flips (up to an overall flip) were recovered.
+
+Run with ``python -m hera_cal.tests.profile_polarity_flips``."""
+import numpy as np
+import time
+from hera_sim.antpos import hex_array
+
+from hera_cal import redcal as om
+from hera_cal.utils import split_bl
+
+HEX_NUMS = {37: 4, 127: 7, 331: 11}
+rng = np.random.RandomState(0)
+
+
+def flip_patterns(antpos):
+    ants = sorted(antpos)
+    x = np.array([antpos[ant][0] for ant in ants])
+    return {'random 10%': rng.choice(ants, len(ants) // 10, replace=False),
+            'random 40%': rng.choice(ants, 2 * len(ants) // 5, replace=False),
+            'half array': [ant for ant, xi in zip(ants, x) if xi < np.median(x)],
+            'alternating': ants[::2]}
+
+
+def build_polarity_groups(reds, flipped, frac_ambiguous=0.):
+    '''Split each redundant group by baseline parity the same way _build_polarity_baseline_groups() would,
+    with the majority parity first, dropping a random fraction of baselines as ambiguous.'''
+    polarity_groups = {}
+    for red in reds:
+        parity = np.array([(split_bl(bl)[0] in flipped) != (split_bl(bl)[1] in flipped) for bl in red])
+        keep = rng.rand(len(red)) >= frac_ambiguous
+        majority = np.mean(parity) > .5
+        grp1 = [bl for bl, p, k in zip(red, parity, keep) if k and (p == majority)]
+        grp2 = [bl for bl, p, k in zip(red, parity, keep) if k and (p != majority)]
+        if (len(grp1) > 0) or (len(grp2) > 0):
+            polarity_groups[red[0]] = (grp1, grp2)
+    return polarity_groups
+
+
+if __name__ == '__main__':
+    print('{:>6} {:>12} {:>10} {:>10} {:>10}'.format('Nants', 'pattern', 'ambiguous', 'time [s]', 'recovered'))
+    for nants in HEX_NUMS:
+        antpos = hex_array(HEX_NUMS[nants], split_core=False, outriggers=0)
+        reds = om.get_reds(antpos, pols=['ee'], pol_mode='1pol')
+        ants = set([ant for red in reds for bl in red for ant in split_bl(bl)])
+        for pattern, flips in flip_patterns(antpos).items():
+            flipped = set([(ant, 'Jee') for ant in flips])
+            for frac_ambiguous in [0., .2]:
+                polarity_groups = build_polarity_groups(reds, flipped, frac_ambiguous=frac_ambiguous)
+                t0 = time.time()
+                is_flipped, _ = om._solve_polarity_flips(polarity_groups, ants)
+                runtime = time.time() - t0
+                recovered = (is_flipped is not None) and ((set([ant for ant in ants if is_flipped[ant]]) == flipped)
+                                                          or (set([ant for ant in ants if not is_flipped[ant]]) == flipped))
+                print('{:>6} {:>12} {:>10} {:>10.3f} {:>10}'.format(nants, pattern, frac_ambiguous, runtime, str(recovered)))
@@ -0,0 +1,190 @@
+"""Benchmark the redcal hot path on simulated redundant data from hex arrays of increasing size, timing get_reds,
+firstcal, logcal, omnical, remove_degen, expand_omni_sol, and a full redcal_iteration on a uvh5 file, and recording
+the peak memory allocated by each stage. Results are written to machine-readable JSON that can be compared against
+a previous run to catch performance regressions.
+
+Run with ``python -m hera_cal.tests.profile_redcal --output results.json`` and, after a change, with
+``python -m hera_cal.tests.profile_redcal --compare results.json``, which exits with status 1 if any stage got
+slower than the baseline by more than the tolerance."""
+import numpy as np
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from copy import deepcopy
+from hera_sim.antpos import hex_array
+from hera_sim.vis import sim_red_data
+
+from hera_cal import redcal as om
+from hera_cal import io, utils, version
+from hera_cal.datacontainer import DataContainer
+
+HEX_NUMS = [3, 4, 5, 7]
+NTIMES, NFREQS = 4, 128
+POLS = ['ee', 'nn']
+NOISE = 1e-2
+EX_ANTS = [0]  # excluded from calibration so that expand_omni_sol has antennas to solve for
+START_JD = 2458098.4
+OC_KWARGS = {'gain': .4, 'conv_crit': 1e-10, 'maxiter': 500, 'check_every': 10, 'check_after': 50}
+STAGES = ['get_reds', 'firstcal', 'logcal', 'omnical', 'remove_degen', 'expand_omni_sol', 'redcal_iteration']
+
+
+def simulate_hex_data(hex_num, ntimes=NTIMES, nfreqs=NFREQS, seed=0):
+    '''Simulate noisy redundant visibilities (plus autocorrelations for noise estimation) on a hex array.
+
+    Returns:
+        antpos: dictionary of antenna positions
+        reds: list of lists of redundant baseline tuples for all pols in POLS
+        data: DataContainer of complex visibilities of shape (ntimes, nfreqs) with freqs and times_by_bl
+        nsamples: DataContainer of ones in the same format as data
+    '''
+    rng = np.random.RandomState(seed)
+    antpos = hex_array(hex_num, split_core=False, outriggers=0)
+    reds = om.get_reds(antpos, pols=POLS, pol_mode='2pol')
+    _, _, data = sim_red_data(reds, shape=(ntimes, nfreqs), gain_scatter=.1)
+    data = {bl: vis + NOISE * (rng.randn(ntimes, nfreqs) + 1j * rng.randn(ntimes, nfreqs)) for bl, vis in data.items()}
+    for ant in antpos:
+        for pol in POLS:
+            data[(ant, ant, pol)] = np.ones((ntimes, nfreqs), dtype=complex)
+    data = DataContainer(data)
+    data.freqs = np.linspace(100e6, 200e6, nfreqs, endpoint=False)
+    times = START_JD + np.arange(ntimes) * 10.737 / om.SEC_PER_DAY
+    data.times_by_bl = {bl[:2]: times for bl in data}
+    nsamples = DataContainer({bl: np.ones((ntimes, nfreqs), dtype=float) for bl in data})
+    return antpos, reds, data, nsamples
+
+
+def write_sim_file(filename, antpos, data, nsamples):
+    '''Write simulated data to a uvh5 file that can be calibrated by redcal_iteration.'''
+    times = data.times_by_bl[next(iter(data.keys()))[:2]]
+    io.write_vis(filename, data, utils.JD2LST(times), data.freqs, antpos, time_array=times, nsamples=nsamples,
+                 filetype='uvh5', overwrite=True, verbose=False)
+
+
+def _time_stage(func, setup=None, repeat=3):
+    '''Run func(*setup()) repeat times, returning the list of runtimes in seconds and the peak memory in MB
+    allocated during one additional traced run (see tracemalloc).'''
+    times = []
+    for i in range(repeat):
+        args = (setup() if setup is not None else ())
+        t0 = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - t0)
+    args = (setup() if setup is not None else ())
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return times, peak / 2**20
+
+
+def benchmark_hex_array(hex_num, ntimes=NTIMES, nfreqs=NFREQS, repeat=3, tmpdir=None):
+    '''Time every stage in STAGES on simulated data from a hex array with hex_num antennas per side.
+
+    Returns:
+        list of dictionaries (one per stage) with the array size, stage name, all runtimes (the first of which
+            is with cold redundancy and solver caches), the best runtime, and the peak memory allocated in MB.
+    '''
+    antpos, reds, data, nsamples = simulate_hex_data(hex_num, ntimes=ntimes, nfreqs=nfreqs)
+    om.clear_reds_cache()
+    om.RedundantCalibrator.clear_solver_cache()
+    filtered_reds = om.filter_reds(reds, ex_ants=EX_ANTS)
+    rc = om.RedundantCalibrator(filtered_reds)
+    data_wgts = om._noise_wgts_from_autos([bl for red in filtered_reds for bl in red], data)
+
+    # precompute the input of each stage from the output of the previous one
+    _, g_fc = rc.firstcal(data, data.freqs)
+    _, log_sol = rc.logcal(data, sol0=g_fc)
+    om.make_sol_finite(log_sol)
+    _, omni_sol = rc.omnical(data, deepcopy(log_sol), wgts=data_wgts, **OC_KWARGS)
+    cal = om.redundantly_calibrate(data, filtered_reds)
+
+    if tmpdir is None:
+        tmpdir = tempfile.mkdtemp()
+        cleanup = True
+    else:
+        cleanup = False
+    filename = os.path.join(tmpdir, 'zen.hex{}.uvh5'.format(hex_num))
+    write_sim_file(filename, antpos, data, nsamples)
+
+    def get_reds():
+        om.clear_reds_cache()
+        om.get_reds(antpos, pols=POLS, pol_mode='2pol')
+
+    stages = {'get_reds': (get_reds, None),
+              'firstcal': (lambda: rc.firstcal(data, data.freqs), None),
+              'logcal': (lambda: rc.logcal(data, sol0=g_fc), None),
+              'omnical': (lambda sol0: rc.omnical(data, sol0, wgts=data_wgts, **OC_KWARGS), lambda: (deepcopy(log_sol),)),
+              'remove_degen': (lambda: rc.remove_degen(omni_sol, degen_sol=g_fc), None),
+              'expand_omni_sol': (lambda c: om.expand_omni_sol(c, reds, data, nsamples), lambda: (deepcopy(cal),)),
+              'redcal_iteration': (lambda: om.redcal_iteration(io.HERAData(filename), ex_ants=EX_ANTS, solar_horizon=90.,
+                                                               pol_mode='2pol'), None)}
+    results = []
+    try:
+        om.RedundantCalibrator.clear_solver_cache()
+        for stage in STAGES:
+            times, peak_mem = _time_stage(*stages[stage], repeat=repeat)
+            results.append({'hex_num': hex_num, 'nants': len(antpos), 'ntimes': ntimes, 'nfreqs': nfreqs,
+                            'stage': stage, 'times': times, 'best_time': min(times), 'peak_mem_mb': peak_mem})
+    finally:
+        if cleanup:
+            shutil.rmtree(tmpdir)
+    return results
+
+
+def run_benchmarks(hex_nums=HEX_NUMS, ntimes=NTIMES, nfreqs=NFREQS, repeat=3, tmpdir=None):
+    '''Benchmark all stages on hex arrays of each size in hex_nums, returning a JSON-serializable dictionary
+    with 'meta' (describing the software and machine) and 'results' (see benchmark_hex_array).'''
+    results = []
+    for hex_num in hex_nums:
+        results += benchmark_hex_array(hex_num, ntimes=ntimes, nfreqs=nfreqs, repeat=repeat, tmpdir=tmpdir)
+    meta = {'hera_cal_version': version.version, 'git_hash': version.git_hash, 'numpy_version': np.__version__,
+            'python_version': platform.python_version(), 'machine': platform.machine(), 'node': platform.node(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': repeat,
+            'max_rss_mb': om._max_rss_mb()}
+    return {'meta': meta, 'results': results}
+
+
+def find_regressions(results, baseline, tolerance=1.25):
+    '''Compare the best runtimes in results to those of a baseline (both in the format produced by run_benchmarks),
+    returning a list of (nants, stage, baseline_time, new_time) for every stage that got slower by more than a
+    factor of tolerance. Stages and array sizes missing from the baseline are ignored.'''
+    baseline_times = {(res['nants'], res['stage']): res['best_time'] for res in baseline['results']}
+    regressions = []
+    for res in results['results']:
+        key = (res['nants'], res['stage'])
+        if key in baseline_times and res['best_time'] > tolerance * baseline_times[key]:
+            regressions.append((res['nants'], res['stage'], baseline_times[key], res['best_time']))
+    return regressions
+
+
+if __name__ == '__main__':
+    a = argparse.ArgumentParser(description='Benchmark redcal stages on simulated hex array data.')
+    a.add_argument('--hex_nums', type=int, nargs='+', default=HEX_NUMS, help='hex array sizes (antennas per side)')
+    a.add_argument('--ntimes', type=int, default=NTIMES, help='number of integrations to simulate')
+    a.add_argument('--nfreqs', type=int, default=NFREQS, help='number of frequency channels to simulate')
+    a.add_argument('--repeat', type=int, default=3, help='number of times to time each stage')
+    a.add_argument('--output', type=str, default=None, help='path to JSON file in which to save results')
+    a.add_argument('--compare', type=str, default=None, help='path to JSON file of baseline results to compare to')
+    a.add_argument('--tolerance', type=float, default=1.25, help='maximum allowed ratio of new to baseline runtime')
+    args = a.parse_args()
+
+    results = run_benchmarks(hex_nums=args.hex_nums, ntimes=args.ntimes, nfreqs=args.nfreqs, repeat=args.repeat)
+    print('{:>6} {:>18} {:>14} {:>14}'.format('Nants', 'stage', 'best time [s]', 'peak mem [MB]'))
+    for res in results['results']:
+        print('{:>6} {:>18} {:>14.4f} {:>14.1f}'.format(res['nants'], res['stage'], res['best_time'], res['peak_mem_mb']))
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as f:
+            regressions = find_regressions(results, json.load(f), tolerance=args.tolerance)
+        for nants, stage, old, new in regressions:
+            print('REGRESSION: {} on {} antennas took {:.4f} s, up from {:.4f} s'.format(stage, nants, new, old))
+        sys.exit(int(len(regressions) > 0))
@@ -392,6 +392,14 @@ class Test_Abscal_Solvers(object):
         np.testing.assert_array_almost_equal(1e9 * fit['T_ew_Jee'], 1.0, decimal=3)
         np.testing.assert_array_almost_equal(1e9 * fit['T_ns_Jee'], 2.0, decimal=3)
 
+        # multi-threaded FFTs give the same delays
+        for func, args in [(abscal.delay_slope_lincal, (model, data, antpos)), (abscal.delay_lincal, (model, data))]:
+            fit = func(*args, df=df, verbose=False)
+            fit_threaded = func(*args, df=df, verbose=False, fft_workers=2)
+            assert set(fit_threaded.keys()) == set(fit.keys())
+            for key in fit:
+                np.testing.assert_allclose(fit_threaded[key], fit[key], rtol=1e-12)
+
         gains = abscal.delay_slope_lincal(model, data, antpos, df=df, f0=freqs[0], assume_2D=True, time_avg=True, return_gains=True, gain_ants=ants)
         rephased_gains = {ant: gains[ant] / gains[ants[0]] * np.abs(gains[ants[0]]) for ant in ants}
         rephased_true_gains = {ant: true_gains[ant] / true_gains[ants[0]] * np.abs(true_gains[ants[0]]) for ant in ants}
@@ -230,6 +230,17 @@ class Test_Update_Cal(object):
                     # from flag_nchan_low and flag_nchan_high above with 1024 total channels
                     if j < 450 or j > 623:
                         assert np.all(new_flags[k][i, j])
+
+        # test partial load with prefetching
+        ac.apply_cal(uvh5, outname_uvh5, new_cal, old_calibration=calout, gain_convention='divide',
+                     flag_nchan_low=450, flag_nchan_high=400, flags_npz=flags_npz, nbl_per_load=1, prefetch=2,
+                     filetype_in='uvh5', filetype_out='uvh5', clobber=True, vis_units='Jy')
+        hd = io.HERAData(outname_uvh5, filetype='uvh5')
+        prefetch_data, prefetch_flags, _ = hd.read()
+        assert hd.vis_units == 'Jy'
+        for k in new_data.keys():
+            np.testing.assert_array_equal(prefetch_data[k], new_data[k])
+            np.testing.assert_array_equal(prefetch_flags[k], new_flags[k])
         os.remove(outname_uvh5)
 
         # test errors
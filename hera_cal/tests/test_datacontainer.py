@@ -421,3 +421,89 @@ class TestDataContainerWithRealData(object):
                 assert np.all(dc.times_by_bl[0, 1] == new_times)
                 assert np.all(dc.lsts == (np.arange(10) * 2 * np.pi / 10)[new_times])
                 assert np.all(dc.lsts_by_bl[0, 1] == (np.arange(10) * 2 * np.pi / 10)[new_times])
+
+
+class TestArrayContainer(object):
+    def setup_method(self):
+        self.keys = [(ant, pol) for ant in [3, 1, 2] for pol in ['Jnn', 'Jee']]
+        self.ac = datacontainer.ArrayContainer(self.keys, 4, 5, dtype=np.complex64, fill_value=1)
+
+    def test_init(self):
+        assert self.ac.array.shape == (3, 5, 4, 2)
+        assert self.ac.names == [(1,), (2,), (3,)]
+        assert self.ac.pols == ['Jee', 'Jnn']
+        assert np.all(self.ac.array == 1)
+        assert len(self.ac) == 6
+        assert self.ac.keys() == self.keys
+        assert list(iter(self.ac)) == self.keys
+        assert (1, 'Jee') in self.ac
+        assert (4, 'Jee') not in self.ac
+        assert self.ac.get((4, 'Jee')) is None
+
+    def test_views(self):
+        # modifying a value modifies the array, and vice versa
+        self.ac[(2, 'Jnn')][1, :] = 2j
+        assert np.all(self.ac.array[1, :, 1, 1] == 2j)
+        assert np.sum(self.ac.array == 2j) == 5
+        self.ac.array[0, 3, :, 0] = 3
+        assert np.all(self.ac[(1, 'Jee')][:, 3] == 3)
+        for k, v in self.ac.items():
+            assert v.shape == (4, 5)
+            assert np.shares_memory(v, self.ac.array)
+        assert len(self.ac.values()) == 6
+
+        # setting values copies them into the array
+        self.ac[(3, 'Jee')] = np.full((4, 5), 4j)
+        assert np.all(self.ac.array[2, :, :, 0] == 4j)
+        assert np.all(self.ac.array[2, :, :, 1] == 1)
+        with pytest.raises(KeyError):
+            self.ac[(4, 'Jee')] = np.ones((4, 5))
+
+    def test_set_chunk(self):
+        # contiguous and non-contiguous times give the same result
+        for tinds in [[1, 2], [1, 3]]:
+            ac = datacontainer.ArrayContainer(self.keys, 4, 5, dtype=np.complex64, fill_value=1)
+            chunk = {k: np.arange(6).reshape(2, 3) + 10 * n for n, k in enumerate(self.keys[:4])}
+            ac.set_chunk(chunk, tinds, slice(1, 4))
+            other_tinds = [t for t in range(4) if t not in tinds]
+            for n, k in enumerate(self.keys[:4]):
+                np.testing.assert_array_equal(ac[k][tinds, 1:4], chunk[k])
+                assert np.all(ac[k][other_tinds, :] == 1)
+                assert np.all(ac[k][:, [0, 4]] == 1)
+            for k in self.keys[4:]:
+                assert np.all(ac[k] == 1)
+
+        # chunks covering every name of a polarization are written in one assignment
+        chunk = {(ant, 'Jee'): np.full((4, 5), ant) for ant in [1, 2, 3]}
+        self.ac.set_chunk(chunk, np.arange(4))
+        for ant in [1, 2, 3]:
+            assert np.all(self.ac[(ant, 'Jee')] == ant)
+            assert np.all(self.ac[(ant, 'Jnn')] == 1)
+
+    def test_memmap(self, tmpdir):
+        filename = os.path.join(str(tmpdir), 'test.npy')
+        ac = datacontainer.ArrayContainer(self.keys, 4, 5, dtype=np.complex64, fill_value=1, filename=filename)
+        ac[(1, 'Jee')] = 2
+        ac.array.flush()
+        np.testing.assert_array_equal(np.load(filename), ac.array)
+        # a new container memory-mapped to the same file replaces it, leaving the first one intact
+        ac2 = datacontainer.ArrayContainer(self.keys, 4, 5, dtype=np.complex64, fill_value=3, filename=filename)
+        assert np.all(ac[(1, 'Jee')] == 2)
+        assert np.all(ac[(2, 'Jee')] == 1)
+        assert np.all(ac2.array == 3)
+
+    def test_select_array(self):
+        assert self.ac.select_array([1, 2, 3], ['Jee', 'Jnn']) is self.ac.array
+        self.ac[(3, 'Jnn')] = 5
+        sel = self.ac.select_array([3, 1], ['Jnn'])
+        assert sel.shape == (2, 5, 4, 1)
+        assert np.all(sel[0] == 5)
+        assert np.all(sel[1] == 1)
+
+    def test_datacontainer_of_views(self):
+        ac = datacontainer.ArrayContainer([(0, 1, 'ee'), (1, 2, 'ee'), (0, 1, 'nn')], 4, 5, fill_value=0)
+        assert ac.names == [(0, 1), (1, 2)]
+        dc = datacontainer.DataContainer(ac)
+        dc[(1, 2, 'ee')][:] = 1j
+        assert np.all(ac[(1, 2, 'ee')] == 1j)
+        assert np.all(dc[(2, 1, 'ee')] == -1j)
@@ -102,6 +102,13 @@ class Test_DelayFilter(object):
         np.testing.assert_almost_equal(d[(53, 54, 'ee')], dfil.clean_resid[(53, 54, 'ee')], decimal=5)
         np.testing.assert_array_equal(f[(53, 54, 'ee')], dfil.flags[(53, 54, 'ee')])
 
+        # test prefetching the next baselines while filtering
+        prefetch_outfilename = os.path.join(tmp_path, 'temp_prefetch.h5')
+        df.load_delay_filter_and_write(uvh5, res_outfilename=prefetch_outfilename, tol=1e-4, clobber=True, Nbls_per_load=1, prefetch=2)
+        d_pf, f_pf, n_pf = io.HERAData(prefetch_outfilename).read(bls=[(53, 54, 'ee')])
+        np.testing.assert_array_equal(d_pf[(53, 54, 'ee')], d[(53, 54, 'ee')])
+        np.testing.assert_array_equal(f_pf[(53, 54, 'ee')], f[(53, 54, 'ee')])
+
         # test loading and writing all baselines at once.
         uvh5 = os.path.join(DATA_PATH, "test_input/zen.2458101.46106.xx.HH.OCR_53x_54x_only.uvh5")
         outfilename = os.path.join(tmp_path, 'temp.h5')
@@ -16,10 +16,12 @@ from pyuvdata import UVCal, UVData, UVFlag
 from pyuvdata.utils import parse_polstr, parse_jpolstr
 import glob
 import sys
+import h5py
+from concurrent.futures import ProcessPoolExecutor
 
 from .. import io
 from ..io import HERACal, HERAData
-from ..datacontainer import DataContainer
+from ..datacontainer import DataContainer, ArrayContainer
 from ..utils import polnum2str, polstr2num, jnum2str, jstr2num
 from ..data import DATA_PATH
 from hera_qm.data import DATA_PATH as QM_DATA_PATH
@@ -340,6 +342,81 @@ class Test_HERAData(object):
                 assert np.all(dc.lsts_by_bl[k] == hd.lsts_by_bl[k])
                 assert np.all(dc.lsts_by_bl[k] == dc.lsts_by_bl[(k[1], k[0])])
 
+    def test_metadata_cache(self):
+        hd = HERAData(self.uvh5_1)
+        meta = hd.get_metadata_dict()
+        assert hd.get_metadata_dict()['times_by_bl'] is meta['times_by_bl']
+        assert hd.times_by_bl is meta['times_by_bl']
+
+        # reading the same axes reuses the cached metadata and blt slices
+        d, f, n = hd.read()
+        blt_slices = hd._blt_slices
+        assert hd.get_metadata_dict()['times_by_bl'] is meta['times_by_bl']
+        d2, f2, n2 = hd.read()
+        assert hd._blt_slices is blt_slices
+        for dc in [d, f, n, d2]:
+            assert dc.times_by_bl is not meta['times_by_bl']
+            assert not np.shares_memory(dc.freqs, meta['freqs'])
+            np.testing.assert_array_equal(dc.freqs, meta['freqs'])
+            for k in dc.times_by_bl:
+                assert not np.shares_memory(dc.times_by_bl[k], meta['times_by_bl'][k])
+
+        # with views, the metadata arrays are shared with the cache too
+        dv, fv, nv = hd.read(views=True)
+        for dc in [dv, fv, nv]:
+            assert dc.times_by_bl is not meta['times_by_bl']
+            assert dc.freqs is meta['freqs']
+            for k in dc.times_by_bl:
+                assert dc.times_by_bl[k] is meta['times_by_bl'][k]
+
+        # selecting or reading a different part of the data invalidates the cache
+        hd.select(times=hd.times[:10])
+        assert hd.get_metadata_dict()['times_by_bl'] is not meta['times_by_bl']
+        assert len(hd.get_metadata_dict()['times']) == 10
+        assert len(hd.get_metadata_dict()['freqs']) == len(meta['freqs'])
+        d, f, n = hd.read(bls=hd.bls[:2], frequencies=hd.freqs[:100])
+        assert set(d.keys()) == set(hd.bls[:2])
+        assert len(d.freqs) == 100
+        assert len(d.times) == len(meta['times'])
+        for bl in d:
+            np.testing.assert_array_equal(d[bl], d2[bl][:, :100])
+
+        # polarization lookups are memoized for any capitalization
+        bl = hd.bls[0]
+        np.testing.assert_array_equal(hd._get_slice(hd.data_array, bl[:2] + (bl[2].upper(),)), d[bl])
+        assert bl[2].upper() in hd._polstr_indices
+
+    def test_build_datacontainers_views(self):
+        hd = HERAData(self.uvh5_1)
+        d, f, n = hd.read()
+        dv, fv, nv = hd.read(views=True)
+        for bl in hd.bls:
+            np.testing.assert_array_equal(dv[bl], d[bl])
+            np.testing.assert_array_equal(fv[bl], f[bl])
+            np.testing.assert_array_equal(nv[bl], n[bl])
+            assert np.shares_memory(dv[bl], hd.data_array)
+            assert np.shares_memory(fv[bl], hd.flag_array)
+            assert np.shares_memory(nv[bl], hd.nsample_array)
+            assert not np.shares_memory(d[bl], hd.data_array)
+        assert dv.freqs is fv.freqs
+        assert dv.times_by_bl is not fv.times_by_bl
+        assert not np.shares_memory(d.freqs, f.freqs)
+
+        # modifying the views in place modifies the HERAData object, and update() still works
+        bl = [bl for bl in hd.bls if bl[0] != bl[1]][0]
+        dv[bl] *= 2
+        np.testing.assert_array_equal(hd.get_data(bl), 2 * d[bl])
+        hd.update(data=dv)
+        np.testing.assert_array_equal(hd.get_data(bl), 2 * d[bl])
+        dv[bl] = np.zeros_like(d[bl])
+        np.testing.assert_array_equal(hd.get_data(bl), 2 * d[bl])
+        hd.update(data=dv)
+        np.testing.assert_array_equal(hd.get_data(bl), 0)
+
+        # reversed baselines are still conjugated copies
+        rev_bl = (bl[1], bl[0], bl[2][::-1])
+        assert not np.shares_memory(hd._get_slice(hd.data_array, rev_bl, copy=False), hd.data_array)
+
     def test_write_read_filter_cache_scratch(self):
         # most of write_filter_cache_scratch and all of read_filter_cache_scratch are covered in
         # test_delay_filter.test_load_dayenu_filter_and_write()
@@ -591,6 +668,64 @@ class Test_HERAData(object):
         with pytest.raises(NotImplementedError):
             next(hd.iterate_over_times())
 
+    def test_iterate_prefetch(self, monkeypatch):
+        hd = HERAData(self.uvh5_1)
+        hd_pf = HERAData(self.uvh5_1)
+        for prefetch in [1, 3]:
+            for (d, f, n), (dp, fp, npf) in zip(hd.iterate_over_bls(Nbls=2), hd_pf.iterate_over_bls(Nbls=2, prefetch=prefetch)):
+                for dc, dcp in zip((d, f, n), (dp, fp, npf)):
+                    assert list(dc.keys()) == list(dcp.keys())
+                    for bl in dc:
+                        np.testing.assert_array_equal(dc[bl], dcp[bl])
+                # hd_pf holds the current chunk, as after a regular read
+                assert hd_pf.last_read_kwargs['bls'] == hd.last_read_kwargs['bls']
+                np.testing.assert_array_equal(hd_pf.data_array, hd.data_array)
+
+        for (d, f, n), (dp, fp, npf) in zip(hd.iterate_over_freqs(Nchans=300), hd_pf.iterate_over_freqs(Nchans=300, prefetch=2)):
+            np.testing.assert_array_equal(d.freqs, dp.freqs)
+            for bl in d:
+                np.testing.assert_array_equal(d[bl], dp[bl])
+
+        hd = HERAData([self.uvh5_1, self.uvh5_2])
+        hd_pf = HERAData([self.uvh5_1, self.uvh5_2])
+        for (d, f, n), (dp, fp, npf) in zip(hd.iterate_over_times(Nints=25), hd_pf.iterate_over_times(Nints=25, prefetch=2)):
+            np.testing.assert_array_equal(d.times, dp.times)
+            for bl in d:
+                np.testing.assert_array_equal(d[bl], dp[bl])
+
+        # partial writes carry on across prefetched chunks
+        hd = HERAData(self.uvh5_1)
+        for (d, f, n) in hd.iterate_over_bls(Nbls=2, prefetch=2):
+            for bl in d:
+                d[bl] *= 2.0
+            hd.partial_write('out.h5', data=d, clobber=True, inplace=True)
+        d_out, _, _ = HERAData('out.h5').read()
+        d_in, _, _ = HERAData(self.uvh5_1).read()
+        for bl in d_in:
+            np.testing.assert_array_almost_equal(d_out[bl], 2.0 * d_in[bl])
+        os.remove('out.h5')
+
+        # the file headers are only read once per iteration, however many chunks are prefetched
+        inits = []
+        init = HERAData.__init__
+
+        def counting_init(self, *args, **kwargs):
+            inits.append(args)
+            init(self, *args, **kwargs)
+        monkeypatch.setattr(HERAData, '__init__', counting_init)
+        assert len(list(hd.iterate_over_bls(Nbls=1, prefetch=2))) == len(hd.bls)
+        assert len(inits) == 1
+        monkeypatch.undo()
+
+        # stopping early cleans up the background thread
+        gen = hd.iterate_over_times(Nints=1, prefetch=4)
+        next(gen)
+        gen.close()
+
+        hd.filepaths = None
+        with pytest.raises(NotImplementedError):
+            next(hd.iterate_over_bls(prefetch=1))
+
     def test_uvflag_compatibility(self):
         # Test that UVFlag is able to successfully init from the HERAData object
         uv = UVData()
@@ -869,6 +1004,20 @@ class Test_Calibration_IO_Legacy(object):
         assert uvc.total_quality_array is not None
         if os.path.exists('ex.calfits'):
             os.remove('ex.calfits')
+        # test that gains stored in ArrayContainers give the same result
+        containers = [ArrayContainer(gains.keys(), Ntimes, Nfreqs, dtype=dtype) for dtype in [np.complex64, bool, np.float32]]
+        for container, d in zip(containers, [gains, flags, quality]):
+            for k in d:
+                container[k] = d[k]
+        uvc2 = io.write_cal("ex.calfits", containers[0], freqs, times, flags=containers[1], quality=containers[2],
+                            total_qual=total_qual, return_uvc=True, write_file=False)
+        for attr in ['gain_array', 'flag_array', 'quality_array', 'total_quality_array']:
+            np.testing.assert_array_equal(getattr(uvc, attr), getattr(uvc2, attr))
+        # arrays already in the UVCal dtype are used without copying
+        uvc3 = io.write_cal("ex.calfits", containers[0], freqs, times, flags=containers[1], return_uvc=True,
+                            write_file=False, zero_check=False)
+        assert np.shares_memory(uvc3.flag_array, containers[1].array)
+        np.testing.assert_array_equal(uvc3.gain_array, uvc2.gain_array)
         # test execution with different parameters
         uvc = io.write_cal("ex.calfits", gains, freqs, times, overwrite=True)
         if os.path.exists('ex.calfits'):
@@ -1026,6 +1175,17 @@ class Test_Meta_IO(object):
         for ant in antpos:
             assert np.all(antpos[ant] == antpos2[ant])
         assert history == history2
+        assert io.read_redcal_timing_meta(out_path) is None
+
+        # write timing metadata too
+        timing_meta = {'pols': np.array(["['ee']", "['nn']"]), 'omnical': np.array([1.5, 2.5]),
+                       'omni_iter_hist': {"['ee']": np.array([0, 3, 1])}, 'write_times': {'omnivis': 0.5}}
+        io.save_redcal_meta(out_path, fc_meta, omni_meta, freqs, times, lsts, antpos, history, timing_meta=timing_meta)
+        timing_meta2 = io.read_redcal_timing_meta(out_path)
+        assert list(timing_meta2['pols']) == list(timing_meta['pols'])
+        np.testing.assert_array_equal(timing_meta2['omnical'], timing_meta['omnical'])
+        np.testing.assert_array_equal(timing_meta2['omni_iter_hist']["['ee']"], timing_meta['omni_iter_hist']["['ee']"])
+        assert timing_meta2['write_times']['omnivis'] == .5
 
         os.remove(out_path)
 
@@ -1068,6 +1228,118 @@ def test_get_file_times():
     pytest.raises(ValueError, io.get_file_times, fp, filetype='foo')
 
 
+def test_FileTimeIndex():
+    filepaths = [os.path.join(DATA_PATH, 'zen.2458116.{}.xx.HH.XRS_downselected.uvh5'.format(jd)) for jd in ['61019', '61765']]
+    io.clear_file_times_cache()
+    index = io.FileTimeIndex(filepaths)
+    assert len(io._FILE_TIMES_CACHE) == 2
+    for indexed, direct in zip(index.get_file_times(), io.get_file_times(filepaths)):
+        np.testing.assert_array_equal(indexed, direct)
+
+    # returned arrays are copies, so they can be modified without affecting the cache
+    index.get_file_times()[2][0] += 1
+    index.lst_arrays[0] += 1
+    np.testing.assert_array_equal(io.FileTimeIndex(filepaths[0]).lst_arrays[0], io.get_file_times(filepaths[0])[2])
+    assert len(io._FILE_TIMES_CACHE) == 2
+
+    times = [io.get_file_times(f)[3] for f in filepaths]
+    lsts = [io.get_file_times(f)[2] for f in filepaths]
+    # time ranges
+    ints = index.integrations_in_time_range(times[0][1], times[1][0])
+    assert list(ints.keys()) == filepaths
+    np.testing.assert_array_equal(ints[filepaths[0]], np.arange(1, len(times[0])))
+    np.testing.assert_array_equal(ints[filepaths[1]], [0])
+    assert index.files_in_time_range(times[1][0], times[1][-1] + 1) == filepaths[1:]
+    assert index.files_in_time_range(times[0][0] - 1, times[0][0] - .5) == []
+
+    # lst ranges
+    ints = index.integrations_in_lst_range(lsts[0][0], lsts[0][-1])
+    assert list(ints.keys()) == filepaths[:1]
+    np.testing.assert_array_equal(ints[filepaths[0]], np.arange(len(lsts[0])))
+    assert index.files_in_lst_range(lsts[1][0], lsts[1][-1]) == filepaths[1:]
+    assert index.files_in_lst_range(lsts[0][-1], lsts[1][0]) == filepaths
+    assert index.files_in_lst_range(lsts[1][-1] + .1, lsts[1][-1] + .2) == []
+    assert index.files_in_lst_range(lsts[0][0] - 2 * np.pi, lsts[0][0] - 2 * np.pi) == filepaths[:1]
+
+    # exact time matches
+    found = index.find_times([times[1][0], times[0][-1], times[0][0], times[0][0] - 1])
+    assert list(found.keys()) == filepaths
+    assert found[filepaths[0]] == [times[0][-1], times[0][0]]
+    assert found[filepaths[1]] == [times[1][0]]
+
+    io.clear_file_times_cache()
+    assert len(io._FILE_TIMES_CACHE) == 0
+
+
+def test_get_uvh5_metadata(tmpdir):
+    tmpdir = str(tmpdir)
+    filepaths = []
+    for jd in ['61019', '61765']:
+        filepaths.append(os.path.join(tmpdir, 'zen.2458116.{}.xx.HH.XRS_downselected.uvh5'.format(jd)))
+        shutil.copy(os.path.join(DATA_PATH, os.path.basename(filepaths[-1])), filepaths[-1])
+    index_file = os.path.join(tmpdir, io.HEADER_INDEX_FILENAME)
+    expected = [HERAData(f).get_metadata_dict() for f in filepaths]
+
+    def assert_metas_equal(metas):
+        for meta, exp in zip(metas, expected):
+            assert meta['pols'] == exp['pols']
+            assert meta['bls'] == exp['bls']
+            assert list(meta['antpos'].keys()) == list(exp['antpos'].keys())
+            for ant in exp['antpos']:
+                np.testing.assert_array_equal(meta['antpos'][ant], exp['antpos'][ant])
+            for key in ['ants', 'freqs', 'times', 'lsts']:
+                np.testing.assert_array_equal(meta[key], exp[key])
+            for key in ['times_by_bl', 'lsts_by_bl']:
+                assert set(meta[key].keys()) == set(exp[key].keys())
+                for ap in exp[key]:
+                    np.testing.assert_array_equal(meta[key][ap], exp[key][ap])
+
+    try:
+        # parallel reads without an index
+        io.set_header_index(enabled=False, nprocs=2)
+        assert_metas_equal(io.get_uvh5_metadata(filepaths))
+        assert not os.path.exists(index_file)
+
+        # the index is written on the first scan and reused on the next
+        io.set_header_index(enabled=True, nprocs=2)
+        assert_metas_equal(io.get_uvh5_metadata(filepaths))
+        assert os.path.exists(index_file)
+        with h5py.File(index_file, 'r') as f:
+            assert set(f.keys()) == set([os.path.basename(fp) for fp in filepaths])
+        assert set(io._read_header_index(tmpdir, [os.path.basename(fp) for fp in filepaths]).keys()) == \
+            set([os.path.basename(fp) for fp in filepaths])
+        assert_metas_equal(io.get_uvh5_metadata(filepaths))
+
+        # entries for files that have changed are ignored and rewritten
+        os.utime(filepaths[0], ns=(0, 0))
+        assert list(io._read_header_index(tmpdir, [os.path.basename(filepaths[0])]).keys()) == []
+        assert_metas_equal(io.get_uvh5_metadata(filepaths))
+        assert list(io._read_header_index(tmpdir, [os.path.basename(filepaths[0])]).keys()) == [os.path.basename(filepaths[0])]
+
+        # concurrent updates, e.g. by separate jobs, each keep the other's entries
+        basenames = [os.path.basename(fp) for fp in filepaths]
+        os.remove(index_file)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            list(executor.map(io._update_header_index, [tmpdir] * 2, [{bn: exp} for bn, exp in zip(basenames, expected)]))
+        assert os.path.exists(index_file + '.lock')
+        assert set(io._read_header_index(tmpdir, basenames).keys()) == set(basenames)
+
+        # all users of the index give the same results as without it
+        hd = HERAData(filepaths)
+        for f, exp in zip(filepaths, expected):
+            np.testing.assert_array_equal(hd.times[f], exp['times'])
+            assert hd.bls[f] == exp['bls']
+        indexed_times = io.get_file_times(filepaths)
+        indexed_bls = io.baselines_from_filelist_position(filepaths[0], filepaths)
+        io.set_header_index(enabled=False, nprocs=1)
+        assert indexed_bls == io.baselines_from_filelist_position(filepaths[0], filepaths)
+        io.set_header_index(enabled=False, nprocs=1)
+        for indexed, direct in zip(indexed_times, io.get_file_times(filepaths)):
+            np.testing.assert_array_almost_equal(indexed, direct)
+    finally:
+        io.set_header_index()
+
+
 def test_baselines_from_filelist_position():
     filelist = [os.path.join(DATA_PATH, "test_input/zen.2458101.46106.xx.HH.OCR_53x_54x_only.first.uvh5"),
                 os.path.join(DATA_PATH, "test_input/zen.2458101.46106.xx.HH.OCR_53x_54x_only.second.uvh5")]
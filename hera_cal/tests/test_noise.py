@@ -61,6 +61,17 @@ class Test_Noise(object):
                 sigmasq3 = noise.predict_noise_variance_from_autos(k, data, nsamples=nsamples)
                 np.testing.assert_array_equal(sigmasq / 2.0, sigmasq3)
 
+                data32 = {bl: data[bl].astype(np.complex64) for bl in data.keys() if bl[0] == bl[1]}
+                sigmasq4 = noise.predict_noise_variance_from_autos(k, data32, df=(hd.freqs[1] - hd.freqs[0]),
+                                                                   dt=((times[1] - times[0]) * 24. * 3600.))
+                assert sigmasq4.dtype == np.float32
+                np.testing.assert_allclose(sigmasq4, sigmasq, rtol=1e-6)
+
+                # dt and df can also be arrays that broadcast against the data
+                dts = np.full((len(times), 1), (times[1] - times[0]) * 24. * 3600.)
+                sigmasq5 = noise.predict_noise_variance_from_autos(k, data, df=(hd.freqs[1] - hd.freqs[0]), dt=dts)
+                np.testing.assert_allclose(sigmasq5, sigmasq, rtol=1e-12)
+
     def test_per_antenna_noise_std(self):
         infile = os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5')
         hd = io.HERAData(infile)
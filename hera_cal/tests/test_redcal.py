@@ -9,12 +9,15 @@ import warnings
 import os
 import sys
 import shutil
+import pickle
+import json
+import linsolve
 from hera_sim.antpos import linear_array, hex_array
 from hera_sim.vis import sim_red_data
 from hera_sim.sigchain import gen_gains
 
 from .. import redcal as om
-from .. import io, abscal
+from .. import io, abscal, noise
 from ..utils import split_pol, conj_pol, split_bl
 from ..apply_cal import calibrate_in_place
 from ..data import DATA_PATH
@@ -23,6 +26,41 @@ from ..datacontainer import DataContainer
 np.random.seed(0)
 
 
+def pairwise_get_pos_reds(antpos, bl_error_tol=1.0, include_autos=False):
+    '''Reference implementation of redcal.get_pos_reds that assigns one antenna pair at a time.'''
+    keys = list(antpos.keys())
+    reds = {}
+    ap = {ant: np.pad(pos, (0, 3 - len(pos)), mode='constant') for ant, pos in antpos.items()}
+    array_is_flat = np.all(np.abs(np.array(list(ap.values()))[:, 2] - np.mean(list(ap.values()), axis=0)[2]) < bl_error_tol / 4.0)
+    epsilons = [[dx, dy, dz] for dx in (0, -1, 1) for dy in (0, -1, 1) for dz in ((0,) if array_is_flat else (0, -1, 1))]
+
+    def check_neighbors(delta):
+        for epsilon in epsilons:
+            newKey = (delta[0] + epsilon[0], delta[1] + epsilon[1], delta[2] + epsilon[2])
+            if newKey in reds:
+                return newKey
+
+    for i, ant1 in enumerate(keys):
+        for ant2 in keys[(i if include_autos else i + 1):]:
+            bl_pair = (ant1, ant2)
+            delta = tuple(np.round(1.0 * (np.array(ap[ant2]) - np.array(ap[ant1])) / bl_error_tol).astype(int))
+            new_key = check_neighbors(delta)
+            if new_key is None:
+                new_key = check_neighbors(tuple([-d for d in delta]))
+                if new_key is not None:
+                    bl_pair = (ant2, ant1)
+            if new_key is not None:
+                reds[new_key].append(bl_pair)
+            else:
+                if delta[0] <= 0 or (delta[0] == 0 and delta[1] <= 0) or (delta[0] == 0 and delta[1] == 0 and delta[2] <= 0):
+                    delta = tuple([-d for d in delta])
+                    bl_pair = (ant2, ant1)
+                reds[delta] = [bl_pair]
+    orderedDeltas = [delta for (length, delta) in sorted(zip([np.linalg.norm(delta) for delta in reds.keys()], reds.keys()))]
+    return [sorted(reds[delta]) if sorted(reds[delta])[0][0] == np.min(reds[delta])
+            else sorted([(bl[1], bl[0]) for bl in reds[delta]]) for delta in orderedDeltas]
+
+
 class TestMethods(object):
 
     def test_check_polLists_minV(self):
@@ -88,6 +126,87 @@ class TestMethods(object):
                3: np.array([1., 0., 0.])}
         assert len(om.get_pos_reds(pos, bl_error_tol=.1)) == 4
 
+    def test_get_pos_reds_matches_pairwise(self):
+        # grouping and ordering is identical to assigning each antenna pair in turn
+        rng = np.random.RandomState(21)
+        for pos_error in [0, .02, .2, .5]:
+            for bl_error_tol in [.5, 1.0, 5.0]:
+                pos = hex_array(5, sep=14.6, split_core=True, outriggers=1)
+                pos = {ant: p + pos_error * rng.randn(3) for ant, p in pos.items()}
+                for include_autos in [True, False]:
+                    assert om.get_pos_reds(pos, bl_error_tol=bl_error_tol, include_autos=include_autos) == \
+                        pairwise_get_pos_reds(pos, bl_error_tol=bl_error_tol, include_autos=include_autos)
+        for n in range(20):
+            pos = {ant: rng.randint(-5, 5, size=rng.randint(1, 4)) for ant in rng.permutation(100)[:12]}
+            for bl_error_tol in [.1, .5, 1.0, 2.0]:
+                assert om.get_pos_reds(pos, bl_error_tol=bl_error_tol, include_autos=(n % 2 == 0)) == \
+                    pairwise_get_pos_reds(pos, bl_error_tol=bl_error_tol, include_autos=(n % 2 == 0))
+
+        # the first zero-length baseline creates its group reversed, but later ones are not reversed
+        pos = {2: np.array([0, 0, 0]), 0: np.array([0, 10, 0]), 1: np.array([0, 0, 0])}
+        assert om.get_pos_reds(pos, include_autos=True) == [[(0, 0), (1, 1), (2, 1), (2, 2)], [(0, 1), (0, 2)]]
+        assert om.get_pos_reds({0: np.array([0, 0, 0])}) == []
+
+    def test_reds_cache(self, tmpdir):
+        antpos = hex_array(3, split_core=False, outriggers=0)
+        om.clear_reds_cache()
+        om.set_reds_cache(maxsize=2, cache_dir=str(tmpdir))
+        try:
+            reds = om.get_reds(antpos, pols=['nn', 'ee'], pol_mode='2pol')
+            assert len(tmpdir.listdir()) == 1
+            assert om.get_reds(antpos, pols=['nn', 'ee'], pol_mode='2pol') == reds
+            assert len(tmpdir.listdir()) == 1
+
+            # modifying the result does not modify the cache
+            reds[0].append((100, 101, 'nn'))
+            del reds[1]
+            assert om.get_reds(antpos, pols=['nn', 'ee'], pol_mode='2pol') != reds
+            antpos_ideal = om.reds_to_antpos(reds[2:])
+            antpos_ideal[0] += 1
+            assert not np.all(om.reds_to_antpos(reds[2:])[0] == antpos_ideal[0])
+
+            # sets of antennas are equivalent to lists of antennas, but other arguments are not
+            reds = om.get_reds(antpos, pols=['nn', 'ee'], pol_mode='2pol')
+            assert om.filter_reds(reds, ex_ants={1, 2, 3}) == om.filter_reds(reds, ex_ants=[3, 1, 2])
+            assert om.filter_reds(reds, ex_ants=[3, 1, 2]) != om.filter_reds(reds, ex_ants=[3, 1, 2], pols=['nn'])
+            assert om.get_reds(antpos, bl_error_tol=20.0) != om.get_reds(antpos)
+            # unpicklable arguments skip the cache
+            assert om.filter_reds(reds, ants={0: 0, 1: 0}.keys()) == om.filter_reds(reds, ants=[0, 1])
+
+            # results are read from the on-disk cache when not in memory
+            om.clear_reds_cache()
+            cache_files = [str(f) for f in tmpdir.listdir()]
+            for cache_file in cache_files:
+                with open(cache_file, 'wb') as f:
+                    pickle.dump([[(0, 1, 'nn')]], f)
+            assert om.get_reds(antpos, pols=['nn', 'ee'], pol_mode='2pol') == [[(0, 1, 'nn')]]
+
+            # truncated or corrupt cache files are recomputed and overwritten
+            om.clear_reds_cache()
+            for cache_file, contents in zip(cache_files, [b'', b'not a pickle']):
+                with open(cache_file, 'wb') as f:
+                    f.write(contents)
+            assert om.get_reds(antpos, pols=['nn', 'ee'], pol_mode='2pol') == reds
+            om.clear_reds_cache()
+            assert om.get_reds(antpos, pols=['nn', 'ee'], pol_mode='2pol') == reds
+
+            # the cache directory can be overridden temporarily, e.g. by redcal_run
+            with pytest.raises(ValueError):
+                with om._reds_cache_dir(str(tmpdir) + '.other'):
+                    assert om._REDS_CACHE_SETTINGS['cache_dir'] == str(tmpdir) + '.other'
+                    raise ValueError
+            assert om._REDS_CACHE_SETTINGS['cache_dir'] == str(tmpdir)
+            with om._reds_cache_dir(None):
+                assert om._REDS_CACHE_SETTINGS['cache_dir'] == str(tmpdir)
+
+            # no caching at all
+            om.set_reds_cache(maxsize=0)
+            assert om.get_reds(antpos, pols=['nn', 'ee'], pol_mode='2pol') == reds
+            assert len(tmpdir.listdir()) == len(cache_files)
+        finally:
+            om.set_reds_cache()
+            om.clear_reds_cache()
+
     def test_filter_reds(self):
         antpos = linear_array(7)
         reds = om.get_reds(antpos, pols=['xx'], pol_mode='1pol')
@@ -270,6 +389,26 @@ class TestMethods(object):
         for ant in meta['polarity_flips']:
             assert np.all([m is None for m in meta['polarity_flips'][ant]])
 
+        # test many flipped antennas, such that the odd group is the majority for many unique baselines
+        antpos = hex_array(5, split_core=False, outriggers=0)
+        big_reds = om.get_reds(antpos, pols=['ee'], pol_mode='1pol')
+        flipped = [(ant, 'Jee') for ant in np.random.RandomState(1).choice(sorted(antpos), 20, replace=False)]
+        polarity_groups = {}
+        for red in big_reds:
+            odd = [bl for bl in red if (split_bl(bl)[0] in flipped) != (split_bl(bl)[1] in flipped)]
+            even = [bl for bl in red if bl not in odd]
+            polarity_groups[red[0]] = (odd, even) if len(odd) > len(even) else (even, odd)
+        ants = set([ant for red in big_reds for bl in red for ant in split_bl(bl)])
+        is_flipped, even_vs_odd_IDs = om._solve_polarity_flips(polarity_groups, ants)
+        assert sorted([ant for ant in ants if is_flipped[ant]]) == sorted(flipped)
+        for key, (grp1, grp2) in polarity_groups.items():
+            even = {'even/odd': grp1, 'odd/even': grp2}[even_vs_odd_IDs[key]]
+            assert np.all([(split_bl(bl)[0] in flipped) == (split_bl(bl)[1] in flipped) for bl in even])
+        # an inconsistent baseline means no solution
+        key = list(polarity_groups.keys())[10]
+        polarity_groups[key] = (polarity_groups[key][0][1:], polarity_groups[key][1] + polarity_groups[key][0][:1])
+        assert om._solve_polarity_flips(polarity_groups, ants) == (None, None)
+
         # test errors
         with pytest.raises(ValueError):
             om._build_polarity_baseline_groups(data, reds, edge_cut=100)
@@ -401,6 +540,12 @@ class TestRedundantCalibrator(object):
         meta, g_fc = rc.firstcal(d, freqs, conv_crit=0)
         np.testing.assert_array_almost_equal(np.linalg.norm([g_fc[ant] - gains[ant] for ant in g_fc]), 0, decimal=3)
 
+        # multi-threaded FFTs give the same delays
+        meta_threaded, g_fc_threaded = rc.firstcal(d, freqs, conv_crit=0, fft_workers=2)
+        for ant in g_fc:
+            np.testing.assert_allclose(meta_threaded['dlys'][ant], meta['dlys'][ant], rtol=1e-12)
+            np.testing.assert_allclose(g_fc_threaded[ant], g_fc[ant], rtol=1e-10)
+
         # test firstcal with only phases (no delays)
         gains, true_vis, d = sim_red_data(reds, gain_scatter=0, shape=(2, len(freqs)))
         fc_delays = {ant: [[0 * np.random.randn()]] for ant in gains.keys()}  # in s
@@ -415,6 +560,48 @@ class TestRedundantCalibrator(object):
         meta, g_fc = rc.firstcal(d, freqs, conv_crit=0)
         np.testing.assert_array_almost_equal(np.linalg.norm([g_fc[ant] - gains[ant] for ant in g_fc]), 0, decimal=10)  # much higher precision
 
+    def test_firstcal_pairing(self):
+        rng = np.random.RandomState(7)
+        antpos = hex_array(3, split_core=False, outriggers=0)
+        reds = om.get_reds(antpos, pols=['xx'], pol_mode='1pol')
+        rc = om.RedundantCalibrator(reds)
+        freqs = np.linspace(1e8, 2e8, 256)
+        ants = sorted(set([ant for red in reds for bl in red for ant in split_bl(bl)]))
+        dlys = {ant: 50e-9 * rng.randn() for ant in ants}
+        gains = {ant: np.exp(2j * np.pi * freqs * dlys[ant])[None, :] for ant in ants}
+        d = {}
+        for red in reds:
+            vis = rng.randn(2, len(freqs)) + 1j * rng.randn(2, len(freqs))
+            for bl in red:
+                noise = .1 * (rng.randn(2, len(freqs)) + 1j * rng.randn(2, len(freqs)))
+                d[bl] = vis * gains[(bl[0], 'Jxx')] * np.conj(gains[(bl[1], 'Jxx')]) + noise
+
+        # check number of pairs and their membership in the same redundant group
+        red_index = {bl: i for i, red in enumerate(reds) for bl in red}
+        n_all = np.sum([len(red) * (len(red) - 1) // 2 for red in reds])
+        assert len(rc._firstcal_pairs('all')) == n_all
+        assert len(rc._firstcal_pairs('chain')) == np.sum([len(red) - 1 for red in reds])
+        for pairing in ['chain', 1, 3]:
+            pairs = rc._firstcal_pairs(pairing)
+            assert len(pairs) == len(set(pairs)) < n_all
+            assert set(rc._firstcal_pairs('chain')).issubset(pairs)
+            for bl1, bl2 in pairs:
+                assert red_index[bl1] == red_index[bl2]
+                assert reds[red_index[bl1]].index(bl1) < reds[red_index[bl1]].index(bl2)
+        assert rc._firstcal_pairs(2) == rc._firstcal_pairs(2)
+        assert rc._firstcal_pairs(100) == rc._firstcal_pairs('all')
+        for pairing in ['some', 0, 1.5, True]:
+            with pytest.raises(ValueError):
+                rc._firstcal_pairs(pairing)
+
+        # delays found with fewer pairs are consistent with those found with all pairs
+        meta_all, _ = rc.firstcal(deepcopy(d), freqs)
+        for pairing in ['chain', 2]:
+            meta, g_fc = rc.firstcal(deepcopy(d), freqs, pairing=pairing)
+            assert set(g_fc.keys()) == set(ants)
+            for ant in ants:
+                np.testing.assert_allclose(meta['dlys'][ant], meta_all['dlys'][ant], rtol=0, atol=1e-10)  # 0.1 ns
+
     def test_logcal(self):
         NANTS = 18
         antpos = linear_array(NANTS)
@@ -445,6 +632,61 @@ class TestRedundantCalibrator(object):
         for ant in gains.keys():
             np.testing.assert_array_equal(sol[ant], 1.0)
 
+    def test_solver_cache(self):
+        NANTS = 18
+        antpos = linear_array(NANTS)
+        reds = om.get_reds(antpos, pols=['xx'], pol_mode='1pol')
+        info = om.RedundantCalibrator(reds)
+        gains, true_vis, d = sim_red_data(reds, gain_scatter=.05)
+        om.RedundantCalibrator.clear_solver_cache()
+
+        # logcal with a factorized system matches linsolve, and the factorization is reused
+        d_ls, w_ls = info._solver_data(d, detrend_phs=True)
+        sol_ls = linsolve.LogProductSolver(d_ls, w_ls).solve()
+        meta, sol = info.logcal(d)
+        assert len(om.RedundantCalibrator._solver_cache) == 1
+        for k, v in info._cached_solve(linsolve.LogProductSolver, d_ls, wgts=w_ls).items():
+            np.testing.assert_allclose(v, sol_ls[k], rtol=1e-10)
+        info2 = om.RedundantCalibrator(reds)
+        meta, sol2 = info2.logcal({k: v[::2] for k, v in d.items()})
+        assert len(om.RedundantCalibrator._solver_cache) == 1
+        for k in sol:
+            np.testing.assert_allclose(sol2[k], sol[k][::2], rtol=1e-10)
+
+        # different scalar weights make a new factorization, but per-sample weights are not cached
+        w = {k: 2. for k in d}
+        w[reds[0][0]] = .5
+        d_ls, w_ls = info._solver_data(d, wgts=w, detrend_phs=True)
+        sol_ls = linsolve.LogProductSolver(d_ls, w_ls).solve()
+        for k, v in info._cached_solve(linsolve.LogProductSolver, d_ls, wgts=w_ls).items():
+            np.testing.assert_allclose(v, sol_ls[k], rtol=1e-10)
+        assert len(om.RedundantCalibrator._solver_cache) == 2
+        meta, sol3 = info.logcal(d, wgts={k: np.ones(v.shape) for k, v in d.items()})
+        assert len(om.RedundantCalibrator._solver_cache) == 2
+        for k in sol:
+            np.testing.assert_allclose(sol3[k], sol[k], rtol=1e-8)
+
+        # modes other than the cached pseudoinverse are solved by linsolve
+        sol_ls = linsolve.LogProductSolver(d_ls, w_ls).solve(mode='lsqr')
+        for k, v in info._cached_solve(linsolve.LogProductSolver, d_ls, wgts=w_ls, mode='lsqr').items():
+            np.testing.assert_allclose(v, sol_ls[k], rtol=1e-10)
+        assert len(om.RedundantCalibrator._solver_cache) == 2
+
+        # the cache is bounded by memory, but always keeps the newest entry
+        nbytes = sum(om.RedundantCalibrator._solver_cache_nbytes.values())
+        assert nbytes == sum([v.nbytes for v in om.RedundantCalibrator._solver_cache.values()])
+        om.RedundantCalibrator.solver_cache_max_bytes = nbytes
+        info.logcal(d, wgts={k: 3. for k in d})
+        assert len(om.RedundantCalibrator._solver_cache) == 2
+        assert sum(om.RedundantCalibrator._solver_cache_nbytes.values()) <= nbytes
+        om.RedundantCalibrator.solver_cache_max_bytes = 1
+        info.logcal(d, wgts={k: 4. for k in d})
+        assert len(om.RedundantCalibrator._solver_cache) == 1
+        om.RedundantCalibrator.solver_cache_max_bytes = 2**30
+        om.RedundantCalibrator.clear_solver_cache()
+        assert len(om.RedundantCalibrator._solver_cache) == 0
+        assert len(om.RedundantCalibrator._solver_cache_nbytes) == 0
+
     def test_omnical(self):
         NANTS = 18
         antpos = linear_array(NANTS)
@@ -508,6 +750,87 @@ class TestRedundantCalibrator(object):
                 np.testing.assert_almost_equal(np.abs(d_bl), np.abs(mdl), decimal=10)
                 np.testing.assert_almost_equal(np.angle(d_bl * mdl.conj()), 0, decimal=10)
 
+    def test_omnical_engines(self):
+        NANTS = 18
+        antpos = linear_array(NANTS)
+        reds = om.get_reds(antpos, pols=['xx'], pol_mode='1pol')
+        info = om.RedundantCalibrator(reds)
+        gains, true_vis, d = sim_red_data(reds, gain_scatter=.0099999)
+        d = {k: v + 1e-3 * np.random.randn(*v.shape) for k, v in d.items()}
+        w = {k: np.random.rand(*v.shape) for k, v in d.items()}
+        sol0 = dict([(k, np.ones_like(v)) for k, v in gains.items()])
+        sol0.update(info.compute_ubls(d, sol0))
+        meta_ls, sol_ls = info.omnical(d, deepcopy(sol0), wgts=w, gain=.4, maxiter=10, check_after=1, check_every=2, engine='linsolve')
+        meta_ar, sol_ar = info.omnical(d, deepcopy(sol0), wgts=w, gain=.4, maxiter=10, check_after=1, check_every=2, engine='array')
+        assert set(sol_ls.keys()) == set(sol_ar.keys())
+        for k in sol_ls:
+            assert sol_ar[k].dtype == sol_ls[k].dtype
+            np.testing.assert_allclose(sol_ar[k], sol_ls[k], rtol=1e-12, atol=1e-12)
+        for k in meta_ls:
+            np.testing.assert_allclose(meta_ar[k], meta_ls[k], rtol=1e-10, atol=1e-14)
+
+        with pytest.raises(ValueError):
+            info.omnical(d, sol0, engine='not_an_engine')
+
+    def test_omnical_freq_chunks(self):
+        NANTS = 18
+        antpos = linear_array(NANTS)
+        reds = om.get_reds(antpos, pols=['xx'], pol_mode='1pol')
+        info = om.RedundantCalibrator(reds)
+        rng = np.random.RandomState(21)
+        gains, true_vis, d = sim_red_data(reds, shape=(3, 20), gain_scatter=.0099999)
+        d = {k: v + 1e-3 * rng.randn(*v.shape) for k, v in d.items()}
+        w = {k: (rng.rand(*v.shape) if k[0] % 2 else 1.) for k, v in d.items()}  # mix of arrays and scalars
+        sol0 = dict([(k, np.ones_like(v)) for k, v in gains.items()])
+        sol0.update(info.compute_ubls(d, sol0))
+        for engine in ['array', 'linsolve']:
+            meta, sol = info.omnical(d, deepcopy(sol0), wgts=w, gain=.4, maxiter=20, check_after=1, check_every=2, engine=engine)
+            for freq_chunks, nthreads in [(3, 1), (None, 2), (4, 3), (100, 1)]:
+                meta_c, sol_c = info.omnical(d, deepcopy(sol0), wgts=w, gain=.4, maxiter=20, check_after=1, check_every=2,
+                                             engine=engine, freq_chunks=freq_chunks, nthreads=nthreads)
+                assert set(sol_c.keys()) == set(sol.keys())
+                for k in sol:
+                    assert sol_c[k].shape == sol[k].shape
+                    assert sol_c[k].dtype == sol[k].dtype
+                    np.testing.assert_allclose(sol_c[k], sol[k], rtol=1e-12, atol=1e-12)
+                for k in meta:
+                    assert meta_c[k].shape == meta[k].shape
+                    np.testing.assert_allclose(meta_c[k], meta[k], rtol=1e-10, atol=1e-14)
+
+    def test_omnical_accel(self):
+        antpos = hex_array(3, split_core=False, outriggers=0)
+        reds = om.get_reds(antpos, pols=['xx'], pol_mode='1pol')
+        info = om.RedundantCalibrator(reds)
+        rng = np.random.RandomState(14)
+        gains, true_vis, d = sim_red_data(reds, shape=(2, 8), gain_scatter=.1)
+        d = {k: v + 3e-2 * (rng.randn(*v.shape) + 1j * rng.randn(*v.shape)) for k, v in d.items()}
+        w = {k: rng.rand(*v.shape) + .5 for k, v in d.items()}
+        meta, sol0 = info.logcal(d, wgts=w)
+        kwargs = {'wgts': w, 'gain': .4, 'conv_crit': 1e-10, 'maxiter': 500, 'check_after': 1, 'check_every': 4}
+        meta, sol = info.omnical(d, deepcopy(sol0), **kwargs)
+        meta_ar, sol_ar = info.omnical(d, deepcopy(sol0), accel='anderson', **kwargs)
+        meta_ls, sol_ls = info.omnical(d, deepcopy(sol0), accel='anderson', engine='linsolve', **kwargs)
+
+        # same minimum chi^2 in many fewer iterations
+        assert np.mean(meta_ar['iter']) < .7 * np.mean(meta['iter'])
+        np.testing.assert_allclose(meta_ar['chisq'], meta['chisq'], rtol=1e-6)
+        for bls in reds:
+            for bl in bls:
+                mdl = sol[(bl[0], 'Jxx')] * sol[(bl[1], 'Jxx')].conj() * sol[bls[0]]
+                mdl_ar = sol_ar[(bl[0], 'Jxx')] * sol_ar[(bl[1], 'Jxx')].conj() * sol_ar[bls[0]]
+                np.testing.assert_allclose(mdl_ar, mdl, rtol=1e-4, atol=1e-4)
+
+        # engines agree
+        assert set(sol_ls.keys()) == set(sol_ar.keys())
+        for k in sol_ls:
+            np.testing.assert_allclose(sol_ar[k], sol_ls[k], rtol=1e-8, atol=1e-8)
+        np.testing.assert_array_equal(meta_ar['iter'], meta_ls['iter'])
+
+        with pytest.raises(ValueError):
+            info.omnical(d, sol0, accel='not_an_accel')
+        with pytest.raises(ValueError):
+            info.omnical(d, sol0, accel='not_an_accel', engine='linsolve')
+
     def test_lincal(self):
         NANTS = 18
         antpos = linear_array(NANTS)
@@ -618,6 +941,35 @@ class TestRedundantCalibrator(object):
         for k in dlys:
             np.testing.assert_almost_equal(dlys[k], 0, decimal=10)
 
+    def test_remove_degen_gains_amplitude(self):
+        rng = np.random.RandomState(3)
+        antpos = hex_array(3, split_core=False, outriggers=0)
+        reds = om.get_reds(antpos, pols=['xx', 'yy'], pol_mode='2pol')
+        rc = om.RedundantCalibrator(reds)
+        ants = sorted(set([ant for red in reds for bl in red for ant in split_bl(bl)]))
+        gains = {ant: 1 + .2 * rng.randn(2, 8) + .2j * rng.randn(2, 8) for ant in ants}
+        degen_gains = {ant: 1 + .2 * rng.randn(2, 8) + .2j * rng.randn(2, 8) for ant in ants}
+        om.RedundantCalibrator.clear_solver_cache()
+        new_gains = rc.remove_degen_gains(gains, degen_gains=degen_gains, mode='complex')
+        assert len(om.RedundantCalibrator._solver_cache) == 2  # one set of projectors per polarization
+
+        # mean of |g_i g_j| over pairs of different antennas is fixed to that of the degen_gains
+        for pol in ['Jxx', 'Jyy']:
+            def mean_pair_amp(g):
+                return np.mean([np.abs(g[k1] * g[k2]) for k1 in g for k2 in g
+                                if k1[1] == pol and k2[1] == pol and k1[0] != k2[0]], axis=0)
+            np.testing.assert_allclose(mean_pair_amp(new_gains), mean_pair_amp(degen_gains), rtol=1e-12)
+            pol_gains = np.abs([gains[ant] for ant in ants if ant[1] == pol])
+            np.testing.assert_allclose(om._mean_pairwise_product(pol_gains), mean_pair_amp(gains), rtol=1e-12)
+
+        # projectors are reused by a new calibrator with the same reds and antennas
+        rc2 = om.RedundantCalibrator(reds)
+        new_gains2 = rc2.remove_degen_gains(gains, degen_gains=degen_gains, mode='complex')
+        assert len(om.RedundantCalibrator._solver_cache) == 2
+        for ant in ants:
+            np.testing.assert_array_equal(new_gains2[ant], new_gains[ant])
+        om.RedundantCalibrator.clear_solver_cache()
+
     def test_lincal_hex_end_to_end_1pol_with_remove_degen_and_firstcal(self):
         antpos = hex_array(3, split_core=False, outriggers=0)
         reds = om.get_reds(antpos, pols=['xx'], pol_mode='1pol')
@@ -1050,6 +1402,20 @@ class TestRedundantCalibrator(object):
             if len(red) == 1:
                 np.testing.assert_almost_equal(chisq_per_bl[red[0]], 1e-10)
 
+    def test_predict_chisq_per_bl_cache(self):
+        reds = om.get_reds(linear_array(7))
+        om.RedundantCalibrator.clear_solver_cache()
+        om._predict_chisq_per_bl.cache_clear()
+        chisq_per_bl = om.predict_chisq_per_bl(reds)
+        # results are cached separately from the solvers, and callers get their own copy
+        assert len(om.RedundantCalibrator._solver_cache) == 0
+        assert om._predict_chisq_per_bl.cache_info().currsize == 1
+        chisq_per_bl[reds[0][0]] = -1
+        chisq_per_bl2 = om.predict_chisq_per_bl([list(red) for red in reds])
+        assert om._predict_chisq_per_bl.cache_info().hits == 1
+        assert chisq_per_bl2[reds[0][0]] != -1
+        assert set(chisq_per_bl2.keys()) == set(chisq_per_bl.keys())
+
     def test_predict_chisq_per_red(self):
         # This test shows that predicted chisq_per_red make sense, given the known constraints.
         # See test_predict_chisq_statistically to see that the answer actually works
@@ -1405,6 +1771,91 @@ class TestRunMethods(object):
             for val in rv['chisq'].values():
                 assert val.shape == (nTimes, nFreqs)
 
+    def test_redundantly_calibrate_warm_start(self):
+        np.random.seed(21)
+        antpos = hex_array(3, split_core=False, outriggers=0)
+        reds = om.get_reds(antpos, pols=['xx'])
+        freqs = np.linspace(100e6, 200e6, 64, endpoint=False)
+        times = np.linspace(0, 600. / 60 / 60 / 24, 10, endpoint=False)
+        df = np.median(np.diff(freqs))
+        dt = np.median(np.diff(times)) * 3600. * 24
+
+        # Simulate redundant data with noise
+        noise_var = .001
+        g, tv, d = sim_red_data(reds, shape=(len(times), len(freqs)), gain_scatter=.1)
+        n = DataContainer({bl: np.sqrt(noise_var / 2) * (np.random.randn(*vis.shape) + 1j * np.random.randn(*vis.shape)) for bl, vis in d.items()})
+        noisy_data = n + DataContainer(d)
+        for antnum in antpos.keys():
+            noisy_data[(antnum, antnum, 'xx')] = np.sqrt(noise_var * dt * df) * np.ones(d[reds[0][0]].shape, dtype=complex)
+        noisy_data.freqs = deepcopy(freqs)
+        noisy_data.times_by_bl = {bl[0:2]: deepcopy(times) for bl in noisy_data.keys()}
+
+        # re-run after excluding an antenna, both from scratch and seeded with the first solution
+        cal = om.redundantly_calibrate(noisy_data, reds)
+        filtered_reds = om.filter_reds(reds, ex_ants=[6])
+        cold = om.redundantly_calibrate(noisy_data, filtered_reds)
+        warm = om.redundantly_calibrate(noisy_data, filtered_reds, prior_cal=cal)
+
+        # firstcal is reused for the remaining antennas
+        assert set(warm['g_firstcal'].keys()) == set(cold['g_firstcal'].keys())
+        assert (6, 'Jxx') not in warm['g_omnical']
+        for ant in warm['g_firstcal']:
+            np.testing.assert_array_equal(warm['g_firstcal'][ant], cal['g_firstcal'][ant])
+            np.testing.assert_array_equal(warm['fc_meta']['dlys'][ant], cal['fc_meta']['dlys'][ant])
+
+        # omnical converges to the same chi^2 and the same solution up to the firstcal degeneracies
+        assert np.sum(warm['omni_meta']['iter']) < np.sum(cold['omni_meta']['iter'])
+        np.testing.assert_allclose(warm['chisq']['Jxx'], cold['chisq']['Jxx'], rtol=1e-6)
+        for ant in cold['g_omnical']:
+            np.testing.assert_allclose(warm['g_omnical'][ant], cold['g_omnical'][ant], atol=1e-2)
+
+        # a prior_cal without solutions for some of the antennas falls back to a cold start
+        rerun = om.redundantly_calibrate(noisy_data, reds, prior_cal=warm)
+        assert rerun['timing_meta']['firstcal'] > 0
+        for ant in cal['g_firstcal']:
+            np.testing.assert_array_equal(rerun['g_firstcal'][ant], cal['g_firstcal'][ant])
+
+    def test_redundantly_calibrate_single_precision(self):
+        np.random.seed(21)
+        antpos = hex_array(3, split_core=False, outriggers=0)
+        reds = om.get_reds(antpos, pols=['xx'])
+        freqs = np.linspace(100e6, 200e6, 64, endpoint=False)
+        times = np.linspace(0, 600. / 60 / 60 / 24, 10, endpoint=False)
+        df = np.median(np.diff(freqs))
+        dt = np.median(np.diff(times)) * 3600. * 24
+
+        noise_var = .001
+        g, tv, d = sim_red_data(reds, shape=(len(times), len(freqs)), gain_scatter=.1)
+        n = DataContainer({bl: np.sqrt(noise_var / 2) * (np.random.randn(*vis.shape) + 1j * np.random.randn(*vis.shape)) for bl, vis in d.items()})
+        noisy_data = n + DataContainer(d)
+        for antnum in antpos.keys():
+            noisy_data[(antnum, antnum, 'xx')] = np.sqrt(noise_var * dt * df) * np.ones(d[reds[0][0]].shape, dtype=complex)
+        noisy_data.freqs = deepcopy(freqs)
+        noisy_data.times_by_bl = {bl[0:2]: deepcopy(times) for bl in noisy_data.keys()}
+
+        double = om.redundantly_calibrate(noisy_data, reds)
+        single = om.redundantly_calibrate(noisy_data, reds, precision='single')
+        assert noisy_data[reds[0][0]].dtype == np.complex128  # input data is not modified
+
+        # every output is single precision
+        for ant in single['g_omnical']:
+            assert single['g_firstcal'][ant].dtype == np.complex64
+            assert single['g_omnical'][ant].dtype == np.complex64
+            assert single['chisq_per_ant'][ant].dtype == np.float32
+        for bl in single['v_omnical']:
+            assert single['v_omnical'][bl].dtype == np.complex64
+        assert single['chisq']['Jxx'].dtype == np.float32
+
+        # the loss of accuracy is small compared to the noise
+        for ant in double['g_firstcal']:
+            np.testing.assert_allclose(single['fc_meta']['dlys'][ant], double['fc_meta']['dlys'][ant], atol=1e-12)
+        for ant in double['g_omnical']:
+            np.testing.assert_allclose(single['g_omnical'][ant], double['g_omnical'][ant], atol=1e-4)
+        for bl in double['v_omnical']:
+            np.testing.assert_allclose(single['v_omnical'][bl], double['v_omnical'][bl], atol=1e-4)
+        np.testing.assert_allclose(single['chisq']['Jxx'], double['chisq']['Jxx'], rtol=1e-3)
+        pytest.raises(ValueError, om.redundantly_calibrate, noisy_data, reds, precision='half')
+
     def test_expand_omni_sol(self):
         # noise free test of dead antenna resurrection
         ex_ants = [0, 13, 2, 18]
@@ -1440,6 +1891,74 @@ class TestRunMethods(object):
         for ant in cal['chisq_per_ant']:
             np.testing.assert_array_less(cal['chisq_per_ant'][ant], 1e-10)
 
+        # an excluded antenna with more baselines than np.broadcast can take at once (32) is also backsolved
+        antpos = hex_array(4, split_core=False, outriggers=0)
+        reds = om.get_reds(antpos, pols=['xx'])
+        g, tv, d = sim_red_data(reds, shape=(len(times), len(freqs)), gain_scatter=.01)
+        d = DataContainer(d)
+        nsamples = DataContainer({bl: np.ones_like(d[bl], dtype=float) for bl in d})
+        for antnum in antpos.keys():
+            d[(antnum, antnum, 'xx')] = np.ones((len(times), len(freqs)), dtype=complex)
+        d.freqs = deepcopy(freqs)
+        d.times_by_bl = {bl[0:2]: deepcopy(times) for bl in d.keys()}
+        assert len([bl for red in reds for bl in red if 0 in bl[:2]]) > 32
+        cal = om.redundantly_calibrate(d, om.filter_reds(reds, ex_ants=[0]))
+        om.expand_omni_sol(cal, reds, d, nsamples)
+        assert (0, 'Jxx') in cal['g_omnical']
+        for red in reds:
+            for bl in red:
+                ant0, ant1 = split_bl(bl)
+                np.testing.assert_array_almost_equal(d[bl], cal['g_omnical'][ant0] * np.conj(cal['g_omnical'][ant1]) * cal['v_omnical'][red[0]])
+
+    def test_broadcast_shape(self):
+        arrays = [np.ones((1, 5))] * 20 + [np.ones((4, 1))] * 20 + [np.ones(5)] * 30
+        assert om._broadcast_shape(arrays) == (4, 5)
+        assert om._broadcast_shape(arrays[:1]) == (1, 5)
+        with pytest.raises(ValueError):
+            om._broadcast_shape(arrays + [np.ones(3)])
+
+    def test_linear_cal_update(self):
+        # compare the closed-form solution to linsolve for both unknown gains and unknown visibilities
+        antpos = hex_array(2, split_core=False, outriggers=0)
+        reds = om.get_reds(antpos, pols=['xx'])
+        np.random.seed(22)
+        freqs = np.linspace(100e6, 200e6, 8, endpoint=False)
+        times = np.linspace(0, 600. / 60 / 60 / 24, 3, endpoint=False)
+        g, tv, d = sim_red_data(reds, shape=(len(times), len(freqs)), gain_scatter=.1)
+        d = DataContainer({bl: d[bl] + .01 * (np.random.randn(*d[bl].shape) + 1j * np.random.randn(*d[bl].shape)) for bl in d})
+        for antnum in antpos.keys():
+            d[(antnum, antnum, 'xx')] = np.random.rand(len(times), len(freqs)) + 1
+        d.freqs = deepcopy(freqs)
+        d.times_by_bl = {bl[0:2]: deepcopy(times) for bl in d.keys()}
+        rc = om.RedundantCalibrator(reds)
+
+        def linsolve_solution(bls, cal):
+            consts = {rc.pack_sol_key(ant): cal['g_omnical'][ant] for ant in cal['g_omnical']}
+            consts.update({rc.pack_sol_key(bl): cal['v_omnical'][bl] for bl in cal['v_omnical']})
+            eqs = {eq: bl for eq, bl in rc.build_eqs().items() if bl in bls}
+            wgts = {bl: (noise.predict_noise_variance_from_autos(bl, d))**-1 for bl in bls}
+            ls = linsolve.LinearSolver({eq: d[bl] for eq, bl in eqs.items()}, wgts={eq: wgts[bl] for eq, bl in eqs.items()}, **consts)
+            return {rc.unpack_sol_key(k): v for k, v in ls.solve(mode='pinv').items()}
+
+        # unknown gain, which appears both as g_i and g_j^*
+        cal = {'g_omnical': {ant: g[ant] for ant in g if ant != (3, 'Jxx')}, 'v_omnical': {red[0]: tv[red[0]] for red in reds}}
+        bls = [bl for red in reds for bl in red if (3 in bl[:2]) and (bl[0] != bl[1])]
+        sol = om.linear_cal_update(bls, cal, d, reds)
+        expected = linsolve_solution(bls, cal)
+        assert list(sol.keys()) == [(3, 'Jxx')]
+        np.testing.assert_allclose(sol[3, 'Jxx'], expected[3, 'Jxx'], rtol=1e-8)
+
+        # unknown visibility
+        cal = {'g_omnical': g, 'v_omnical': {red[0]: tv[red[0]] for red in reds[1:]}}
+        sol = om.linear_cal_update(reds[0], cal, d, reds)
+        expected = linsolve_solution(reds[0], cal)
+        np.testing.assert_allclose(sol[reds[0][0]], expected[reds[0][0]], rtol=1e-8)
+
+        # baselines with two unknowns are rejected
+        with pytest.raises(ValueError):
+            cal = {'g_omnical': {ant: g[ant] for ant in g if ant != (3, 'Jxx')}, 'v_omnical': {}}
+            om.linear_cal_update(bls, cal, d, reds)
+
     def test_redcal_iteration(self):
         hd = io.HERAData(os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5'))
         with warnings.catch_warnings():
@@ -1450,7 +1969,77 @@ class TestRunMethods(object):
                 assert not np.all(flag[t, :])
                 assert np.all(flag[t, 0:30])
                 assert np.all(flag[t, -40:])
+
+        # test that parallel calibration over time chunks matches serial calibration
+        hd = io.HERAData(os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5'))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rv_par = om.redcal_iteration(hd, nInt_to_load=1, flag_nchan_high=40, flag_nchan_low=30, nprocs=2,
+                                         fc_fft_workers=2)
+        for key in ['g_firstcal', 'gf_firstcal', 'g_omnical', 'gf_omnical', 'v_omnical', 'vf_omnical',
+                    'vns_omnical', 'chisq', 'chisq_per_ant']:
+            assert set(rv_par[key].keys()) == set(rv[key].keys())
+            for k in rv[key]:
+                np.testing.assert_allclose(rv_par[key][k], rv[key][k], rtol=1e-8, atol=1e-10)
+        for key in ['chisq', 'iter', 'conv_crit']:
+            for pols in rv['omni_meta'][key]:
+                np.testing.assert_allclose(rv_par['omni_meta'][key][pols], rv['omni_meta'][key][pols], rtol=1e-8, atol=1e-10)
+        for ant in rv['fc_meta']['dlys']:
+            np.testing.assert_allclose(rv_par['fc_meta']['dlys'][ant], rv['fc_meta']['dlys'][ant], rtol=1e-8)
         
+        # in-memory data would be ignored by worker processes that read chunks from disk
+        hd = io.HERAData(os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5'))
+        hd.read()
+        with pytest.raises(ValueError, match='nprocs'):
+            om.redcal_iteration(hd, nInt_to_load=1, nprocs=2)
+        with pytest.raises(ValueError, match='nprocs'):
+            om.redcal_run(hd, nprocs=2)
+
+        # worker processes can read chunks from a HERAData object built from a list of files
+        files = [os.path.join(DATA_PATH, 'zen.2458116.61019.xx.HH.XRS_downselected.uvh5'),
+                 os.path.join(DATA_PATH, 'zen.2458116.61765.xx.HH.XRS_downselected.uvh5')]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rv = om.redcal_iteration(io.HERAData(files), nInt_to_load=2, solar_horizon=90.)
+            rv_par = om.redcal_iteration(io.HERAData(files), nInt_to_load=2, solar_horizon=90., nprocs=2)
+        assert rv['g_omnical'].array.shape[2] == len(io.HERAData(files).times)
+        for key in ['g_firstcal', 'gf_omnical', 'g_omnical', 'chisq_per_ant']:
+            assert set(rv_par[key].keys()) == set(rv[key].keys())
+            for k in rv[key]:
+                np.testing.assert_allclose(rv_par[key][k], rv[key][k], rtol=1e-8, atol=1e-10)
+
+        # test warm-started re-run after excluding an antenna
+        hd = io.HERAData(os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5'))
+        warm_start_cache = {}
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rv = om.redcal_iteration(hd, nInt_to_load=1, warm_start_cache=warm_start_cache)
+            assert len(warm_start_cache) == 2 * len(hd.times)
+            for chunk in warm_start_cache.values():
+                assert set(chunk.keys()) == set(['settings', 'ex_ants', 'cal'])
+                assert chunk['ex_ants'] == frozenset()
+            cold = om.redcal_iteration(hd, nInt_to_load=1, ex_ants=[12])
+            warm = om.redcal_iteration(hd, nInt_to_load=1, ex_ants=[12], warm_start_cache=warm_start_cache)
+        assert len(warm_start_cache) == 2 * len(hd.times)
+        for key in ['g_firstcal', 'g_omnical', 'v_omnical', 'chisq', 'chisq_per_ant']:
+            assert set(warm[key].keys()) == set(cold[key].keys())
+        for ant in warm['gf_omnical']:
+            np.testing.assert_array_equal(warm['gf_omnical'][ant], cold['gf_omnical'][ant])
+            if ant[0] == 12:
+                np.testing.assert_array_equal(warm['gf_omnical'][ant], True)
+            else:
+                np.testing.assert_array_equal(warm['g_firstcal'][ant], rv['g_firstcal'][ant])
+
+        # solutions that lack antennas now being calibrated, or that used other settings, are not reused
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for kwargs in [{'ex_ants': []}, {'ex_ants': [12], 'oc_maxiter': 100}]:
+                rerun = om.redcal_iteration(hd, nInt_to_load=1, warm_start_cache=warm_start_cache, **kwargs)
+                assert np.all(rerun['timing_meta']['firstcal'] > 0)
+                assert np.all(rerun['timing_meta']['logcal'] > 0)
+        for ant in rv['g_firstcal']:
+            np.testing.assert_array_equal(om.redcal_iteration(hd, nInt_to_load=1)['g_firstcal'][ant], rv['g_firstcal'][ant])
+
         hd = io.HERAData(os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5'))  # test w/o partial loading
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
@@ -1498,15 +2087,123 @@ class TestRunMethods(object):
             assert not np.all(rv['chisq_per_ant'][ant] == 0.0)
             np.testing.assert_array_equal(rv['gf_omnical'][ant], True)
 
+    def test_redcal_iteration_streaming(self, tmpdir):
+        hd = io.HERAData(os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5'))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rv = om.redcal_iteration(hd, nInt_to_load=1, flag_nchan_high=40, flag_nchan_low=30)
+            omnivis_filename = os.path.join(str(tmpdir), 'test.omni_vis.uvh5')
+            rv_stream = om.redcal_iteration(hd, nInt_to_load=1, flag_nchan_high=40, flag_nchan_low=30,
+                                            omnivis_filename=omnivis_filename, memmap_dir=str(tmpdir))
+        for key in ['g_firstcal', 'gf_firstcal', 'g_omnical', 'gf_omnical', 'chisq_per_ant']:
+            assert set(rv_stream[key].keys()) == set(rv[key].keys())
+            for k in rv[key]:
+                np.testing.assert_array_equal(rv_stream[key][k], rv[key][k])
+            assert os.path.exists(os.path.join(str(tmpdir), key + '.npy'))
+        for key in ['v_omnical', 'vf_omnical', 'vns_omnical']:
+            assert key not in rv_stream
+
+        # streamed visibilities match in-memory ones
+        hd_out = io.HERAData(omnivis_filename)
+        d, f, n = hd_out.read()
+        assert set(d.keys()) == set(rv['v_omnical'].keys())
+        for bl in rv['v_omnical']:
+            np.testing.assert_allclose(d[bl], rv['v_omnical'][bl], rtol=1e-6, atol=1e-6)
+            np.testing.assert_array_equal(f[bl], rv['vf_omnical'][bl])
+            np.testing.assert_array_equal(n[bl], rv['vns_omnical'][bl])
+
+        with pytest.raises(AssertionError):
+            om.redcal_iteration(io.HERAData(os.path.join(DATA_PATH, 'zen.2458043.12552.xx.HH.uvA'), filetype='miriad'),
+                                omnivis_filename=omnivis_filename)
+
+    def test_redcal_iteration_data_cache(self, tmpdir, monkeypatch):
+        hd = io.HERAData(os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5'))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            cold = om.redcal_iteration(hd, nInt_to_load=1, ex_ants=[12])
+        for data_cache_dir, nprocs in [(None, 1), (str(tmpdir), 1), (None, 2), (str(tmpdir), 2)]:
+            data_cache = {}
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                om.redcal_iteration(hd, nInt_to_load=1, nprocs=nprocs, data_cache=data_cache, data_cache_dir=data_cache_dir)
+            assert len(data_cache) == 2 * len(hd.times)
+            for entry in data_cache.values():
+                assert set(entry.keys()) == set(['settings', 'chunk'])
+                if data_cache_dir is None:
+                    assert isinstance(entry['chunk'], tuple)
+                else:
+                    assert os.path.dirname(entry['chunk']) == data_cache_dir
+
+            # cached chunks are reused regardless of ex_ants, without reading the file again
+            if nprocs == 1:
+                def fail(*args, **kwargs):
+                    raise AssertionError('data should not be re-read')
+                monkeypatch.setattr(hd, 'read', fail)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                rerun = om.redcal_iteration(hd, nInt_to_load=1, nprocs=nprocs, ex_ants=[12], data_cache=data_cache,
+                                            data_cache_dir=data_cache_dir)
+            monkeypatch.undo()
+            assert len(data_cache) == 2 * len(hd.times)
+            for key in ['g_firstcal', 'g_omnical', 'gf_omnical', 'chisq_per_ant']:
+                for ant in cold[key]:
+                    np.testing.assert_allclose(rerun[key][ant], cold[key][ant], rtol=1e-6, atol=1e-8)
+
+        # data read with other frequency flagging are not reused
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rerun = om.redcal_iteration(hd, nInt_to_load=1, flag_nchan_low=30, data_cache=data_cache)
+        for flag in rerun['gf_omnical'].values():
+            assert np.all(flag[:, 0:30])
+
+    def test_redcal_run_warm_start(self, tmpdir):
+        input_data = os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5')
+        outdir = str(tmpdir)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            cold = om.redcal_run(input_data, outdir=outdir, nInt_to_load=1, ex_ants=[11], max_rerun=2, clobber=True)
+            for warm_start in [True, 'memory', 'disk']:
+                warm = om.redcal_run(input_data, outdir=outdir, nInt_to_load=1, ex_ants=[11], max_rerun=2, clobber=True,
+                                     warm_start=warm_start)
+                for ant in cold['gf_omnical']:
+                    np.testing.assert_array_equal(warm['gf_omnical'][ant], cold['gf_omnical'][ant])
+                # the scratch directory holding cached data is deleted at the end
+                assert not any(['.redcal_scratch.' in f for f in os.listdir(outdir)])
+        with pytest.raises(ValueError, match='warm_start'):
+            om.redcal_run(input_data, outdir=outdir, nInt_to_load=1, warm_start='cache')
+
+    def test_redcal_run_streaming(self, tmpdir, monkeypatch):
+        input_data = os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5')
+        outdir = str(tmpdir)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            cal = om.redcal_run(input_data, outdir=outdir, nInt_to_load=1, ex_ants=[11], max_rerun=2, stream=True)
+        assert all([os.path.exists(f) for f in om._redcal_run_outputs(input_data, outdir=outdir)])
+        # the scratch files of all runs are deleted at the end, but the results are still readable
+        assert not any(['.redcal_scratch.' in f for f in os.listdir(outdir)])
+        for ant in cal['g_omnical']:
+            assert np.all(np.isfinite(cal['g_omnical'][ant]))
+
+        # they are also deleted if redcal_run fails
+        def fail(*args, **kwargs):
+            raise RuntimeError('failed to write')
+        monkeypatch.setattr(om, '_redcal_run_write_results', fail)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            with pytest.raises(RuntimeError, match='failed to write'):
+                om.redcal_run(input_data, outdir=outdir, nInt_to_load=1, ex_ants=[11], max_rerun=2, stream=True, clobber=True)
+        assert not any(['.redcal_scratch.' in f for f in os.listdir(outdir)])
+
     def test_redcal_run(self):
         input_data = os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5')
         ant_metrics_file = os.path.join(DATA_PATH, 'test_input/zen.2458098.43124.HH.uv.ant_metrics.json')
+        timing_log = os.path.join(DATA_PATH, 'test_output/redcal_timing.jsonl')
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             sys.stdout = open(os.devnull, 'w')
             cal = om.redcal_run(input_data, verbose=True, ant_z_thresh=1.8, add_to_history='testing',
                                 a_priori_ex_ants_yaml=os.path.join(DATA_PATH, 'test_input', 'a_priori_flags_sample.yaml'),
-                                iter0_prefix='.iter0', ant_metrics_file=ant_metrics_file, clobber=True)
+                                iter0_prefix='.iter0', ant_metrics_file=ant_metrics_file, clobber=True, timing_log=timing_log)
 
             hd = io.HERAData(input_data)
             cal0 = om.redcal_iteration(hd, ex_ants=[11, 50])
@@ -1590,6 +2287,30 @@ class TestRunMethods(object):
                 assert 'Iteration0Results.' in history.replace('\n', '').replace(' ', '')
             assert 'Thisfilewasproducedbythefunction' in history.replace('\n', '').replace(' ', '')
 
+            timing_meta = io.read_redcal_timing_meta(meta_file)
+            assert list(timing_meta['pols']) == [str(pols) for pols in cal_here['omni_meta']['iter']]
+            for stage in om.REDCAL_TIMING_STAGES + ['max_rss_mb']:
+                assert len(timing_meta[stage]) == len(timing_meta['pols'])
+                assert np.all(timing_meta[stage] >= 0)
+            assert np.all(timing_meta['omnical'] > 0)
+            assert len(timing_meta['run_times']) == (len(cal['timing_meta']['run_times']) if prefix == '' else 1)
+            assert set(timing_meta['write_times'].keys()) == set(['firstcal', 'omnical', 'omnivis'])
+            for pols, iters in cal_here['omni_meta']['iter'].items():
+                # solar flagged integrations have 0 iterations and are left out of the histogram
+                np.testing.assert_array_equal(timing_meta['omni_iter_hist'][pols][1:], np.bincount(iters.ravel(), minlength=501)[1:])
+
+        # one line per chunk per run, plus one summary line
+        nruns, nchunks = len(cal['timing_meta']['run_times']), len(cal['timing_meta']['pols'])
+        with open(timing_log, 'r') as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) == nruns * nchunks + 1
+        assert [record['run'] for record in records[:-1]] == [run for run in range(nruns) for chunk in range(nchunks)]
+        assert np.all([record['file'] == input_data for record in records])
+        assert 'omnical' in records[0]
+        assert len(records[-1]['run_times']) == nruns
+        assert 'omnivis' in records[-1]['write_times']
+        os.remove(timing_log)
+
         os.remove(os.path.splitext(input_data)[0] + '.first.calfits')
         os.remove(os.path.splitext(input_data)[0] + '.omni.calfits')
         os.remove(os.path.splitext(input_data)[0] + '.omni_vis.uvh5')
@@ -1619,6 +2340,75 @@ class TestRunMethods(object):
         with pytest.raises(TypeError):
             cal = om.redcal_run({})
 
+    def test_redcal_run_many(self, tmpdir):
+        tmpdir = str(tmpdir)
+        input_files = []
+        for jd in ['2458098.43124', '2458098.43869']:
+            input_files.append(os.path.join(tmpdir, 'zen.{}.downsample.uvh5'.format(jd)))
+            shutil.copy(os.path.join(DATA_PATH, 'zen.2458098.43124.downsample.uvh5'), input_files[-1])
+        single_dir, many_dir = os.path.join(tmpdir, 'single'), os.path.join(tmpdir, 'many')
+        os.mkdir(single_dir)
+        os.mkdir(many_dir)
+        kwargs = {'ex_ants': [11, 50], 'max_rerun': 1, 'oc_maxiter': 100}
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            om.redcal_run(input_files[0], outdir=single_dir, **kwargs)
+            runtimes = om.redcal_run_many(input_files, nworkers=2, max_memory_gb=1, outdir=many_dir, **kwargs)
+        assert set(runtimes.keys()) == set(input_files)
+        assert all([rt > 0 for rt in runtimes.values()])
+
+        # results are the same as those of individual runs
+        for input_file in input_files:
+            single_outputs = om._redcal_run_outputs(input_files[0], outdir=single_dir)
+            many_outputs = om._redcal_run_outputs(input_file, outdir=many_dir)
+            for ext_ind in [0, 1]:
+                g_single, f_single, _, _ = io.HERACal(single_outputs[ext_ind]).read()
+                g_many, f_many, _, _ = io.HERACal(many_outputs[ext_ind]).read()
+                for ant in g_single:
+                    np.testing.assert_array_equal(g_single[ant], g_many[ant])
+                    np.testing.assert_array_equal(f_single[ant], f_many[ant])
+            vis_single, _, _ = io.HERAData(single_outputs[2]).read()
+            vis_many, _, _ = io.HERAData(many_outputs[2]).read()
+            for bl in vis_single:
+                np.testing.assert_array_equal(vis_single[bl], vis_many[bl])
+
+        # files with existing outputs are skipped, unless clobbering
+        os.remove(om._redcal_run_outputs(input_files[1], outdir=many_dir)[1])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            runtimes = om.redcal_run_many(input_files, outdir=many_dir, **kwargs)
+            assert runtimes[input_files[0]] is None
+            assert runtimes[input_files[1]] > 0
+            assert all([os.path.exists(f) for f in om._redcal_run_outputs(input_files[1], outdir=many_dir)])
+            runtimes = om.redcal_run_many(input_files[:1], outdir=many_dir, clobber=True, **kwargs)
+            assert runtimes[input_files[0]] > 0
+
+        # a file that fails to calibrate doesn't stop the others, but is reported at the end
+        bad_file = os.path.join(tmpdir, 'zen.bad.uvh5')
+        with open(bad_file, 'w') as f:
+            f.write('not a uvh5 file')
+        for nworkers in [1, 2]:
+            fail_dir = os.path.join(tmpdir, 'fail_{}'.format(nworkers))
+            os.mkdir(fail_dir)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                with pytest.raises(RuntimeError, match='1 of 2 files failed to calibrate'):
+                    om.redcal_run_many([bad_file, input_files[0]], nworkers=nworkers, outdir=fail_dir, **kwargs)
+            assert all([os.path.exists(f) for f in om._redcal_run_outputs(input_files[0], outdir=fail_dir)])
+
+        # memory estimates scale with the amount of data loaded at once
+        full = om._estimate_redcal_run_memory(input_files[0])
+        assert full > 0
+        assert om._estimate_redcal_run_memory(input_files[0], nInt_to_load=1) < full
+        assert om._estimate_redcal_run_memory(input_files[0], precision='single') < full
+        assert om._estimate_redcal_run_memory(input_files[0], filetype='miriad') is None
+
+    def test_max_rss_mb(self, monkeypatch):
+        assert om._max_rss_mb() > 0
+        # the resource module is Unix-only, so peak memory is nan where it can't be imported
+        monkeypatch.setitem(sys.modules, 'resource', None)
+        assert np.isnan(om._max_rss_mb())
+
     def test_redcal_argparser(self):
         sys.argv = [sys.argv[0], 'a', '--ant_metrics_file', 'b', '--ex_ants', '5', '6', '--verbose']
         a = om.redcal_argparser()
@@ -1626,4 +2416,70 @@ class TestRunMethods(object):
         assert a.ant_metrics_file == 'b'
         assert a.ex_ants == [5, 6]
         assert a.gain == 0.4
+        assert a.nprocs == 1
+        assert a.warm_start is False
+        assert a.reds_cache_dir is None
+        assert a.stream is False
+        assert a.timing_log is None
+        assert a.fc_pairing == 'all'
+        assert a.fc_fft_workers == 1
+        assert a.oc_nthreads == 1
+        assert a.oc_accel is None
+        assert a.precision == 'double'
         assert a.verbose is True
+        sys.argv = [sys.argv[0], 'a', '--fc_pairing', '3']
+        assert om.redcal_argparser().fc_pairing == 3
+        sys.argv = [sys.argv[0], 'a', '--fc_pairing', 'chain']
+        assert om.redcal_argparser().fc_pairing == 'chain'
+        sys.argv = [sys.argv[0], 'a', '--precision', 'single']
+        assert om.redcal_argparser().precision == 'single'
+        sys.argv = [sys.argv[0], 'a', '--fc_fft_workers', '4']
+        assert om.redcal_argparser().fc_fft_workers == 4
+        sys.argv = [sys.argv[0], 'a', '--warm_start']
+        assert om.redcal_argparser().warm_start is True
+        sys.argv = [sys.argv[0], 'a', '--warm_start', 'disk']
+        assert om.redcal_argparser().warm_start == 'disk'
+        sys.argv = [sys.argv[0], 'a', 'b', '--nworkers', '4', '--ex_ants', '5']
+        a = om.redcal_argparser(multiple_files=True)
+        assert a.input_data == ['a', 'b']
+        assert a.nworkers == 4
+        assert a.max_memory_gb is None
+        assert a.ex_ants == [5]
+
+    def test_profile_omnical_accel(self):
+        # smoke test of the omnical acceleration benchmark on the smallest hex array, so that it doesn't bit-rot
+        from . import profile_omnical_accel
+        results = profile_omnical_accel.run_benchmarks(hex_nums={7: 2}, dtypes=[np.complex128], ntimes=2, nfreqs=8)
+        assert [res['accel'] for res in results] == [str(accel) for accel in profile_omnical_accel.ACCELS]
+        for res in results:
+            assert res['nants'] == 7
+            assert res['dtype'] == 'complex128'
+            assert res['max_iter'] <= profile_omnical_accel.OC_KWARGS['maxiter']
+            np.testing.assert_allclose(res['chisq_ratio'], 1, atol=1e-4)
+
+    def test_profile_redcal(self, tmpdir):
+        # smoke test of the benchmark suite on the smallest hex array where an excluded antenna has more
+        # baselines than np.broadcast takes at once, so that it doesn't bit-rot
+        from . import profile_redcal
+        results = profile_redcal.run_benchmarks(hex_nums=[3], ntimes=2, nfreqs=8, repeat=1, tmpdir=str(tmpdir))
+        results = json.loads(json.dumps(results))
+        assert set(results.keys()) == {'meta', 'results'}
+        for key in ['hera_cal_version', 'git_hash', 'numpy_version', 'python_version', 'machine', 'node', 'date',
+                    'repeat', 'max_rss_mb']:
+            assert key in results['meta']
+        assert results['meta']['repeat'] == 1
+        assert [res['stage'] for res in results['results']] == profile_redcal.STAGES
+        for res in results['results']:
+            assert set(res.keys()) == {'hex_num', 'nants', 'ntimes', 'nfreqs', 'stage', 'times', 'best_time',
+                                       'peak_mem_mb'}
+            assert res['hex_num'] == 3
+            assert res['nants'] == 19
+            assert (res['ntimes'], res['nfreqs']) == (2, 8)
+            assert len(res['times']) == 1
+            assert res['best_time'] == min(res['times'])
+            assert res['peak_mem_mb'] > 0
+        assert profile_redcal.find_regressions(results, results) == []
+        slower = deepcopy(results)
+        slower['results'][0]['best_time'] = 2 * results['results'][0]['best_time'] + 1
+        expected = [(19, 'get_reds', results['results'][0]['best_time'], slower['results'][0]['best_time'])]
+        assert profile_redcal.find_regressions(slower, results) == expected
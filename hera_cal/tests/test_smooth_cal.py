@@ -72,6 +72,20 @@ class Test_Smooth_Cal_Helper_Functions(object):
         gains *= np.exp(2.0j * np.pi * np.outer(-151e-9 * np.ones(2), freqs))
         assert smooth_cal.single_iterative_fft_dly(gains, wgts, freqs) == 0
 
+        # try a stack of waterfalls with different flags
+        true_dlys = np.array([151e-9, -151e-9, 20e-9, 0.0])
+        gains = np.ones((4, 2, 1000), dtype=complex) * np.exp(2.0j * np.pi * np.outer(true_dlys, freqs))[:, None, :]
+        wgts = np.ones((4, 2, 1000), dtype=float)
+        wgts[1, :, 0:40] = 0.0
+        wgts[1, :, 900:] = 0.0
+        wgts[3] = 0.0
+        dlys = smooth_cal.single_iterative_fft_dly(gains, wgts, freqs)
+        assert dlys.shape == (4,)
+        np.testing.assert_array_almost_equal(dlys, true_dlys)
+        for n in range(4):
+            assert dlys[n] == smooth_cal.single_iterative_fft_dly(gains[n], wgts[n], freqs)
+        np.testing.assert_allclose(smooth_cal.single_iterative_fft_dly(gains, wgts, freqs, fft_workers=2), dlys, rtol=1e-12)
+
     def test_freq_filter(self):
         gains = np.ones((10, 10), dtype=complex)
         gains[3, 5] = 10.0
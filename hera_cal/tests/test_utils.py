@@ -222,6 +222,38 @@ class TestFftDly(object):
         dlys, offs = utils.fft_dly(flat_phs * phs, df, medfilt=True, f0=freqs[0])
         assert np.median(np.abs(dlys - true_dlys)) < 2  # median accuracy better than 2 ns
 
+    def test_batch(self):
+        true_dlys = np.random.uniform(-200, 200, size=(3, 60, 1))
+        data = np.exp(2j * np.pi * self.freqs * true_dlys + 1j * 0.123) + .1 * white_noise((3, 60, 1024))
+        wgts = np.ones(data.shape, dtype=float)
+        wgts[1, :, 100:200] = 0
+        df = np.median(np.diff(self.freqs))
+        for kwargs in [{}, {'medfilt': True}, {'edge_cut': 100}]:
+            dlys, offs = utils.fft_dly_batch(data, df, wgts=wgts, f0=self.freqs[0], workers=2, **kwargs)
+            assert dlys.shape == offs.shape == (3, 60, 1)
+            for n in range(3):
+                dly, off = utils.fft_dly(data[n], df, wgts=wgts[n], f0=self.freqs[0], **kwargs)
+                np.testing.assert_array_almost_equal(dlys[n], dly)
+                np.testing.assert_array_almost_equal(offs[n], off)
+        assert np.median(np.abs(dlys - true_dlys)) < 1e-1  # median accuracy of 100 ps
+        # splitting the stack into batches doesn't change the answer
+        dlys, offs = utils.fft_dly_batch(data, df, wgts=wgts, f0=self.freqs[0])
+        split_dlys, split_offs = utils.fft_dly_batch(data, df, wgts=wgts, f0=self.freqs[0], batch_size=1000)
+        np.testing.assert_array_equal(dlys, split_dlys)
+        np.testing.assert_array_equal(offs, split_offs)
+
+    def test_batch_single_precision(self):
+        true_dlys = np.random.uniform(-200, 200, size=(3, 60, 1))
+        data = np.exp(2j * np.pi * self.freqs * true_dlys + 1j * 0.123) + .1 * white_noise((3, 60, 1024))
+        df = np.median(np.diff(self.freqs))
+        dlys, offs = utils.fft_dly_batch(data, df, f0=self.freqs[0])
+        dlys32, offs32 = utils.fft_dly_batch(data.astype(np.complex64), df, f0=self.freqs[0], precision='single')
+        assert dlys32.dtype == offs32.dtype == np.float32
+        # delays (in ns) agree to much better than the 100 ps accuracy of the double precision estimate
+        np.testing.assert_allclose(dlys32, dlys, rtol=0, atol=1e-3)
+        np.testing.assert_allclose(offs32, offs, rtol=0, atol=1e-3)
+        pytest.raises(ValueError, utils.fft_dly_batch, data, df, precision='half')
+
     def test_error(self):
         true_dlys = np.random.uniform(-200, 200, size=60)
         true_dlys.shape = (60, 1)
@@ -410,6 +442,23 @@ def test_lst_rephase():
     assert np.allclose(np.abs(np.angle(d_phs[50] / data[k][50])).max(), 0.0)
 
 
+def test_chisq_single_precision():
+    model = datacontainer.DataContainer({(0, 1, 'xx'): 3 * np.ones((5, 10), dtype=complex)})
+    data32 = datacontainer.DataContainer({(0, 1, 'xx'): np.ones((5, 10), dtype=np.complex64)})
+    wgts32 = datacontainer.DataContainer({(0, 1, 'xx'): np.ones((5, 10), dtype=np.float32)})
+    # single precision data with single precision (or no) weights give single precision chisqs
+    for wgts in [wgts32, None]:
+        chisq, nObs, chisq_per_ant, nObs_per_ant = utils.chisq(data32, model, data_wgts=wgts)
+        assert chisq.dtype == np.float32
+        assert chisq_per_ant[0, 'Jxx'].dtype == np.float32
+        np.testing.assert_array_equal(chisq, 4.0)
+        np.testing.assert_array_equal(nObs_per_ant[0, 'Jxx'], 1)
+    # double precision weights promote the chisqs to double precision
+    wgts64 = datacontainer.DataContainer({(0, 1, 'xx'): np.ones((5, 10), dtype=float)})
+    chisq, nObs, chisq_per_ant, nObs_per_ant = utils.chisq(data32, model, data_wgts=wgts64)
+    assert chisq.dtype == float
+
+
 def test_chisq():
     # test basic case
     data = datacontainer.DataContainer({(0, 1, 'xx'): np.ones((5, 10), dtype=complex)})
@@ -505,6 +554,44 @@ def test_chisq():
     assert len(chisq_per_ant) == 0
     assert len(chisq_per_ant) == 0
 
+    # test against chi^2 computed baseline by baseline, with reds, gains, gain flags, autos, and reversed baselines
+    rng = np.random.RandomState(15)
+    reds = [[(0, 1, 'xx'), (1, 2, 'xx'), (2, 3, 'xx')], [(0, 2, 'xx'), (1, 3, 'xx')], [(0, 0, 'xx'), (1, 1, 'xx')],
+            [(0, 1, 'yy'), (1, 2, 'yy')], [(0, 1, 'xy'), (1, 2, 'xy')]]
+    data = {bl: rng.randn(3, 4) + 1j * rng.randn(3, 4) for red in reds for bl in red}
+    data[(2, 1, 'xx')] = data.pop((1, 2, 'xx')).conj()  # store a baseline in reversed order
+    data = datacontainer.DataContainer(data)
+    model = datacontainer.DataContainer({red[0]: rng.randn(3, 4) + 1j * rng.randn(3, 4) for red in reds})
+    data_wgts = datacontainer.DataContainer({bl: rng.rand(3, 4) for bl in data})
+    gains = {(ant, pol): rng.randn(3, 4) + 1j * rng.randn(3, 4) for ant in range(4) for pol in ['Jxx', 'Jyy']}
+    gain_flags = {ant: rng.rand(3, 4) > .8 for ant in gains}
+    for split_by_antpol in [False, True]:
+        chisq, nObs, chisq_per_ant, nObs_per_ant = utils.chisq(data, model, data_wgts, gains=gains, gain_flags=gain_flags,
+                                                               reds=reds, split_by_antpol=split_by_antpol)
+        expected_chisq, expected_per_ant, expected_nObs_per_ant = {}, {}, {}
+        for red in reds:
+            for bl in red:
+                ant1, ant2 = utils.split_bl(bl)
+                if split_by_antpol and ant1[1] != ant2[1]:
+                    continue
+                wgts = data_wgts[bl] * ~gain_flags[ant1] * ~gain_flags[ant2]
+                chisq_here = np.abs(data[bl] - model[red[0]] * gains[ant1] * np.conj(gains[ant2]))**2 * wgts
+                key = (ant1[1] if split_by_antpol else 'all')
+                expected_chisq[key] = expected_chisq.get(key, 0) + chisq_here
+                for ant in [ant1, ant2]:
+                    expected_per_ant[ant] = expected_per_ant.get(ant, 0) + chisq_here
+                    expected_nObs_per_ant[ant] = expected_nObs_per_ant.get(ant, 0) + (wgts > 0)
+        if not split_by_antpol:
+            chisq = {'all': chisq}
+        assert set(chisq.keys()) == set(expected_chisq.keys())
+        for key in chisq:
+            np.testing.assert_allclose(chisq[key], expected_chisq[key], rtol=1e-12)
+        assert set(chisq_per_ant.keys()) == set(expected_per_ant.keys())
+        for ant in chisq_per_ant:
+            np.testing.assert_allclose(chisq_per_ant[ant], expected_per_ant[ant], rtol=1e-12)
+            np.testing.assert_array_equal(nObs_per_ant[ant], expected_nObs_per_ant[ant])
+            assert nObs_per_ant[ant].dtype == int
+
 
 def test_gp_interp1d():
     # load data
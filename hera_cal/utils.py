@@ -10,6 +10,8 @@ from astropy.time import Time
 from astropy import coordinates as crd
 from astropy import units as unt
 from scipy import signal
+from scipy import fft as sp_fft
+from scipy.sparse import csr_matrix
 import pyuvdata.utils as uvutils
 from pyuvdata import UVCal, UVData
 from pyuvdata.utils import polnum2str, polstr2num, jnum2str, jstr2num, conj_pol
@@ -204,7 +206,7 @@ def filter_bls(bls, ants=None, ex_ants=None, pols=None, antpos=None, min_bl_cut=
     return filtered_bls
 
 
-def fft_dly(data, df, wgts=None, f0=0.0, medfilt=False, kernel=(1, 11), edge_cut=0):
+def fft_dly(data, df, wgts=None, f0=0.0, medfilt=False, kernel=(1, 11), edge_cut=0, precision='double'):
     """Get delay of visibility across band using FFT and Quinn's Second Method to fit the delay and phase offset.
     Arguments:
         data : ndarray of complex data (e.g. gains or visibilities) of shape (Ntimes, Nfreqs)
@@ -214,45 +216,101 @@ def fft_dly(data, df, wgts=None, f0=0.0, medfilt=False, kernel=(1, 11), edge_cut
         medfilt : boolean, median filter data before fft
         kernel : size of median filter kernel along (time, freq) axes
         edge_cut : int, number of channels to exclude at each band edge of data in FFT window
+        precision : 'double' (default) or 'single', the precision of the FFT. See fft_dly_batch.
     Returns:
         dlys : (Ntimes, 1) ndarray containing delay for each integration
         offset : (Ntimes, 1) ndarray containing estimated frequency-independent phases
     """
+    if wgts is not None:
+        wgts = wgts[None]
+    dlys, offset = fft_dly_batch(data[None], df, wgts=wgts, f0=f0, medfilt=medfilt,
+                                 kernel=kernel, edge_cut=edge_cut, workers=1, precision=precision)
+    return dlys[0], offset[0]
+
+
+def _precision_dtypes(precision):
+    '''Validates the precision argument of redcal and fft_dly_batch, returning the corresponding complex and real dtypes.'''
+    if precision == 'single':
+        return np.complex64, np.float32
+    elif precision == 'double':
+        return np.complex128, np.float64
+    raise ValueError("Unrecognized precision: {}. Must be 'single' or 'double'.".format(precision))
+
+
+def fft_dly_batch(data, df, wgts=None, f0=0.0, medfilt=False, kernel=(1, 11), edge_cut=0, workers=1,
+                  batch_size=2**18, precision='double'):
+    """Get delays and phase offsets of a stack of waterfalls with a single (optionally multi-threaded) FFT.
+    Otherwise identical to running fft_dly() on each waterfall in the stack.
+
+    Arguments:
+        data : ndarray of complex data (e.g. gains or visibilities) of shape (Nwaterfalls, Ntimes, Nfreqs)
+        df : frequency channel width in Hz
+        wgts : multiplicative wgts of the same shape as the data
+        f0 : float lowest frequency channel. Optional parameter used in getting the offset correct.
+        medfilt : boolean, median filter data before fft
+        kernel : size of median filter kernel along (time, freq) axes
+        edge_cut : int, number of channels to exclude at each band edge of data in FFT window
+        workers : number of threads used by scipy.fft. Default 1, since callers like redcal may already run
+            in many processes. Negative values count back from os.cpu_count().
+        batch_size : approximate maximum number of samples processed together. Larger stacks are
+            split into batches of whole waterfalls to keep temporary arrays small.
+        precision : 'double' (default) computes the FFT in double precision like np.fft.fft. 'single'
+            keeps the FFT and all temporaries in complex64/float32, halving their memory footprint.
+    Returns:
+        dlys : (Nwaterfalls, Ntimes, 1) ndarray containing delay for each integration
+        offset : (Nwaterfalls, Ntimes, 1) ndarray containing estimated frequency-independent phases
+    """
     # setup
-    Ntimes, Nfreqs = data.shape
+    complex_dtype, real_dtype = _precision_dtypes(precision)
+    if precision == 'single':
+        data = np.asarray(data, dtype=complex_dtype)
+    Nwf, Ntimes, Nfreqs = data.shape
     if wgts is None:
         wgts = np.ones_like(data, dtype=np.float32)
-
-    # smooth via median filter
+    elif precision == 'single':
+        wgts = np.asarray(wgts, dtype=real_dtype)
+    Nbatch = max(1, batch_size // (Ntimes * Nfreqs))
+    if Nwf > Nbatch:
+        dlys, offset = zip(*[fft_dly_batch(data[i:i + Nbatch], df, wgts=wgts[i:i + Nbatch], f0=f0, medfilt=medfilt,
+                                           kernel=kernel, edge_cut=edge_cut, workers=workers, batch_size=batch_size,
+                                           precision=precision)
+                             for i in range(0, Nwf, Nbatch)])
+        return np.concatenate(dlys), np.concatenate(offset)
+
+    # smooth via median filter, one waterfall at a time
     if medfilt:
         data = copy.deepcopy(data)  # this prevents filtering of the original input data
-        data.real = signal.medfilt(data.real, kernel_size=kernel)
-        data.imag = signal.medfilt(data.imag, kernel_size=kernel)
+        data.real = signal.medfilt(data.real, kernel_size=(1,) + tuple(kernel))
+        data.imag = signal.medfilt(data.imag, kernel_size=(1,) + tuple(kernel))
 
-    # fft w/ wgts
+    # fft w/ wgts, in double precision like np.fft.fft unless precision is 'single'
     dw = data * wgts
     if edge_cut > 0:
         assert 2 * edge_cut < Nfreqs - 1, "edge_cut cannot be >= Nfreqs/2 - 1"
-        dw = dw[:, edge_cut:(-edge_cut + 1)]
+        dw = dw[:, :, edge_cut:(-edge_cut + 1)]
     dw[np.isnan(dw)] = 0
-    fftfreqs = np.fft.fftfreq(dw.shape[1], df)
+    fftfreqs = np.fft.fftfreq(dw.shape[-1], df)
     dtau = fftfreqs[1] - fftfreqs[0]
-    vfft = np.fft.fft(dw, axis=1)
+    vfft = sp_fft.fft(dw.astype(complex_dtype, copy=False), axis=-1, workers=workers)
 
     # get interpolated peak and indices
-    inds, bin_shifts, peaks, interp_peaks = interp_peak(vfft)
-    dlys = (fftfreqs[inds] + bin_shifts * dtau).reshape(-1, 1)
+    inds, bin_shifts, peaks, interp_peaks = interp_peak(vfft.reshape(Nwf * Ntimes, -1))
+    dlys = (fftfreqs[inds] + bin_shifts * dtau).reshape(Nwf, Ntimes, 1)
+    if precision == 'single':
+        dlys = dlys.astype(real_dtype)
 
     # Now that we know the slope, estimate the remaining phase offset
     freqs = np.arange(Nfreqs, dtype=data.dtype) * df + f0
+    if precision == 'single':
+        freqs = freqs.astype(complex_dtype)  # avoids promotion by a double precision df or f0
     fSlice = slice(edge_cut, len(freqs) - edge_cut)
     offset = np.angle(
         np.sum(
-            wgts[:, fSlice] * data[:, fSlice] * np.exp(
-                -np.complex64(2j * np.pi) * dlys * freqs[fSlice].reshape(1, -1)
+            wgts[:, :, fSlice] * data[:, :, fSlice] * np.exp(
+                -np.complex64(2j * np.pi) * dlys * freqs[fSlice]
             ),
-            axis=1, keepdims=True
-        ) / np.sum(wgts[:, fSlice], axis=1, keepdims=True)
+            axis=-1, keepdims=True
+        ) / np.sum(wgts[:, :, fSlice], axis=-1, keepdims=True)
     )
 
     return dlys, offset
@@ -290,13 +348,10 @@ def interp_peak(data, method='quinn', reject_edges=False):
     if reject_edges:
         # scroll through diffs and set monotonically decreasing edges to zero
         forw_diff = dabs[:, 1:] - dabs[:, :-1]
-        for i, fd in enumerate(forw_diff):
-            ncut = np.argmax(fd > 0)
-            if ncut > 0:
-                dabs[i, :ncut] = 0.0
-            ncut = N2 - np.argmax(fd[::-1] < 0)
-            if ncut > 0:
-                dabs[i, ncut:] = 0.0
+        chans = np.arange(N2)
+        low_cut = np.argmax(forw_diff > 0, axis=1)
+        high_cut = N2 - np.argmax(forw_diff[:, ::-1] < 0, axis=1)
+        dabs[(chans[None, :] < low_cut[:, None]) | (chans[None, :] >= high_cut[:, None])] = 0.0
 
     # get argmaxes along last axis
     if method == 'quinn':
@@ -866,6 +921,7 @@ def chisq(data, model, data_wgts=None, gains=None, gain_flags=None, split_by_ant
             is provided, this is the sum of the input chisq and the calculated chisq from all unflagged
             data-to-model comparisons possible given their overlapping baselines. If split_by_antpol is
             True, instead returns a dictionary that maps antenna polarization strings to these numpy arrays.
+            Computed in single precision if data and data_wgts are single precision, otherwise in double.
         nObs: numpy array with the integer number of unflagged data-to-model comparisons that go into
             each time and frequency of the chisq calculation. If nObs is specified, this updates that
             with a count of any new unflagged data-to-model comparisons. If split_by_antpol is True,
@@ -877,13 +933,23 @@ def chisq(data, model, data_wgts=None, gains=None, gain_flags=None, split_by_ant
             data-to-model comparisons that go into each time and frequency of the per-antenna chisq
             calculation. If nObs_per_ant, this is updated to include all new unflagged observations.
     """
+    # if data_wgts is unspecified, make it all 1.0s in the real precision of the data.
+    if data_wgts is None:
+        data_wgts = {bl: np.ones(np.shape(data[bl]), dtype=np.finfo(np.asarray(data[bl]).dtype).dtype) for bl in data.keys()}
+
+    # compute chi^2 in single precision only if both the data and the weights are single precision
+    real_dtype = float
+    if len(data) > 0 and len(data_wgts) > 0:
+        real_dtype = np.result_type(np.finfo(np.asarray(next(iter(data.values()))).dtype).dtype,
+                                    np.asarray(next(iter(data_wgts.values()))).dtype)
+
     # build containers for chisq and nObs if not supplied
     if chisq is None and nObs is None:
         if split_by_antpol:
             chisq = {}
             nObs = {}
         else:
-            chisq = np.zeros(list(data.values())[0].shape, dtype=float)
+            chisq = np.zeros(list(data.values())[0].shape, dtype=real_dtype)
             nObs = np.zeros(list(data.values())[0].shape, dtype=int)
     elif (chisq is None) ^ (nObs is None):
         raise ValueError('Both chisq and nObs must be specified or nor neither can be.')
@@ -895,62 +961,83 @@ def chisq(data, model, data_wgts=None, gains=None, gain_flags=None, split_by_ant
     elif (chisq_per_ant is None) ^ (nObs_per_ant is None):
         raise ValueError('Both chisq_per_ant and nObs_per_ant must be specified or nor neither can be.')
 
-    # if data_wgts is unspecified, make it all 1.0s.
-    if data_wgts is None:
-        data_wgts = {bl: np.ones_like(data[bl], dtype=float) for bl in data.keys()}
-
-    # Expand model to include all bl in reds, assuming that model has the first bl in the redundant group
-    if reds is not None:
-        model = copy.deepcopy(model)
-        for red in reds:
-            if np.any([bl in data for bl in red]):
-                for bl in red:
-                    model[bl] = model[red[0]]
-
+    # Find the model for every baseline in reds, assuming that model has the first bl in the redundant group
+    ubl_of = ({} if reds is None else {bl: red[0] for red in reds for bl in red})
+    from .datacontainer import DataContainer  # avoids a circular import
+    bls, models = [], []
     for bl in data.keys():
         ap1, ap2 = split_pol(bl[2])
         # make that if split_by_antpol is true, the baseline is not cross-polarized
-        if bl in model and bl in data_wgts and (not split_by_antpol or ap1 == ap2):
-            ant1, ant2 = (bl[0], ap1), (bl[1], ap2)
-
-            # multiply model by gains if they are supplied
-            if gains is not None:
-                model_here = model[bl] * gains[ant1] * np.conj(gains[ant2])
-            else:
-                model_here = copy.deepcopy(model[bl])
-
-            # include gain flags in data weights
-            assert np.isrealobj(data_wgts[bl])
-            if gain_flags is not None:
-                wgts = data_wgts[bl] * ~(gain_flags[ant1]) * ~(gain_flags[ant2])
-            else:
-                wgts = copy.deepcopy(data_wgts[bl])
-
-            # calculate chi^2
-            chisq_here = np.asarray(np.abs(model_here - data[bl]) ** 2 * wgts, dtype=np.float64)
-            if split_by_antpol:
-                if ap1 in chisq:
-                    assert ap1 in nObs
-                    chisq[ap1] = chisq[ap1] + chisq_here
-                    nObs[ap1] = nObs[ap1] + (wgts > 0)
-                else:
-                    assert ap1 not in nObs
-                    chisq[ap1] = copy.deepcopy(chisq_here)
-                    nObs[ap1] = np.array(wgts > 0, dtype=int)
+        if (split_by_antpol and ap1 != ap2) or (bl not in data_wgts):
+            continue
+        if bl in ubl_of:
+            models.append(model[ubl_of[bl]])
+        elif isinstance(model, DataContainer) and reverse_bl(bl) in ubl_of:
+            models.append(np.conj(model[ubl_of[reverse_bl(bl)]]))
+        elif bl in model:
+            models.append(model[bl])
+        else:
+            continue
+        bls.append(bl)
+    if len(bls) == 0:
+        return chisq, nObs, chisq_per_ant, nObs_per_ant
+
+    # stack everything into (Nbls, Ntimes, Nfreqs) arrays and index per-antenna quantities by baseline
+    ant1s = [(bl[0], split_pol(bl[2])[0]) for bl in bls]
+    ant2s = [(bl[1], split_pol(bl[2])[1]) for bl in bls]
+    ants = list(dict.fromkeys(ant1s + ant2s))
+    ant_inds = {ant: i for i, ant in enumerate(ants)}
+    i1 = np.array([ant_inds[ant] for ant in ant1s])
+    i2 = np.array([ant_inds[ant] for ant in ant2s])
+    data_here = np.array([data[bl] for bl in bls])
+    wgts = np.array([np.broadcast_to(data_wgts[bl], np.shape(data[bl])) for bl in bls])
+    assert np.isrealobj(wgts)
+
+    # multiply model by gains if they are supplied
+    model_here = np.array(models)
+    if gains is not None:
+        gain_array = np.array([np.broadcast_to(gains[ant], data_here.shape[1:]) for ant in ants])
+        model_here = model_here * gain_array[i1] * np.conj(gain_array[i2])
+
+    # include gain flags in data weights
+    if gain_flags is not None:
+        flag_array = np.array([np.broadcast_to(gain_flags[ant], data_here.shape[1:]) for ant in ants])
+        wgts = wgts * ~(flag_array[i1]) * ~(flag_array[i2])
+
+    # calculate chi^2
+    chisq_here = np.asarray(np.abs(model_here - data_here) ** 2 * wgts, dtype=real_dtype)
+    obs_here = (wgts > 0)
+    if split_by_antpol:
+        ap1s = np.array([ant[1] for ant in ant1s])
+        for ap1 in dict.fromkeys(ap1s):
+            sel = (ap1s == ap1)
+            if ap1 in chisq:
+                assert ap1 in nObs
+                chisq[ap1] = chisq[ap1] + np.sum(chisq_here[sel], axis=0)
+                nObs[ap1] = nObs[ap1] + np.sum(obs_here[sel], axis=0)
             else:
-                chisq += chisq_here
-                nObs += (wgts > 0)
-
-            # assign chisq and observations to both chisq_per_ant and nObs_per_ant
-            for ant in [ant1, ant2]:
-                if ant in chisq_per_ant:
-                    assert ant in nObs_per_ant
-                    chisq_per_ant[ant] = chisq_per_ant[ant] + chisq_here
-                    nObs_per_ant[ant] = nObs_per_ant[ant] + (wgts > 0)
-                else:
-                    assert ant not in nObs_per_ant
-                    chisq_per_ant[ant] = copy.deepcopy(chisq_here)
-                    nObs_per_ant[ant] = np.array(wgts > 0, dtype=int)
+                assert ap1 not in nObs
+                chisq[ap1] = np.sum(chisq_here[sel], axis=0)
+                nObs[ap1] = np.sum(obs_here[sel], axis=0, dtype=int)
+    else:
+        chisq += np.sum(chisq_here, axis=0)
+        nObs += np.sum(obs_here, axis=0, dtype=int)
+
+    # assign chisq and observations to both chisq_per_ant and nObs_per_ant by summing over baselines with
+    # an (Nants, Nbls) incidence matrix, which is much faster than np.add.at for large chunks of data
+    incidence = csr_matrix((np.ones(2 * len(bls), dtype=int), (np.append(i1, i2), np.tile(np.arange(len(bls)), 2))),
+                           shape=(len(ants), len(bls)))
+    chisq_ant = incidence.astype(chisq_here.dtype).dot(chisq_here.reshape(len(bls), -1)).reshape((len(ants),) + chisq_here.shape[1:])
+    nObs_ant = incidence.dot(obs_here.reshape(len(bls), -1).astype(int)).reshape((len(ants),) + chisq_here.shape[1:])
+    for ant, cs, nobs in zip(ants, chisq_ant, nObs_ant):
+        if ant in chisq_per_ant:
+            assert ant in nObs_per_ant
+            chisq_per_ant[ant] = chisq_per_ant[ant] + cs
+            nObs_per_ant[ant] = nObs_per_ant[ant] + nobs
+        else:
+            assert ant not in nObs_per_ant
+            chisq_per_ant[ant] = cs
+            nObs_per_ant[ant] = nobs
 
     return chisq, nObs, chisq_per_ant, nObs_per_ant
 
@@ -1320,6 +1320,7 @@ def _filter_argparser(multifile=False):
         a.add_argument("--datafilelist", default=None, type=str, nargs="+", help="list of data files. Used to determine parallelization chunk.")
     else:
         a.add_argument("--calfile", default=None, type=str, help="optional string path to calibration file to apply to data before delay filtering")
+        a.add_argument("--prefetch", default=0, type=int, help="number of baseline chunks to read ahead in a background thread when partial loading (default 0)")
     return a
 
 
@@ -24,6 +24,6 @@ if args.nbl_per_load is not None:
 
 ac.apply_cal(args.infilename, args.outfilename, args.new_cal, old_calibration=args.old_cal, flag_file=args.flag_file,
              flag_filetype=args.flag_filetype, flag_nchan_low=args.flag_nchan_low, flag_nchan_high=args.flag_nchan_high,
-             filetype_in=args.filetype_in, filetype_out=args.filetype_out, nbl_per_load=args.nbl_per_load,
+             filetype_in=args.filetype_in, filetype_out=args.filetype_out, nbl_per_load=args.nbl_per_load, prefetch=args.prefetch,
              gain_convention=args.gain_convention, redundant_solution=args.redundant_solution, redundant_average=args.redundant_average,
              add_to_history=' '.join(sys.argv), clobber=args.clobber, **kwargs)
@@ -19,7 +19,7 @@ filter_kwargs = {'standoff': a.standoff, 'horizon': a.horizon, 'tol': a.tol,
                  'skip_wgt': a.skip_wgt, 'min_dly': a.min_dly}
 # Run Delay Filter
 delay_filter.load_delay_filter_and_write(a.infilename, calfile=a.calfile, round_up_bllens=True,
-                                         Nbls_per_load=a.partial_load_Nbls, spw_range=a.spw_range,
+                                         Nbls_per_load=a.partial_load_Nbls, prefetch=a.prefetch, spw_range=a.spw_range,
                                          cache_dir=a.cache_dir, res_outfilename=a.res_outfilename,
                                          clobber=a.clobber, write_cache=a.write_cache,
                                          read_cache=a.read_cache, mode='dayenu',
@@ -17,7 +17,7 @@ filter_kwargs = {'tol': a.tol, 'max_frate_coeffs': a.max_frate_coeffs}
 spw_range = a.spw_range
 # Run Xtalk Filter
 xtalk_filter.load_xtalk_filter_and_write(a.infilename, calfile=a.calfile, round_up_bllens=True,
-                                         Nbls_per_load=a.partial_load_Nbls, spw_range=a.spw_range,
+                                         Nbls_per_load=a.partial_load_Nbls, prefetch=a.prefetch, spw_range=a.spw_range,
                                          cache_dir=a.cache_dir, res_outfilename=a.res_outfilename,
                                          clobber=a.clobber, write_cache=a.write_cache,
                                          read_cache=a.read_cache, mode='dayenu',
@@ -23,6 +23,11 @@ redcal_run(a.input_data,
            a_priori_ex_ants_yaml=a.a_priori_ex_ants_yaml,
            clobber=a.clobber,
            nInt_to_load=a.nInt_to_load,
+           nprocs=a.nprocs,
+           warm_start=a.warm_start,
+           reds_cache_dir=a.reds_cache_dir,
+           stream=a.stream,
+           timing_log=a.timing_log,
            pol_mode=a.pol_mode,
            ex_ants=a.ex_ants,
            ant_z_thresh=a.ant_z_thresh,
@@ -35,6 +40,11 @@ redcal_run(a.input_data,
            max_bl_cut=a.max_bl_cut,
            fc_conv_crit=a.fc_conv_crit,
            fc_maxiter=a.fc_maxiter,
+           fc_pairing=a.fc_pairing,
+           fc_fft_workers=a.fc_fft_workers,
+           oc_nthreads=a.oc_nthreads,
+           oc_accel=a.oc_accel,
+           precision=a.precision,
            oc_conv_crit=a.oc_conv_crit,
            oc_maxiter=a.oc_maxiter,
            check_every=a.check_every,
@@ -39,6 +39,7 @@ setup_args = {
                 'scripts/apply_cal.py', 'scripts/delay_filter_run.py',
                 'scripts/lstbin_run.py', 'scripts/extract_autos.py',
                 'scripts/smooth_cal_run.py', 'scripts/redcal_run.py',
+                'scripts/redcal_run_many.py',
                 'scripts/auto_reflection_run.py', 'scripts/noise_from_autos.py',
                 'scripts/query_ex_ants.py', 'scripts/dayenu_xtalk_filter_run.py',
                 'scripts/dayenu_xtalk_filter_run_baseline_parallelized.py',